@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+黑名单过滤微基准
+对比逐个子串/逐个正则的旧写法与导入时编译的合并正则的单行耗时
+
+用法: python benchmarks/bench_blacklist.py [--number 2000]
+"""
+
+import argparse
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_verifier import (
+    INVALID_AUTHOR_NAMES,
+    INVALID_AUTHOR_KEYWORDS,
+    INVALID_TITLE_PATTERNS,
+    is_invalid_author_line,
+    is_invalid_title_line,
+    INVALID_AUTHOR_KEYWORDS_RE,
+)
+
+# 取自论文首页/录用通知的典型行
+SAMPLE_LINES = [
+    'Engineering Structures 345 (2025) 121426',
+    'Contents lists available at ScienceDirect',
+    'journal homepage: www.elsevier.com/locate/engstruct',
+    'A digital twin method for real-time analysis of structural deformation and',
+    'failure for high arch dams',
+    'Jichen Tiana,b, Chen Chena,b,* , Limin Zhangc, Jiankang Chena,b, Huibao Huanga,b,d,',
+    'Pengtao Zhanga,b',
+    'aState Key Laboratory of Hydraulics and Mountain River Engineering, Sichuan University',
+    'Received 13 June 2025; Received in revised form 19 October 2025; Accepted 20 September 2025',
+    'Dear Dr. Tian,',
+    'Wang Mengmeng',
+    '基于深度学习的高拱坝变形实时分析方法研究',
+]
+
+
+def legacy_author_line(line: str) -> bool:
+    line_lower = line.lower()
+    for invalid in INVALID_AUTHOR_NAMES:
+        if invalid in line_lower:
+            return True
+    return False
+
+
+def legacy_author_keywords(line: str) -> bool:
+    for keyword in INVALID_AUTHOR_KEYWORDS:
+        if re.search(keyword, line, re.IGNORECASE):
+            return True
+    return False
+
+
+def legacy_title_line(line: str) -> bool:
+    for pattern in INVALID_TITLE_PATTERNS:
+        if re.match(pattern, line, re.IGNORECASE):
+            return True
+    return False
+
+
+def compiled_author_keywords(line: str) -> bool:
+    return bool(INVALID_AUTHOR_KEYWORDS_RE.search(line))
+
+
+CASES = [
+    ('作者黑名单(子串)', legacy_author_line, is_invalid_author_line),
+    ('作者关键词(正则)', legacy_author_keywords, compiled_author_keywords),
+    ('标题无效模式(正则)', legacy_title_line, is_invalid_title_line),
+]
+
+
+def run(number: int):
+    for name, legacy, compiled in CASES:
+        # 先确认两种写法结论一致
+        for line in SAMPLE_LINES:
+            assert legacy(line) == compiled(line), (name, line)
+
+        def loop(fn):
+            return lambda: [fn(line) for line in SAMPLE_LINES]
+
+        calls = number * len(SAMPLE_LINES)
+        legacy_s = min(timeit.repeat(loop(legacy), number=number, repeat=5))
+        compiled_s = min(timeit.repeat(loop(compiled), number=number, repeat=5))
+        legacy_ns = legacy_s / calls * 1e9
+        compiled_ns = compiled_s / calls * 1e9
+        print(f"{name}: 旧写法 {legacy_ns:8.0f} ns/行, 编译后 {compiled_ns:8.0f} ns/行, "
+              f"加速 {legacy_ns / compiled_ns:.1f}x")
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='黑名单过滤微基准')
+    arg_parser.add_argument('--number', type=int, default=2000, help='每轮重复次数')
+    args = arg_parser.parse_args()
+    run(args.number)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+结果导出基准
+用 papers_accept 的真实验证结果（含 pdf_text / ocr_text，循环使用到 N 条）比较：
+
+  legacy      原先的做法：全部结果保留在内存，导出时 json.dump(indent=2) 一次写出
+  slim        流式导出（JSONL），每条结果完成即写入，只保留精简记录
+  full        流式导出（JSONL），全文按内容哈希写到 .texts 目录
+  slim-csv    流式导出（CSV）
+
+样例PDF大多只解析出很少的文本，--text-kb 把每个文件的 pdf_text 补到接近真实论文前5页的长度。
+输出导出文件大小、导出耗时、保留结果所需的内存（tracemalloc 峰值）。
+
+用法: python benchmarks/bench_export.py [--results 2000] [--text-kb 30] [pdf_dir]
+"""
+
+import argparse
+import copy
+import glob
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from python_verifier import PDFVerifier
+from result_export import ResultExporter, slim_result, PROFILE_FULL, PROFILE_SLIM
+from bench_pipeline import BenchCase, install_mock_ocr
+
+
+def dir_size(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def make_results(pdf_dir: str):
+    pdf_paths = sorted(glob.glob(os.path.join(pdf_dir, '*.pdf')))
+    if not pdf_paths:
+        raise SystemExit(f"未找到PDF文件: {pdf_dir}")
+    verifier = PDFVerifier(max_file_workers=1)
+    cases = [BenchCase(verifier, path) for path in pdf_paths]
+    install_mock_ocr(verifier, cases, 0)
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w', encoding='utf-8')  # 验证过程中的进度print
+    try:
+        return [verifier.verify_paper(case.metadata) for case in cases]
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+
+SAMPLE_TEXT = ("Received 12 March 2021; accepted 3 June 2021. Abstract. We study the verification of "
+               "bibliographic metadata against full-text documents. 摘要：本文研究论文元数据与全文的一致性验证。 ")
+
+
+def produce(results, count: int, text_kb: int):
+    """模拟批量验证：每条结果是独立的新对象（与真实批次一样不共享文本）"""
+    text_chars = text_kb * 1024
+    for i in range(count):
+        result = copy.deepcopy(results[i % len(results)])
+        for file_result in result['files']:
+            # 每篇论文的文本各不相同
+            text = file_result.get('pdf_text', '') or SAMPLE_TEXT
+            file_result['pdf_text'] = f"[{i}] " + (text * (text_chars // len(text) + 1))[:text_chars]
+            if file_result.get('ocr_text'):
+                file_result['ocr_text'] = f"[{i}] " + file_result['ocr_text']
+        yield f"/papers/paper{i:06d}.json", result
+
+
+def run_mode(mode: str, results, count: int, text_kb: int, out_dir: str):
+    suffix = '.csv' if mode == 'slim-csv' else ('.json' if mode == 'legacy' else '.jsonl')
+    path = os.path.join(out_dir, f"export-{mode}{suffix}")
+    tracemalloc.start()
+    start = time.perf_counter()
+    if mode == 'legacy':
+        retained = []
+        for _, result in produce(results, count, text_kb):
+            retained.append(result)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(retained, f, ensure_ascii=False, indent=2)
+    else:
+        retained = []
+        profile = PROFILE_FULL if mode == 'full' else PROFILE_SLIM
+        with ResultExporter(path, profile=profile) as exporter:
+            for json_path, result in produce(results, count, text_kb):
+                exporter.write(result, json_path)
+                retained.append(slim_result(result, json_path))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    size = dir_size(path)
+    text_dir = os.path.splitext(path)[0] + '.texts'
+    texts = dir_size(text_dir) if os.path.isdir(text_dir) else 0
+    return {'size': size, 'texts': texts, 'seconds': elapsed, 'peak': peak}
+
+
+def run(count: int, text_kb: int, pdf_dir: str):
+    results = make_results(pdf_dir)
+    out_dir = tempfile.mkdtemp(prefix='bench_export_')
+    try:
+        print(f"{count} 条结果（{len(results)} 篇真实结果循环使用，每个文件 pdf_text {text_kb}KB）")
+        print(f"{'方式':<10}{'导出文件 MB':>12}{'全文目录 MB':>12}{'耗时 s':>10}{'内存峰值 MB':>12}")
+        for mode in ('legacy', 'slim', 'full', 'slim-csv'):
+            row = run_mode(mode, results, count, text_kb, out_dir)
+            print(f"{mode:<10}{row['size'] / 1e6:>12.2f}{row['texts'] / 1e6:>12.2f}{row['seconds']:>10.2f}"
+                  f"{row['peak'] / 1e6:>12.1f}")
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='结果导出基准')
+    arg_parser.add_argument('--results', type=int, default=2000, help='导出的结果条数')
+    arg_parser.add_argument('--text-kb', type=int, default=30, help='每个文件的 pdf_text 长度（KB）')
+    arg_parser.add_argument('pdf_dir', nargs='?', default=os.path.join(ROOT_DIR, 'papers_accept'), help='PDF目录')
+    args = arg_parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger('PDFVerifier').setLevel(logging.WARNING)
+    run(args.results, args.text_kb, args.pdf_dir)
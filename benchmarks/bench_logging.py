@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+日志开销基准
+在不同日志配置下对 papers_accept 跑完整 verify_paper（OCR为模拟结果），以及带完整文本输出的
+perform_two_stage_ocr（网络调用替换为固定返回），给出每文件耗时和日志所占比例。
+
+配置:
+  off          关闭全部日志（基线）
+  legacy       原先的同步写法：根日志DEBUG，FileHandler + StreamHandler 在工作线程中直接写入
+  queue_info   QueueHandler/QueueListener，文件和控制台INFO
+  queue_debug  QueueHandler/QueueListener，文件和控制台DEBUG
+
+控制台输出重定向到 os.devnull，日志文件写到临时目录。
+
+用法: python benchmarks/bench_logging.py [PDF目录] [--repeat 5]
+"""
+
+import argparse
+import glob
+import logging
+import os
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import ocr_api_python
+import python_verifier
+from python_verifier import PDFVerifier, setup_logging, shutdown_logging
+from bench_pipeline import BenchCase, install_mock_ocr
+
+CONFIGS = ('off', 'legacy', 'queue_info', 'queue_debug')
+
+# 模拟OCR接口返回：约4KB原始文本和一份结构化结果
+FAKE_OCR_TEXT = '\n'.join(f"Line {i}: Received 13 June 2025; Accepted 20 September 2025; "
+                          f"A digital twin method for real-time analysis of high arch dams" for i in range(40))
+FAKE_STRUCTURED = {
+    'title': 'A digital twin method for real-time analysis of structural deformation and failure for high arch dams',
+    'first_author': 'Jichen Tian',
+    'authors': 'Jichen Tian, Chen Chen, Limin Zhang, Jiankang Chen, Huibao Huang, Pengtao Zhang',
+    'dates': {'received': '13 June 2025', 'received_in_revised': '19 August 2025',
+              'accepted': '20 September 2025', 'available_online': '1 October 2025'},
+}
+
+
+def fake_llm(ocr_text):
+    return {'rawText': str(FAKE_STRUCTURED), 'structured': FAKE_STRUCTURED, 'isStructured': True,
+            'parseError': None, 'truncatedInput': False}
+
+
+def configure(config: str, log_dir: str, devnull):
+    """切换到指定日志配置（先撤销上一个配置）"""
+    shutdown_logging()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    logging.disable(logging.NOTSET)
+    for name in python_verifier.NOISY_LOGGERS:
+        logging.getLogger(name).setLevel(logging.NOTSET)
+
+    log_file = os.path.join(log_dir, f'{config}.log')
+    stdout = sys.stdout
+    sys.stdout = devnull  # StreamHandler 在创建时绑定 sys.stdout
+    try:
+        if config == 'off':
+            logging.disable(logging.CRITICAL)
+        elif config == 'legacy':
+            formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(name)s: %(message)s', '%Y-%m-%d %H:%M:%S')
+            for handler in (logging.FileHandler(log_file, encoding='utf-8'), logging.StreamHandler(sys.stdout)):
+                handler.setFormatter(formatter)
+                root.addHandler(handler)
+            root.setLevel(logging.DEBUG)
+        else:
+            level = 'DEBUG' if config == 'queue_debug' else 'INFO'
+            setup_logging(log_file, file_level=level, console_level=level, force=True)
+    finally:
+        sys.stdout = stdout
+
+
+def run_workload(verifier: PDFVerifier, cases, repeat: int):
+    """返回 (verify_paper 每文件ms, perform_two_stage_ocr 每次ms)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for case in cases:
+            verifier.verify_paper(case.metadata)
+    verify_ms = (time.perf_counter() - start) * 1000 / (repeat * len(cases))
+
+    start = time.perf_counter()
+    for _ in range(repeat * 20):
+        ocr_api_python.perform_two_stage_ocr('data:image/jpeg;base64,')
+    ocr_ms = (time.perf_counter() - start) * 1000 / (repeat * 20)
+    return verify_ms, ocr_ms
+
+
+def run(pdf_dir: str, repeat: int):
+    pdf_paths = sorted(glob.glob(os.path.join(pdf_dir, '*.pdf')))
+    if not pdf_paths:
+        raise SystemExit(f"未找到PDF文件: {pdf_dir}")
+
+    ocr_api_python.ocr_extract_text_from_image_data_url = lambda image_data_url: FAKE_OCR_TEXT
+    ocr_api_python.structure_academic_info_from_ocr_text = fake_llm
+
+    devnull = open(os.devnull, 'w', encoding='utf-8')
+    stdout = sys.stdout
+    results = {}
+    with tempfile.TemporaryDirectory() as log_dir:
+        configure('off', log_dir, devnull)
+        verifier = PDFVerifier(max_file_workers=1)
+        cases = [BenchCase(verifier, path) for path in pdf_paths]
+        install_mock_ocr(verifier, cases, 0)
+
+        for config in CONFIGS:
+            configure(config, log_dir, devnull)
+            sys.stdout = devnull  # 验证过程中的进度print
+            try:
+                run_workload(verifier, cases, 1)  # 预热
+                verify_ms, ocr_ms = run_workload(verifier, cases, repeat)
+                drain_start = time.perf_counter()
+                shutdown_logging()  # 队列中剩余日志写完所需时间
+                drain_ms = (time.perf_counter() - drain_start) * 1000
+            finally:
+                sys.stdout = stdout
+            log_file = os.path.join(log_dir, f'{config}.log')
+            log_kb = os.path.getsize(log_file) / 1024 if os.path.exists(log_file) else 0
+            results[config] = {'verify_ms': verify_ms, 'ocr_ms': ocr_ms, 'drain_ms': drain_ms, 'log_kb': log_kb}
+        configure('off', log_dir, devnull)
+    devnull.close()
+
+    base = results['off']
+    print(f"{'配置':<14}{'verify_paper ms/文件':>22}{'日志占比':>10}{'二段式OCR ms/次':>18}{'日志占比':>10}"
+          f"{'队列收尾 ms':>12}{'日志大小 KB':>12}")
+    for config, row in results.items():
+        verify_share = max(0.0, 1 - base['verify_ms'] / row['verify_ms'])
+        ocr_share = max(0.0, 1 - base['ocr_ms'] / row['ocr_ms'])
+        print(f"{config:<14}{row['verify_ms']:>22.2f}{verify_share:>10.1%}{row['ocr_ms']:>18.3f}{ocr_share:>10.1%}"
+              f"{row['drain_ms']:>12.1f}{row['log_kb']:>12.0f}")
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='日志开销基准')
+    arg_parser.add_argument('pdf_dir', nargs='?', default=os.path.join(ROOT_DIR, 'papers_accept'),
+                            help='PDF目录')
+    arg_parser.add_argument('--repeat', type=int, default=5, help='重复次数')
+    args = arg_parser.parse_args()
+    run(args.pdf_dir, args.repeat)
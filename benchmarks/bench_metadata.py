@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PDF元数据读取基准
+对比只读trailer/Info/XMP的快速路径与原先 PyPDF2 + pdfplumber 两次打开文档的单文件耗时
+
+用法: python benchmarks/bench_metadata.py [PDF目录] [--number 20]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from pdf_metadata_reader import read_pdf_metadata, PDFMetadataError
+
+try:
+    import PyPDF2
+    HAS_PYPDF2 = True
+except ImportError:
+    HAS_PYPDF2 = False
+
+try:
+    import pdfplumber
+    HAS_PDFPLUMBER = True
+except ImportError:
+    HAS_PDFPLUMBER = False
+
+
+def fast_path(pdf_path: str):
+    try:
+        return read_pdf_metadata(pdf_path)['info']
+    except PDFMetadataError:
+        return None
+
+
+def pypdf2_path(pdf_path: str):
+    try:
+        with open(pdf_path, 'rb') as file:
+            return dict(PyPDF2.PdfReader(file, strict=False).metadata or {})
+    except Exception:
+        return None
+
+
+def legacy_path(pdf_path: str):
+    """原先的做法：PyPDF2读取后，标题/作者缺失时再用pdfplumber打开一次"""
+    metadata = pypdf2_path(pdf_path) or {}
+    if HAS_PDFPLUMBER and (not metadata.get('/Title') or not metadata.get('/Author')):
+        try:
+            with pdfplumber.open(pdf_path) as pdf:
+                metadata = pdf.metadata or metadata
+        except Exception:
+            pass
+    return metadata
+
+
+def time_per_file(fn, pdf_paths, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        for path in pdf_paths:
+            fn(path)
+    return (time.perf_counter() - start) / (number * len(pdf_paths)) * 1000
+
+
+def run(pdf_dir: str, number: int):
+    pdf_paths = sorted(glob.glob(os.path.join(pdf_dir, '*.pdf')))
+    if not pdf_paths:
+        print(f"未找到PDF文件: {pdf_dir}")
+        return
+
+    # 先确认两种方式读到的Info字典一致（PyPDF2读取失败的文件除外）
+    for path in pdf_paths:
+        if HAS_PYPDF2:
+            expected = pypdf2_path(path)
+            if expected is not None:
+                assert fast_path(path) == {k: str(v) for k, v in expected.items()}, path
+
+    fast_ms = time_per_file(fast_path, pdf_paths, number)
+    print(f"快速路径: {fast_ms:8.2f} ms/文件 ({len(pdf_paths)} 个文件)")
+    if HAS_PYPDF2:
+        pypdf2_ms = time_per_file(pypdf2_path, pdf_paths, number)
+        print(f"PyPDF2:   {pypdf2_ms:8.2f} ms/文件, 加速 {pypdf2_ms / fast_ms:.1f}x")
+        legacy_ms = time_per_file(legacy_path, pdf_paths, number)
+        print(f"PyPDF2 + pdfplumber: {legacy_ms:8.2f} ms/文件, 加速 {legacy_ms / fast_ms:.1f}x")
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='PDF元数据读取基准')
+    arg_parser.add_argument('pdf_dir', nargs='?', default=os.path.join(ROOT_DIR, 'papers_accept'),
+                            help='PDF目录')
+    arg_parser.add_argument('--number', type=int, default=20, help='每个文件重复次数')
+    args = arg_parser.parse_args()
+    run(args.pdf_dir, args.number)
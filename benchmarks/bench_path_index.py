@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PDF路径解析基准
+在含 N 个文件的临时下载目录中解析 M 条相对路径（一半直接位于JSON目录，一半带着浏览器端的子目录前缀、
+只能按文件名找到），比较原先逐个位置 os.path.exists 的做法和共享目录索引（path_index）的
+文件系统调用次数和耗时。--stat-latency-ms 给每次 stat/scandir 加上固定延迟，模拟网络挂载的目录。
+
+用法: python benchmarks/bench_path_index.py [--files 5000] [--lookups 2000] [--stat-latency-ms 0.5]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import path_index
+from path_index import PathIndex
+
+
+def legacy_resolve(pdf_path: str, json_file_path: str) -> str:
+    """原 PDFVerifier._resolve_pdf_path 的查找顺序"""
+    pdf_path = os.path.normpath(pdf_path)
+    if not os.path.isabs(pdf_path):
+        json_dir = os.path.dirname(json_file_path) if json_file_path else os.getcwd()
+        abs_pdf_path = os.path.normpath(os.path.join(json_dir, pdf_path))
+        if os.path.exists(abs_pdf_path):
+            pdf_path = abs_pdf_path
+        else:
+            abs_pdf_path = os.path.normpath(os.path.join(os.getcwd(), pdf_path))
+            if os.path.exists(abs_pdf_path):
+                pdf_path = abs_pdf_path
+            else:
+                downloads_dir = os.path.join(os.path.expanduser('~'), 'Downloads')
+                if os.path.exists(downloads_dir):
+                    abs_pdf_path = os.path.normpath(os.path.join(downloads_dir, pdf_path))
+                    if os.path.exists(abs_pdf_path):
+                        pdf_path = abs_pdf_path
+                if not os.path.exists(pdf_path):
+                    abs_pdf_path = os.path.normpath(os.path.join(json_dir, os.path.basename(pdf_path)))
+                    if os.path.exists(abs_pdf_path):
+                        pdf_path = abs_pdf_path
+    return pdf_path
+
+
+class SyscallCounter:
+    """统计并（可选）延迟 os.stat / os.scandir 调用；os.path.exists 内部调用 os.stat"""
+
+    def __init__(self, latency_ms: float):
+        self.latency = latency_ms / 1000
+        self.calls = 0
+        self._stat, self._scandir = os.stat, os.scandir
+
+    def __enter__(self):
+        def stat(*args, **kwargs):
+            self.calls += 1
+            if self.latency:
+                time.sleep(self.latency)
+            return self._stat(*args, **kwargs)
+
+        def scandir(*args, **kwargs):
+            self.calls += 1
+            if self.latency:
+                time.sleep(self.latency)
+            return self._scandir(*args, **kwargs)
+
+        os.stat, os.scandir = stat, scandir
+        return self
+
+    def __exit__(self, *exc):
+        os.stat, os.scandir = self._stat, self._scandir
+
+
+def run(files: int, lookups: int, latency_ms: float):
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(files):
+            open(os.path.join(directory, f"paper{i:06d}.pdf"), 'wb').close()
+        json_path = os.path.join(directory, 'record.json')
+        # 目录修改时间需早于建索引时间 RACY_SECONDS 以上，否则索引每次都会重建
+        old = time.time() - 60
+        os.utime(directory, (old, old))
+
+        paths = []
+        for i in range(lookups):
+            name = f"paper{(i * 7919) % files:06d}.pdf"
+            paths.append(name if i % 2 else f"论文下载/{name}")
+
+        print(f"目录 {files} 个文件，解析 {lookups} 条相对路径，每次调用附加延迟 {latency_ms}ms")
+        print(f"{'方式':<10}{'系统调用':>10}{'耗时 ms':>12}{'每条 us':>10}")
+        expected = None
+        for label in ('legacy', 'index'):
+            resolver = PathIndex()
+            resolve = (lambda p: legacy_resolve(p, json_path)) if label == 'legacy' else \
+                (lambda p: resolver.resolve(p, json_path))
+            with SyscallCounter(latency_ms) as counter:
+                start = time.perf_counter()
+                resolved = [resolve(p) for p in paths]
+                elapsed_ms = (time.perf_counter() - start) * 1000
+            if expected is None:
+                expected = resolved
+            elif resolved != expected:
+                mismatches = sum(1 for a, b in zip(resolved, expected) if a != b)
+                print(f"  警告: {mismatches} 条解析结果与原实现不同")
+            print(f"{label:<10}{counter.calls:>10}{elapsed_ms:>12.1f}{elapsed_ms * 1000 / lookups:>10.1f}")
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='PDF路径解析基准')
+    arg_parser.add_argument('--files', type=int, default=5000, help='下载目录中的文件数')
+    arg_parser.add_argument('--lookups', type=int, default=2000, help='解析的路径条数')
+    arg_parser.add_argument('--stat-latency-ms', type=float, default=0.0, help='每次 stat/scandir 的附加延迟')
+    args = arg_parser.parse_args()
+    run(args.files, args.lookups, args.stat_latency_ms)
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+验证流水线基准
+对 papers_accept 样例逐阶段计时（预检、文本提取、元数据、日期/作者/标题提取、匹配、模拟OCR）
+以及完整的 verify_paper，输出每阶段 p50/p95 耗时和内存峰值，可保存基线JSON供CI对比。
+
+只测PDF输入：验证器只接收侧车JSON引用的PDF，目录中的图片（如从PDF导出的 .jpg）不在流水线中，
+报告的 env.excluded 列出这些文件。
+OCR 使用模拟结果（不栅格化、不调用API），可用 --ocr-latency-ms 模拟接口往返耗时。
+内存在计时之外单独跑一遍：peak_alloc_kb 为该阶段的 tracemalloc 峰值；
+rss_hwm_kb 为该阶段结束时整个进程的 RSS 高水位（只增不减，包含之前所有阶段），
+rss_hwm_delta_kb 为该阶段把高水位抬高了多少（为0表示没有超过之前阶段的峰值）。
+耗时与机器相关：基线记录机器信息（env.machine：Python主次版本、系统、架构、CPU数），
+与当前机器不同时 --compare 以退出码2失败，加 --allow-machine-mismatch 才照常对比。
+
+用法:
+  python benchmarks/bench_pipeline.py [PDF目录] [--repeat 5]
+  python benchmarks/bench_pipeline.py --save-baseline benchmarks/baseline_pipeline.json
+  python benchmarks/bench_pipeline.py --compare benchmarks/baseline_pipeline.json --tolerance 0.5
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from python_verifier import PDFVerifier
+from verify_timing import rollup
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:
+    HAS_RESOURCE = False
+
+DEFAULT_BASELINE = os.path.join(ROOT_DIR, 'benchmarks', 'baseline_pipeline.json')
+DEFAULT_TOLERANCE = 0.5  # p50/p95 超过基线的比例
+MACHINE_KEYS = ('python', 'system', 'machine', 'cpu_count')  # 这些字段都相同时耗时才可比（不含内核版本等细节）
+MIN_REGRESSION_MS = 1.0  # 小于该绝对差值的波动不算回归
+
+# 扫描件没有文本层时的模拟OCR文本
+MOCK_OCR_TEXT = """Engineering Failure Analysis
+Acceptance Letter
+Dear Dr. Tian,
+Your manuscript entitled "A digital twin method for real-time analysis of structural deformation
+and failure for high arch dams" has been accepted for publication.
+Authors: Jichen Tian, Chen Chen, Limin Zhang
+Received 13 June 2025; Received in revised form 19 August 2025; Accepted 20 September 2025
+"""
+
+STAGES = ('preflight', 'text', 'metadata', 'dates', 'author', 'title', 'matching', 'ocr_mock', 'verify_paper')
+
+
+class BenchCase:
+    """单个PDF的基准输入：按文件构造的论文记录及各阶段的前置结果"""
+
+    def __init__(self, verifier: PDFVerifier, pdf_path: str):
+        self.pdf_path = pdf_path
+        self.file_name = os.path.basename(pdf_path)
+        self.text, _, _ = verifier.extract_text_cascade(pdf_path, max_pages=5)
+        self.ocr_text = self.text or MOCK_OCR_TEXT
+        self.dates = verifier.extract_dates_from_text(self.ocr_text)
+        self.author = verifier.extract_author_from_text(self.ocr_text)
+        self.title = verifier.extract_title_from_text(self.ocr_text)
+        # 用本地提取结果充当网页端记录，使匹配阶段走命中路径
+        first_date = next((value for key, value in self.dates.items() if key != 'other' and value),
+                          (self.dates.get('other') or [''])[0])
+        self.metadata = {
+            'title': self.title or self.file_name,
+            'firstAuthor': self.author or '',
+            'date': first_date or '',
+            'files': [{'fileName': self.file_name, 'filePath': pdf_path, 'type': 'benchmark'}],
+        }
+
+
+def install_mock_ocr(verifier: PDFVerifier, cases, latency_ms: float):
+    """用预置文本替换OCR API调用（每个文件返回自身文本层或样例文本）"""
+    texts = {case.pdf_path: case.ocr_text for case in cases}
+
+    def mock_ocr(pdf_path, page_num=0, timings=None):
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+        return {'text': texts.get(pdf_path, MOCK_OCR_TEXT), 'structured': None, 'isStructured': False}
+
+    verifier.ocr_image_with_api = mock_ocr
+
+
+def stage_functions(verifier: PDFVerifier):
+    """阶段名 -> fn(case)"""
+    def matching(case):
+        verifier.check_author_match(case.metadata['firstAuthor'], case.author)
+        verifier.check_date_match(case.metadata['date'], case.dates)
+        verifier.check_title_match(case.metadata['title'], case.title)
+
+    return {
+        'preflight': lambda case: verifier.preflight_classify(case.pdf_path),
+        'text': lambda case: verifier.extract_text_cascade(case.pdf_path, max_pages=5),
+        'metadata': lambda case: verifier.extract_pdf_metadata(case.pdf_path),
+        'dates': lambda case: verifier.extract_dates_from_text(case.ocr_text),
+        'author': lambda case: verifier.extract_author_from_text(case.ocr_text),
+        'title': lambda case: verifier.extract_title_from_text(case.ocr_text),
+        'matching': matching,
+        'ocr_mock': lambda case: verifier.ocr_image_with_api(case.pdf_path),
+        'verify_paper': lambda case: verifier.verify_paper(case.metadata),
+    }
+
+
+def time_stages(verifier: PDFVerifier, cases, stages, repeat: int, warmup: int):
+    """每个阶段对每个文件重复 repeat 次，样本为单文件单次耗时"""
+    functions = stage_functions(verifier)
+    samples = []
+    for stage in stages:
+        fn = functions[stage]
+        for _ in range(warmup):
+            for case in cases:
+                fn(case)
+        for _ in range(repeat):
+            for case in cases:
+                # 同一文本的字段提取结果会被缓存，重复计时前清空，样本反映首次验证的耗时
+                verifier._field_cache.clear()
+                start = time.perf_counter()
+                fn(case)
+                samples.append({stage: {'ms': (time.perf_counter() - start) * 1000, 'count': 1}})
+    return rollup(samples)
+
+
+def rss_high_water_kb() -> int:
+    """进程的 RSS 高水位（KB）；Linux 上 ru_maxrss 单位为KB，macOS 为字节"""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss // 1024 if sys.platform == 'darwin' else max_rss
+
+
+def measure_memory(verifier: PDFVerifier, cases, stages):
+    """每个阶段跑一遍全部文件，记录 tracemalloc 峰值、进程 RSS 高水位及该阶段带来的高水位增量"""
+    functions = stage_functions(verifier)
+    memory = {}
+    tracemalloc.start()
+    try:
+        for stage in stages:
+            tracemalloc.reset_peak()
+            hwm_before = rss_high_water_kb() if HAS_RESOURCE else 0
+            for case in cases:
+                functions[stage](case)
+            memory[stage] = {'peak_alloc_kb': round(tracemalloc.get_traced_memory()[1] / 1024, 1)}
+            if HAS_RESOURCE:
+                hwm = rss_high_water_kb()
+                memory[stage]['rss_hwm_kb'] = hwm
+                memory[stage]['rss_hwm_delta_kb'] = hwm - hwm_before
+    finally:
+        tracemalloc.stop()
+    return memory
+
+
+def machine_info() -> dict:
+    return {
+        'python': '.'.join(platform.python_version_tuple()[:2]),
+        'system': platform.system(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def run(pdf_dir: str, repeat: int, warmup: int, stages, ocr_latency_ms: float) -> dict:
+    pdf_paths = sorted(glob.glob(os.path.join(pdf_dir, '*.pdf')))
+    if not pdf_paths:
+        raise SystemExit(f"未找到PDF文件: {pdf_dir}")
+    excluded = sorted(name for name in os.listdir(pdf_dir)
+                      if os.path.isfile(os.path.join(pdf_dir, name)) and not name.lower().endswith('.pdf'))
+
+    # 文件内不并发，计时只反映单线程的阶段耗时
+    verifier = PDFVerifier(max_file_workers=1)
+    cases = [BenchCase(verifier, path) for path in pdf_paths]
+    install_mock_ocr(verifier, cases, ocr_latency_ms)
+
+    summary = time_stages(verifier, cases, stages, repeat, warmup)
+    memory = measure_memory(verifier, cases, stages)
+    for stage in stages:
+        summary[stage].update(memory.get(stage, {}))
+        summary[stage].pop('bytes_in', None)
+        summary[stage].pop('bytes_out', None)
+        summary[stage].pop('cache_hits', None)
+
+    return {
+        'env': {
+            'machine': machine_info(),
+            'corpus': os.path.relpath(pdf_dir, ROOT_DIR),
+            'files': [case.file_name for case in cases],
+            'excluded': excluded,
+            'repeat': repeat,
+            'ocr_latency_ms': ocr_latency_ms,
+            'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        },
+        'stages': {stage: summary[stage] for stage in stages},
+    }
+
+
+def format_report(report: dict) -> str:
+    lines = [f"{'阶段':<14}{'样本':>6}{'p50 ms':>10}{'p95 ms':>10}{'最大 ms':>10}{'峰值分配KB':>12}"
+             f"{'RSS高水位KB':>13}{'高水位增量KB':>14}"]
+    for stage, row in report['stages'].items():
+        lines.append(f"{stage:<14}{row['count']:>6}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}"
+                     f"{row['max_ms']:>10.2f}{row.get('peak_alloc_kb', 0):>12.1f}"
+                     f"{row.get('rss_hwm_kb', 0):>13}{row.get('rss_hwm_delta_kb', 0):>14}")
+    excluded = report['env'].get('excluded')
+    if excluded:
+        lines.append(f"未测（不是PDF，验证流水线不接收）: {', '.join(excluded)}")
+    return '\n'.join(lines)
+
+
+def machine_mismatch(report: dict, baseline: dict) -> list:
+    """基线与当前机器不同的字段（旧基线没有 env.machine 时视为不同）"""
+    current = report['env']['machine']
+    recorded = baseline.get('env', {}).get('machine')
+    if not recorded:
+        return ['machine']
+    return [key for key in MACHINE_KEYS if recorded.get(key) != current.get(key)]
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """与基线对比，返回回归列表（p50/p95 超过基线 tolerance 比例且绝对差值超过 MIN_REGRESSION_MS）"""
+    regressions = []
+    for stage, base in baseline.get('stages', {}).items():
+        current = report['stages'].get(stage)
+        if current is None:
+            continue
+        for key in ('p50_ms', 'p95_ms'):
+            limit = base[key] * (1 + tolerance)
+            if current[key] > limit and current[key] - base[key] > MIN_REGRESSION_MS:
+                regressions.append(f"{stage} {key}: {current[key]:.2f} > 基线 {base[key]:.2f} (+{tolerance:.0%})")
+    return regressions
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='验证流水线基准')
+    arg_parser.add_argument('pdf_dir', nargs='?', default=os.path.join(ROOT_DIR, 'papers_accept'),
+                            help='PDF目录')
+    arg_parser.add_argument('--repeat', type=int, default=5, help='每个文件每阶段重复次数')
+    arg_parser.add_argument('--warmup', type=int, default=1, help='预热次数（不计入结果）')
+    arg_parser.add_argument('--stages', default=','.join(STAGES), help='逗号分隔的阶段列表')
+    arg_parser.add_argument('--ocr-latency-ms', type=float, default=0.0, help='模拟OCR接口往返耗时')
+    arg_parser.add_argument('--save-baseline', metavar='PATH', nargs='?', const=DEFAULT_BASELINE,
+                            help='保存结果为基线JSON')
+    arg_parser.add_argument('--compare', metavar='PATH', nargs='?', const=DEFAULT_BASELINE,
+                            help='与基线JSON对比，有回归时退出码为1')
+    arg_parser.add_argument('--allow-machine-mismatch', action='store_true',
+                            help='基线在不同机器上记录时仍然对比（默认以退出码2失败）')
+    arg_parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='允许的相对回归比例')
+    arg_parser.add_argument('--json', action='store_true', help='以JSON输出结果')
+    args = arg_parser.parse_args()
+
+    # 基准只关心耗时，关闭验证器的INFO/DEBUG日志输出
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger('PDFVerifier').setLevel(logging.WARNING)
+
+    selected = [stage.strip() for stage in args.stages.split(',') if stage.strip()]
+    unknown = [stage for stage in selected if stage not in STAGES]
+    if unknown:
+        raise SystemExit(f"未知阶段: {unknown}，可选: {STAGES}")
+
+    report = run(args.pdf_dir, args.repeat, args.warmup, selected, args.ocr_latency_ms)
+    print(json.dumps(report, ensure_ascii=False, indent=2) if args.json else format_report(report))
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"基线已保存: {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        mismatch = machine_mismatch(report, baseline)
+        if mismatch and not args.allow_machine_mismatch:
+            print(f"基线在不同的机器上记录（{', '.join(mismatch)} 不同），耗时不可比，未做对比；"
+                  f"请在本机用 --save-baseline 重新记录，或加 --allow-machine-mismatch 强制对比",
+                  file=sys.stderr)
+            sys.exit(2)
+        if mismatch:
+            print(f"警告: 基线在不同的机器上记录（{', '.join(mismatch)} 不同），对比结果仅供参考")
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print("性能回归:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"与基线对比无回归（容差 {args.tolerance:.0%}）")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+验证结果记录基准
+用 papers_accept 的真实验证结果（循环使用到 N 条，每条从JSON重新解析，文本不共享）比较：
+
+  dict      原先的做法：保留嵌套字典
+  records   保留 PaperResult / FileResult（__slots__ 数据类）
+
+输出保留 N 条结果所需的内存（tracemalloc，保留后的当前值），其中文本（pdf_text / ocr_text）以外的部分单独列出；
+以及匹配阶段读取文件结果字段的耗时（字典 .get 与属性访问）和 match_file 每次调用的耗时。
+
+用法: python benchmarks/bench_records.py [--results 2000] [--repeat 200000] [pdf_dir]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import timeit
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from result_records import FileResult, PaperResult
+from bench_export import make_results
+
+
+def text_bytes(results) -> int:
+    """保留结果中全文字符串占用的内存（两种方式相同）"""
+    return sum(sys.getsizeof(file_result.get(field) or '')
+               for result in results for file_result in result['files'] for field in ('pdf_text', 'ocr_text'))
+
+
+def retain(encoded, count: int, mode: str):
+    tracemalloc.start()
+    retained = []
+    for i in range(count):
+        result = json.loads(encoded[i % len(encoded)])
+        retained.append(PaperResult.from_dict(result) if mode == 'records' else result)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained, current
+
+
+def access_times(file_dict, repeat: int):
+    """匹配阶段读取的字段：候选作者/标题、PDF元数据、提取的日期"""
+    record = FileResult.from_dict(file_dict)
+    dict_ns = timeit.timeit(
+        lambda: (file_dict.get('candidates'), file_dict.get('pdf_metadata'), file_dict.get('extracted_dates'),
+                 file_dict.get('ocr_structured'), file_dict.get('pdf_text'), file_dict.get('ocr_text')),
+        number=repeat) / repeat * 1e9
+    record_ns = timeit.timeit(
+        lambda: (record.candidates, record.pdf_metadata, record.extracted_dates,
+                 record.ocr_structured, record.pdf_text, record.ocr_text),
+        number=repeat) / repeat * 1e9
+    return dict_ns, record_ns
+
+
+def run(count: int, repeat: int, pdf_dir: str):
+    results = make_results(pdf_dir)
+    encoded = [json.dumps(result, ensure_ascii=False, default=str) for result in results]
+    files = sum(len(json.loads(encoded[i % len(encoded)])['files']) for i in range(count))
+    print(f"{count} 条结果，{files} 个文件（{len(results)} 篇真实结果循环使用）")
+    print(f"{'方式':<10}{'保留内存 MB':>12}{'不含全文 MB':>12}{'每条 KB':>10}{'每条(不含全文) B':>18}")
+    for mode in ('dict', 'records'):
+        retained, current = retain(encoded, count, mode)
+        texts = text_bytes([record.to_dict() if mode == 'records' else record for record in retained])
+        print(f"{mode:<10}{current / 1e6:>12.2f}{(current - texts) / 1e6:>12.2f}{current / count / 1024:>10.1f}"
+              f"{(current - texts) / count:>18.0f}")
+        del retained
+
+    from python_verifier import PDFVerifier
+    verifier = PDFVerifier(max_file_workers=1)
+    logging.getLogger('PDFVerifier').setLevel(logging.WARNING)
+    sample = next((file_result for result in results for file_result in result['files']
+                   if file_result.get('candidates')), results[0]['files'][0])
+    dict_ns, record_ns = access_times(sample, repeat)
+    print(f"\n读取匹配字段（6个）: 字典 {dict_ns:.0f} ns，属性 {record_ns:.0f} ns")
+    metadata = results[0]['metadata']
+    record = FileResult.from_dict(sample)
+    calls = max(1, repeat // 100)
+    match_us = timeit.timeit(lambda: verifier.match_file(record, metadata), number=calls) / calls * 1e6
+    print(f"match_file: {match_us:.1f} µs/次")
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='验证结果记录基准')
+    arg_parser.add_argument('--results', type=int, default=2000, help='保留的结果条数')
+    arg_parser.add_argument('--repeat', type=int, default=200000, help='字段读取的重复次数')
+    arg_parser.add_argument('pdf_dir', nargs='?', default=os.path.join(ROOT_DIR, 'papers_accept'), help='PDF目录')
+    args = arg_parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger('PDFVerifier').setLevel(logging.WARNING)
+    run(args.results, args.repeat, args.pdf_dir)
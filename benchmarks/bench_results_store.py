@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+结果库增量检查基准
+在临时目录生成 N 条侧车JSON + PDF（随机内容），首次运行写入结果，
+再测未变化时的整库检查耗时（只做 stat 和索引查询），以及修改部分文件后的检查耗时。
+
+用法: python benchmarks/bench_results_store.py [--count 20000] [--changed 100]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from results_store import ResultsStore
+
+
+def run(count: int, changed: int):
+    with tempfile.TemporaryDirectory() as work_dir:
+        records = []
+        for i in range(count):
+            pdf_path = os.path.join(work_dir, f'paper{i}.pdf')
+            json_path = os.path.join(work_dir, f'paper{i}.json')
+            with open(pdf_path, 'wb') as f:
+                f.write(b'%PDF-1.4\n' + os.urandom(4096))
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump({'title': f'paper {i}', 'files': [{'filePath': pdf_path}]}, f)
+            records.append((json_path, pdf_path))
+
+        store = ResultsStore(os.path.join(work_dir, 'results.db'))
+        result = {'metadata': {'title': 'paper'}, 'overall_matches': {'author': True, 'date': True, 'title': False},
+                  'files': []}
+        start = time.perf_counter()
+        run_id = store.begin_run('bench', count)
+        for json_path, pdf_path in records:
+            store.save_result(run_id, json_path, [pdf_path], result)
+        store.finish_run(run_id)
+        print(f"首次写入 {count} 条: {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        hits = sum(store.lookup_unchanged(json_path) is not None for json_path, _ in records)
+        print(f"未变化检查: {time.perf_counter() - start:.2f}s，复用 {hits}/{count}")
+
+        for json_path, pdf_path in random.Random(1).sample(records, changed):
+            with open(pdf_path, 'ab') as f:
+                f.write(b'%changed')
+        start = time.perf_counter()
+        hits = sum(store.lookup_unchanged(json_path) is not None for json_path, _ in records)
+        print(f"修改 {changed} 个PDF后检查: {time.perf_counter() - start:.2f}s，需重新验证 {count - hits} 条")
+        store.close()
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='结果库增量检查基准')
+    arg_parser.add_argument('--count', type=int, default=20000, help='论文记录数')
+    arg_parser.add_argument('--changed', type=int, default=100, help='修改的PDF数')
+    args = arg_parser.parse_args()
+    run(args.count, args.changed)
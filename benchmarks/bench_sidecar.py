@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+侧车JSON读取基准
+在临时目录生成 N 个扩展格式的侧车JSON（files 为列表和字典格式各半，PDF为空文件），比较读取并规范化全部记录的耗时：
+
+  json-text   原先的做法：文本方式 open + json.load，逐个读取
+  json        load_sidecar，标准库解码（字节读取，一次解码）
+  orjson      load_sidecar，orjson 解码（需要安装 orjson）
+  threads     load_sidecars：线程池读文件，orjson（或标准库）解码
+
+默认文件在第一轮读取后已在页缓存中，结果反映解码和规范化的开销；
+--cold 在每轮之前清空页缓存（Linux，需要root），反映冷缓存时读文件的等待，线程池主要在这种情况下有收益。
+
+用法: python benchmarks/bench_sidecar.py [--files 5000] [--abstract-kb 2] [--workers 8] [--rounds 3] [--cold]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import sidecar_loader
+from sidecar_loader import load_sidecar, load_sidecars, normalize_sidecar
+from path_index import PATH_INDEX
+
+ABSTRACT = ("We study the verification of bibliographic metadata against full-text documents downloaded by a "
+            "browser extension. 本文研究论文元数据与全文的一致性验证。 ")
+
+
+def make_corpus(out_dir: str, count: int, abstract_kb: int):
+    abstract = (ABSTRACT * (abstract_kb * 1024 // len(ABSTRACT) + 1))[:abstract_kb * 1024]
+    paths = []
+    for i in range(count):
+        main_pdf = f"paper{i:06d}-论文全文.pdf"
+        notice = f"paper{i:06d}-录用通知.pdf"
+        for name in (main_pdf, notice):
+            open(os.path.join(out_dir, name), 'wb').close()
+        web_data = {'title': f"Paper {i} on metadata verification", 'firstAuthor': '张伟',
+                    'allAuthors': ['张伟', 'Li Ming', 'Wang Fang'], 'date': '12 March 2021',
+                    'dates': {'received': '12 March 2021', 'accepted': '3 June 2021'},
+                    'abstract': abstract, 'pageUrl': f"https://example.org/article/{i}"}
+        if i % 2:
+            files = {'mainPdf': main_pdf, 'file1': notice}
+        else:
+            files = [{'type': '论文全文', 'fileName': main_pdf, 'filePath': main_pdf},
+                     {'type': '录用通知', 'fileName': notice, 'filePath': notice}]
+        path = os.path.join(out_dir, f"paper{i:06d}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'webData': web_data, 'files': files, 'timestamp': '2024-10-09T00:00:00.000Z',
+                       'version': '1.0'}, f, ensure_ascii=False, indent=2)
+        paths.append(path)
+    return paths
+
+
+def load_text_mode(paths):
+    loaded = 0
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            if normalize_sidecar(json.load(f), path) is not None:
+                loaded += 1
+    return loaded
+
+
+def load_serial(paths):
+    return sum(1 for path in paths if load_sidecar(path) is not None)
+
+
+def drop_caches() -> bool:
+    try:
+        os.sync()
+        with open('/proc/sys/vm/drop_caches', 'w') as f:
+            f.write('3\n')
+        return True
+    except OSError:
+        return False
+
+
+def run_mode(mode: str, paths, workers: int, rounds: int, cold: bool):
+    has_orjson = sidecar_loader.HAS_ORJSON
+    if mode == 'orjson' and not has_orjson:
+        return None
+    if mode == 'json':
+        sidecar_loader.HAS_ORJSON = False
+    best = None
+    try:
+        for _ in range(rounds):
+            if cold:
+                drop_caches()
+            start = time.perf_counter()
+            if mode == 'json-text':
+                loaded = load_text_mode(paths)
+            elif mode == 'threads':
+                loaded = sum(1 for _, sidecar, _ in load_sidecars(paths, max_workers=workers) if sidecar is not None)
+            else:
+                loaded = load_serial(paths)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        sidecar_loader.HAS_ORJSON = has_orjson
+    return loaded, best
+
+
+def run(count: int, abstract_kb: int, workers: int, rounds: int, cold: bool):
+    out_dir = tempfile.mkdtemp(prefix='bench_sidecar_')
+    try:
+        paths = make_corpus(out_dir, count, abstract_kb)
+        size = sum(os.path.getsize(path) for path in paths)
+        PATH_INDEX.resolve(os.path.basename(paths[0]), paths[0])  # 目录索引预先建立，不计入各方式
+        if cold and not drop_caches():
+            print("警告: 无法清空页缓存（需要Linux和root权限），按热缓存测试")
+            cold = False
+        print(f"{count} 个侧车JSON，共 {size / 1e6:.1f} MB（orjson: {'有' if sidecar_loader.HAS_ORJSON else '无'}，"
+              f"线程数 {workers}，{'冷' if cold else '热'}缓存，取 {rounds} 轮最快）")
+        print(f"{'方式':<12}{'记录数':>8}{'耗时 ms':>10}{'每个 µs':>10}{'加速':>8}")
+        baseline = None
+        for mode in ('json-text', 'json', 'orjson', 'threads'):
+            row = run_mode(mode, paths, workers, rounds, cold)
+            if row is None:
+                print(f"{mode:<12}{'(未安装)':>8}")
+                continue
+            loaded, elapsed = row
+            baseline = baseline or elapsed
+            print(f"{mode:<12}{loaded:>8}{elapsed * 1000:>10.1f}{elapsed / count * 1e6:>10.1f}"
+                  f"{baseline / elapsed:>7.2f}x")
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='侧车JSON读取基准')
+    arg_parser.add_argument('--files', type=int, default=5000, help='侧车JSON个数')
+    arg_parser.add_argument('--abstract-kb', type=int, default=2, help='webData 中摘要的长度（KB）')
+    arg_parser.add_argument('--workers', type=int, default=8, help='线程池大小')
+    arg_parser.add_argument('--rounds', type=int, default=3, help='每种方式重复的轮数')
+    arg_parser.add_argument('--cold', action='store_true', help='每轮之前清空页缓存')
+    args = arg_parser.parse_args()
+    run(args.files, args.abstract_kb, args.workers, args.rounds, args.cold)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+界面更新通道基准
+不需要显示器：用模拟的Tk事件循环（root.after 按时间排队，主线程逐个执行）和文本控件，
+让工作线程以给定速率提交 N 条验证结果（papers_accept 的真实结果循环使用），比较：
+
+  legacy  原先的写法：每条消息一次 root.after(0, ...)，结果格式化（含作者/标题再提取）在Tk线程执行
+  bridge  UIBridge：工作线程格式化并入队，Tk线程每 UI_TICK_MS 合并插入一次
+
+输出Tk线程的回调次数、插入次数、总占用时间和最长单次阻塞（界面无响应的时长）。
+
+用法: python benchmarks/bench_ui_bridge.py [--results 500] [--rate 0]（rate 为每秒结果数，0 表示不限速）
+"""
+
+import argparse
+import glob
+import heapq
+import itertools
+import logging
+import os
+import sys
+import threading
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from python_verifier import PDFVerifier, PaperVerifierGUI
+from ui_bridge import UIBridge
+from bench_pipeline import BenchCase, install_mock_ocr
+
+
+class FakeRoot:
+    """模拟Tk事件循环：after() 可在任意线程调用，run() 在主线程按到期时间执行回调"""
+
+    def __init__(self):
+        self._heap = []
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._cancelled = set()
+        self.callbacks = 0
+        self.busy = 0.0
+        self.max_stall = 0.0
+
+    def after(self, ms, fn, *args):
+        after_id = next(self._ids)
+        with self._lock:
+            heapq.heappush(self._heap, (time.perf_counter() + ms / 1000, after_id, fn, args))
+        return after_id
+
+    def after_cancel(self, after_id):
+        self._cancelled.add(after_id)
+
+    def run(self, until):
+        while not until():
+            with self._lock:
+                item = self._heap[0] if self._heap else None
+                if item is not None and item[0] <= time.perf_counter():
+                    heapq.heappop(self._heap)
+                else:
+                    item = None
+            if item is None:
+                time.sleep(0.001)
+                continue
+            if item[1] in self._cancelled:
+                continue
+            start = time.perf_counter()
+            item[2](*item[3])
+            elapsed = time.perf_counter() - start
+            self.callbacks += 1
+            self.busy += elapsed
+            self.max_stall = max(self.max_stall, elapsed)
+
+
+class FakeText:
+    def __init__(self):
+        self.inserts = 0
+        self.chars = 0
+
+    def insert(self, index, text):
+        self.inserts += 1
+        self.chars += len(text)
+
+    def delete(self, *args):
+        pass
+
+    def see(self, index):
+        pass
+
+
+def make_gui(verifier: PDFVerifier, root: FakeRoot, text: FakeText) -> PaperVerifierGUI:
+    gui = PaperVerifierGUI.__new__(PaperVerifierGUI)
+    gui.root = root
+    gui.verifier = verifier
+    gui.result_text = text
+    return gui
+
+
+def run_mode(mode: str, verifier: PDFVerifier, results, count: int, rate: float):
+    root, text = FakeRoot(), FakeText()
+    gui = make_gui(verifier, root, text)
+    done = threading.Event()
+
+    if mode == 'bridge':
+        gui.ui = UIBridge(root, text)
+        gui.ui.start()
+
+    def worker():
+        interval = 1 / rate if rate else 0
+        for i in range(count):
+            result = results[i % len(results)]
+            header = f"\n[{i + 1}/{count}] 处理: paper{i}.json\n"
+            if mode == 'legacy':
+                root.after(0, lambda h=header: text.insert('end', h))
+                root.after(0, lambda r=result: text.insert('end', gui.format_result(r)))
+                root.after(0, lambda: text.see('end'))
+            else:
+                gui.ui.post_text(header)
+                gui.ui.post_text(gui.format_result(result))
+            if interval:
+                time.sleep(interval)
+        if mode == 'legacy':
+            root.after(0, done.set)
+        else:
+            gui.ui.post_call(done.set)
+
+    start = time.perf_counter()
+    threading.Thread(target=worker, daemon=True).start()
+    root.run(done.is_set)
+    total = time.perf_counter() - start
+    if mode == 'bridge':
+        gui.ui.stop()
+    return {'callbacks': root.callbacks, 'inserts': text.inserts, 'busy_ms': root.busy * 1000,
+            'max_stall_ms': root.max_stall * 1000, 'total_s': total}
+
+
+def run(count: int, rate: float, pdf_dir: str):
+    pdf_paths = sorted(glob.glob(os.path.join(pdf_dir, '*.pdf')))
+    if not pdf_paths:
+        raise SystemExit(f"未找到PDF文件: {pdf_dir}")
+    verifier = PDFVerifier(max_file_workers=1)
+    cases = [BenchCase(verifier, path) for path in pdf_paths]
+    install_mock_ocr(verifier, cases, 0)
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w', encoding='utf-8')  # 验证过程中的进度print
+    try:
+        results = [verifier.verify_paper(case.metadata) for case in cases]
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    print(f"{count} 条结果，提交速率 {'不限' if not rate else f'{rate:.0f} 条/秒'}")
+    print(f"{'方式':<8}{'Tk回调':>8}{'插入次数':>10}{'Tk线程占用 ms':>16}{'最长阻塞 ms':>14}{'总耗时 s':>10}")
+    for mode in ('legacy', 'bridge'):
+        row = run_mode(mode, verifier, results, count, rate)
+        print(f"{mode:<8}{row['callbacks']:>8}{row['inserts']:>10}{row['busy_ms']:>16.1f}"
+              f"{row['max_stall_ms']:>14.1f}{row['total_s']:>10.2f}")
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='界面更新通道基准')
+    arg_parser.add_argument('--results', type=int, default=500, help='提交的结果条数')
+    arg_parser.add_argument('--rate', type=float, default=0.0, help='每秒提交的结果数（0 表示不限速）')
+    arg_parser.add_argument('pdf_dir', nargs='?', default=os.path.join(ROOT_DIR, 'papers_accept'), help='PDF目录')
+    args = arg_parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger('PDFVerifier').setLevel(logging.WARNING)
+    run(args.results, args.rate, args.pdf_dir)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+下载目录监视基准
+在含 N 个已有文件的临时目录中比较：
+  - 原先“自动查找最新JSON”的做法（listdir + 每个文件 getmtime）每次的耗时
+  - 轮询模式空闲时每轮检查的耗时（只 stat 已知目录）
+  - 新论文记录（JSON + 分块写入的PDF）从最后一个字节写完到回调就绪的延迟（inotify / 轮询）
+
+就绪延迟包含去抖时间（--settle）。不运行验证器，只计时 FolderWatcher。
+
+用法: python benchmarks/bench_watcher.py [--files 20000] [--pairs 5] [--settle 0.5]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from folder_watcher import FolderWatcher, PollingSource, HAS_INOTIFY
+
+PDF_BYTES = b'%PDF-1.4\n' + b'0' * 200 * 1024 + b'\n%%EOF\n'
+CHUNK_SIZE = 32 * 1024
+
+
+def populate(directory: str, count: int):
+    """已有的下载：一半JSON，一半PDF"""
+    for i in range(count):
+        name = f"old{i:06d}.json" if i % 2 else f"old{i:06d}.pdf"
+        with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+            f.write('{}')
+
+
+def legacy_scan_ms(directory: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        json_files = []
+        for file in os.listdir(directory):
+            if file.endswith('.json'):
+                file_path = os.path.join(directory, file)
+                if os.path.isfile(file_path):
+                    json_files.append((file_path, os.path.getmtime(file_path)))
+        max(json_files, key=lambda x: x[1])
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def poll_tick_ms(directory: str, repeat: int) -> float:
+    source = PollingSource(interval=0)
+    source.add_dir(directory)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        source.read(0)
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def write_pair(directory: str, index: int) -> float:
+    """写出一条记录（先JSON，后分块写PDF），返回最后一个字节写完的时间"""
+    pdf_name = f"new{index:03d}.pdf"
+    with open(os.path.join(directory, f"new{index:03d}.json"), 'w', encoding='utf-8') as f:
+        json.dump({'webData': {'title': f'Paper {index}'},
+                   'files': [{'fileName': pdf_name, 'filePath': pdf_name}]}, f)
+    with open(os.path.join(directory, pdf_name), 'wb') as f:
+        for offset in range(0, len(PDF_BYTES), CHUNK_SIZE):
+            f.write(PDF_BYTES[offset:offset + CHUNK_SIZE])
+            f.flush()
+            time.sleep(0.02)
+    return time.monotonic()
+
+
+def ready_latency(directory: str, use_inotify: bool, pairs: int, settle: float, interval: float):
+    """每条记录从写完到 on_ready 的延迟（秒）"""
+    ready = {}
+    event = threading.Event()
+
+    def on_ready(json_path, metadata):
+        ready[os.path.basename(json_path)] = time.monotonic()
+        event.set()
+
+    watcher = FolderWatcher(directory, on_ready, settle_seconds=settle, poll_interval=interval,
+                            use_inotify=use_inotify)
+    start = time.perf_counter()
+    watcher.start()
+    index_ms = (time.perf_counter() - start) * 1000
+    offset = 0 if use_inotify else 100
+    latencies = []
+    try:
+        for i in range(offset, offset + pairs):
+            event.clear()
+            written = write_pair(directory, i)
+            event.wait(settle + interval + 10)
+            name = f"new{i:03d}.json"
+            if name in ready:
+                latencies.append(ready[name] - written)
+    finally:
+        watcher.stop()
+    return watcher.mode, index_ms, latencies
+
+
+def run(files: int, pairs: int, settle: float, interval: float):
+    with tempfile.TemporaryDirectory() as directory:
+        populate(directory, files)
+        print(f"目录中已有 {files} 个文件")
+        print(f"  原自动查找（listdir + getmtime）: {legacy_scan_ms(directory, 5):.1f} ms/次")
+        print(f"  轮询空闲检查（目录 stat）:        {poll_tick_ms(directory, 200):.3f} ms/轮")
+        print(f"新记录就绪延迟（去抖 {settle}s，轮询间隔 {interval}s）:")
+        for use_inotify in ([True, False] if HAS_INOTIFY else [False]):
+            mode, index_ms, latencies = ready_latency(directory, use_inotify, pairs, settle, interval)
+            if latencies:
+                print(f"  {mode:<8} 建索引 {index_ms:.0f}ms，延迟 平均 {sum(latencies) / len(latencies):.2f}s，"
+                      f"最大 {max(latencies):.2f}s（{len(latencies)}/{pairs} 条）")
+            else:
+                print(f"  {mode:<8} 建索引 {index_ms:.0f}ms，未收到就绪回调")
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='下载目录监视基准')
+    arg_parser.add_argument('--files', type=int, default=20000, help='目录中已有的文件数')
+    arg_parser.add_argument('--pairs', type=int, default=5, help='新写入的记录数')
+    arg_parser.add_argument('--settle', type=float, default=0.5, help='去抖时间（秒）')
+    arg_parser.add_argument('--interval', type=float, default=0.5, help='轮询间隔（秒）')
+    args = arg_parser.parse_args()
+    run(args.files, args.pairs, args.settle, args.interval)
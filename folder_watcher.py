@@ -0,0 +1,651 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+下载目录监视模块
+监视 gui_config.json 中配置的下载目录，浏览器下载完成的论文记录（侧车JSON及其引用的PDF）
+写入稳定后自动送入验证器，新论文下载后几秒内即可得到验证结果，不需要反复扫描整个目录。
+
+- Linux 上通过 ctypes 调用 inotify，只处理内核推送的变化；其他平台或 inotify 不可用时轮询，
+  每轮只 stat 已知目录，目录修改时间变化时才重新列出该目录
+- 目录索引（路径 -> (mtime_ns, size)）在启动时建立一次，之后按事件增量更新
+- 去抖：文件大小和修改时间连续 WATCH_SETTLE_SECONDS 秒不变才视为写完；
+  JSON 引用的PDF全部写完后整条记录才入队，等待超过 WATCH_PAIR_TIMEOUT 秒时带着缺失文件入队
+- 浏览器的临时下载文件（.crdownload/.part 等）忽略，改名为正式文件名时按新文件处理
+
+轮询模式下，原地改写（不改名）已有文件不会改变目录修改时间，这类修改不会被发现；
+浏览器下载先写临时文件再改名，不受影响。
+
+用法:
+  python folder_watcher.py [下载目录] [--existing] [--poll] [--settle 1.5] [--db 路径]
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import json
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sidecar_loader import load_sidecar
+from verify_metrics import dump_metrics
+
+logger = logging.getLogger('FolderWatcher')
+
+WATCH_SETTLE_SECONDS = float(os.environ.get('VERIFIER_WATCH_SETTLE', 1.5))  # 文件不再变化多久视为写完
+WATCH_POLL_INTERVAL = float(os.environ.get('VERIFIER_WATCH_POLL', 1.0))  # 轮询模式的目录检查间隔
+WATCH_PAIR_TIMEOUT = 300.0  # JSON 等待所引用PDF的最长时间
+WATCH_TICK = 0.25  # 有待定文件时的检查间隔
+WATCH_MAX_DEPTH = 3  # 监视的子目录层数
+WATCH_EXTENSIONS = ('.json', '.pdf')
+PARTIAL_SUFFIXES = ('.crdownload', '.part', '.partial', '.download', '.tmp')
+GUI_CONFIG_FILE = 'gui_config.json'
+
+# inotify 常量（linux/inotify.h）
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE |
+              IN_DELETE_SELF | IN_MOVE_SELF)
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+_libc = None
+if sys.platform.startswith('linux'):
+    try:
+        _libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        _libc.inotify_init1.argtypes = [ctypes.c_int]
+        _libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        _libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        HAS_INOTIFY = True
+    except (OSError, AttributeError):
+        HAS_INOTIFY = False
+else:
+    HAS_INOTIFY = False
+
+# 事件类型
+EVENT_CHANGED = 'changed'
+EVENT_REMOVED = 'removed'
+EVENT_RESYNC = 'resync'
+
+
+def load_download_dir(config_path: str = None) -> Optional[str]:
+    """读取 gui_config.json 中的 downloadDirectory（先找当前目录，再找模块所在目录）"""
+    candidates = [config_path] if config_path else [
+        GUI_CONFIG_FILE, os.path.join(os.path.dirname(os.path.abspath(__file__)), GUI_CONFIG_FILE)]
+    for path in candidates:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('downloadDirectory') or None
+        except FileNotFoundError:
+            continue
+        except Exception as e:
+            logger.warning(f"[监视] 读取配置失败: {path}: {e}")
+    return None
+
+
+def _is_candidate(name: str) -> bool:
+    lower = name.lower()
+    return not name.startswith('.') and lower.endswith(WATCH_EXTENSIONS) and not lower.endswith(PARTIAL_SUFFIXES)
+
+
+def _stat_key(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def find_sidecar_files(directory: str, max_depth: int = WATCH_MAX_DEPTH) -> List[str]:
+    """目录（含 max_depth 层子目录）中的JSON文件，按路径排序；是否为论文记录由 load_sidecar 判断"""
+    found = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if max_depth > 0 and not entry.name.startswith('.'):
+                        found.extend(find_sidecar_files(entry.path, max_depth - 1))
+                elif _is_candidate(entry.name) and entry.name.lower().endswith('.json') and \
+                        entry.name != GUI_CONFIG_FILE:
+                    found.append(entry.path)
+    except OSError as e:
+        logger.warning(f"[目录验证] 无法列出目录: {directory}: {e}")
+    return sorted(found)
+
+
+class InotifySource:
+    """inotify 事件源：read() 返回 [(事件类型, 路径)]"""
+
+    def __init__(self):
+        self.fd = _libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 失败: {os.strerror(errno)}")
+        self.watches: Dict[int, str] = {}
+
+    def add_dir(self, path: str):
+        wd = _libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_add_watch 失败: {path}: {os.strerror(errno)}")
+        self.watches[wd] = path
+
+    def read(self, timeout: float) -> List[Tuple[str, str]]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                events.append((EVENT_RESYNC, ''))
+                continue
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            directory = self.watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            removed = mask & (IN_DELETE | IN_MOVED_FROM)
+            events.append((EVENT_REMOVED if removed else EVENT_CHANGED, path))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingSource:
+    """轮询事件源：只 stat 已知目录，修改时间变化的目录才重新列出并与上次的列表比较"""
+
+    def __init__(self, interval: float = WATCH_POLL_INTERVAL):
+        self.interval = interval
+        self.dirs: Dict[str, Optional[int]] = {}  # 目录 -> mtime_ns
+        self.listings: Dict[str, Dict[str, Tuple]] = {}  # 目录 -> {名称: (mtime_ns, size) 或 'dir'}
+        self._next_poll = 0.0
+
+    def add_dir(self, path: str):
+        try:
+            self.dirs[path] = os.stat(path).st_mtime_ns
+            self.listings[path] = self._list(path)
+        except OSError as e:
+            raise OSError(e.errno, f"无法监视目录: {path}: {e}")
+
+    def _list(self, path: str) -> Dict[str, Tuple]:
+        listing = {}
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        listing[entry.name] = 'dir'
+                    elif _is_candidate(entry.name):
+                        stat = entry.stat()
+                        listing[entry.name] = (stat.st_mtime_ns, stat.st_size)
+                except OSError:
+                    continue
+        return listing
+
+    def read(self, timeout: float) -> List[Tuple[str, str]]:
+        now = time.monotonic()
+        wait = min(timeout, max(0.0, self._next_poll - now))
+        if wait > 0:
+            time.sleep(wait)
+            if time.monotonic() < self._next_poll:
+                return []
+        self._next_poll = time.monotonic() + self.interval
+
+        events = []
+        for directory in list(self.dirs):
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                # 目录已删除：其中的文件全部按删除处理
+                for name in self.listings.pop(directory, {}):
+                    events.append((EVENT_REMOVED, os.path.join(directory, name)))
+                del self.dirs[directory]
+                continue
+            if mtime_ns == self.dirs[directory]:
+                continue
+            self.dirs[directory] = mtime_ns
+            previous = self.listings.get(directory, {})
+            try:
+                current = self._list(directory)
+            except OSError:
+                continue
+            self.listings[directory] = current
+            for name, key in current.items():
+                if previous.get(name) != key:
+                    events.append((EVENT_CHANGED, os.path.join(directory, name)))
+            for name in previous.keys() - current.keys():
+                events.append((EVENT_REMOVED, os.path.join(directory, name)))
+        return events
+
+    def close(self):
+        pass
+
+
+class FolderWatcher:
+    """监视目录，侧车JSON及其引用的PDF都写完后回调 on_ready(json_path, metadata)
+
+    回调在监视线程中执行，应尽快返回（例如提交到调度器）。同一条记录只有在JSON或PDF内容
+    变化后才会再次回调。include_existing 为 True 时启动时已有的记录也会回调一次。
+    """
+
+    def __init__(self, directory: str, on_ready: Callable[[str, Dict], None],
+                 settle_seconds: float = WATCH_SETTLE_SECONDS, poll_interval: float = WATCH_POLL_INTERVAL,
+                 pair_timeout: float = WATCH_PAIR_TIMEOUT, use_inotify: Optional[bool] = None,
+                 include_existing: bool = False, max_depth: int = WATCH_MAX_DEPTH):
+        self.directory = os.path.abspath(directory)
+        self.on_ready = on_ready
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.pair_timeout = pair_timeout
+        self.use_inotify = HAS_INOTIFY if use_inotify is None else (use_inotify and HAS_INOTIFY)
+        self.include_existing = include_existing
+        self.max_depth = max_depth
+
+        self.files: Dict[str, Tuple[int, int]] = {}  # 已写完的文件 -> (mtime_ns, size)
+        self.pending: Dict[str, List] = {}  # 写入中的文件 -> [(mtime_ns, size), 最后变化时间]
+        self.waiting: Dict[str, float] = {}  # 等待PDF的JSON -> 开始等待时间
+        self.pdf_refs: Dict[str, set] = {}  # PDF -> 引用它的JSON
+        self.signatures: Dict[str, Tuple] = {}  # JSON -> 上次回调时的 (JSON, PDF...) 状态
+        self.stats = {'events': 0, 'ready': 0, 'resyncs': 0}
+        self.source = None
+        self.mode = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # 启停
+    # ------------------------------------------------------------------
+
+    def start(self):
+        if not os.path.isdir(self.directory):
+            raise FileNotFoundError(f"下载目录不存在: {self.directory}")
+        self.source = None
+        if self.use_inotify:
+            try:
+                self.source = InotifySource()
+                self.mode = 'inotify'
+            except OSError as e:
+                logger.warning(f"[监视] inotify 不可用，改为轮询: {e}")
+        if self.source is None:
+            self.source = PollingSource(self.poll_interval)
+            self.mode = 'polling'
+
+        start = time.perf_counter()
+        existing = self._add_tree(self.directory, 0)
+        with self._lock:
+            for path in existing:
+                key = _stat_key(path)
+                if key is not None:
+                    self.files[path] = key
+        logger.info(f"[监视] 开始监视 {self.directory}（{self.mode}），已有 {len(existing)} 个文件，"
+                    f"索引耗时 {(time.perf_counter() - start) * 1000:.0f}ms")
+        if self.include_existing:
+            for path in existing:
+                if path.lower().endswith('.json'):
+                    self._check_sidecar(path, time.monotonic())
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='folder-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self.source is not None:
+            self.source.close()
+            self.source = None
+        logger.info(f"[监视] 已停止: {self.stats}")
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def latest_json(self) -> Optional[str]:
+        """索引中修改时间最新的JSON文件（不访问磁盘）"""
+        with self._lock:
+            candidates = [(key[0], path) for path, key in self.files.items() if path.lower().endswith('.json')]
+            candidates += [(state[0][0], path) for path, state in self.pending.items()
+                           if path.lower().endswith('.json')]
+        return max(candidates)[1] if candidates else None
+
+    # ------------------------------------------------------------------
+    # 目录索引
+    # ------------------------------------------------------------------
+
+    def _add_tree(self, directory: str, depth: int) -> List[str]:
+        """监视目录及其子目录，返回其中的候选文件"""
+        found = []
+        try:
+            self.source.add_dir(directory)
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if depth < self.max_depth and not entry.name.startswith('.'):
+                            found.extend(self._add_tree(entry.path, depth + 1))
+                    elif _is_candidate(entry.name):
+                        found.append(entry.path)
+        except OSError as e:
+            logger.warning(f"[监视] 无法监视目录: {directory}: {e}")
+        return found
+
+    def _depth(self, path: str) -> int:
+        relative = os.path.relpath(path, self.directory)
+        return 0 if relative == '.' else relative.count(os.sep) + 1
+
+    def _resync(self):
+        """inotify 队列溢出：重新建立索引，变化的文件按新文件处理"""
+        self.stats['resyncs'] += 1
+        logger.warning("[监视] 事件队列溢出，重新建立目录索引")
+        self.source.close()
+        self.source = InotifySource()
+        current = set(self._add_tree(self.directory, 0))
+        with self._lock:
+            known = set(self.files) | set(self.pending)
+        for path in current:
+            self._touch(path)
+        for path in known - current:
+            self._remove(path)
+
+    # ------------------------------------------------------------------
+    # 事件处理
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                timeout = WATCH_TICK if self.pending or self.waiting else 1.0
+                if self.mode == 'polling':
+                    timeout = min(timeout, self.poll_interval)
+                for kind, path in self.source.read(timeout):
+                    self.stats['events'] += 1
+                    if kind == EVENT_RESYNC:
+                        self._resync()
+                    elif kind == EVENT_REMOVED:
+                        self._remove(path)
+                    else:
+                        self._handle_changed(path)
+                self._settle(time.monotonic())
+            except Exception as e:
+                logger.error(f"[监视] 处理事件出错: {e}", exc_info=True)
+                self._stop.wait(1.0)
+
+    def _handle_changed(self, path: str):
+        if os.path.isdir(path):
+            # 新建或移入的子目录：加入监视，目录中已有的文件按新文件处理
+            depth = self._depth(path)
+            if 0 < depth <= self.max_depth and not os.path.basename(path).startswith('.'):
+                if self.mode == 'inotify' or path not in self.source.dirs:
+                    for file_path in self._add_tree(path, depth):
+                        self._touch(file_path)
+            return
+        if _is_candidate(os.path.basename(path)):
+            self._touch(path)
+
+    def _touch(self, path: str):
+        """文件有变化：进入待定状态，重新计时"""
+        key = _stat_key(path)
+        if key is None:
+            self._remove(path)
+            return
+        with self._lock:
+            if self.files.get(path) == key and path not in self.pending:
+                return  # 例如 IN_CLOSE_WRITE 之后的重复事件
+            state = self.pending.get(path)
+            if state is None or state[0] != key:
+                self.pending[path] = [key, time.monotonic()]
+            self.files.pop(path, None)
+
+    def _remove(self, path: str):
+        with self._lock:
+            self.files.pop(path, None)
+            self.pending.pop(path, None)
+            self.waiting.pop(path, None)
+            self.signatures.pop(path, None)
+
+    def _settle(self, now: float):
+        """检查待定文件是否已写完，写完的JSON/PDF触发记录检查；等待超时的JSON直接入队"""
+        settled = []
+        with self._lock:
+            for path, state in list(self.pending.items()):
+                key = _stat_key(path)
+                if key is None:
+                    del self.pending[path]
+                elif key != state[0]:
+                    self.pending[path] = [key, now]
+                elif now - state[1] >= self.settle_seconds:
+                    del self.pending[path]
+                    self.files[path] = key
+                    settled.append(path)
+
+        for path in settled:
+            if path.lower().endswith('.json'):
+                self._check_sidecar(path, now)
+            else:
+                for json_path in list(self.pdf_refs.get(path, ())):
+                    self._check_sidecar(json_path, now)
+
+        for json_path, since in list(self.waiting.items()):
+            if now - since >= self.pair_timeout:
+                logger.warning(f"[监视] 等待PDF超时，按现有文件验证: {json_path}")
+                self._check_sidecar(json_path, now, force=True)
+
+    def _check_sidecar(self, json_path: str, now: float, force: bool = False):
+        """JSON 及其引用的PDF都已写完时回调 on_ready"""
+        with self._lock:
+            if json_path not in self.files:
+                return
+        try:
+            loaded = load_sidecar(json_path)
+        except (ValueError, OSError) as e:
+            # 写入中途停顿超过去抖时间时也会走到这里，后续写入会重新触发检查
+            logger.warning(f"[监视] 无法解析JSON，等待下一次修改: {json_path}: {e}")
+            return
+        if loaded is None:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[监视] 不是论文记录，忽略: %s", json_path)
+            return
+        metadata, pdf_paths = loaded
+
+        missing = []
+        with self._lock:
+            for pdf_path in pdf_paths:
+                self.pdf_refs.setdefault(pdf_path, set()).add(json_path)
+                if pdf_path in self.pending:
+                    missing.append(pdf_path)
+                elif pdf_path not in self.files:
+                    # 监视目录之外的PDF只检查是否存在
+                    inside = pdf_path.startswith(self.directory + os.sep)
+                    if inside or not os.path.exists(pdf_path):
+                        missing.append(pdf_path)
+            if missing and not force:
+                if json_path not in self.waiting:
+                    self.waiting[json_path] = now
+                    logger.info(f"[监视] 等待 {len(missing)} 个PDF写完: {os.path.basename(json_path)}")
+                return
+            self.waiting.pop(json_path, None)
+            signature = (self.files.get(json_path),) + tuple(self.files.get(p) or _stat_key(p) for p in pdf_paths)
+            if self.signatures.get(json_path) == signature:
+                return
+            self.signatures[json_path] = signature
+            self.stats['ready'] += 1
+
+        logger.info(f"[监视] 论文记录已就绪: {os.path.basename(json_path)}（{len(pdf_paths)} 个PDF）")
+        try:
+            self.on_ready(json_path, metadata)
+        except Exception as e:
+            logger.error(f"[监视] 入队失败: {json_path}: {e}", exc_info=True)
+
+
+class AutoVerifier:
+    """监视下载目录并自动验证：就绪的记录先查结果库，未变化的直接复用，其余按成本通道调度验证
+
+    on_result(json_path, result, cached) 在工作线程中回调，出错时 result 为异常对象。
+    """
+
+    def __init__(self, directory: str, on_result: Optional[Callable[[str, object, bool], None]] = None,
+                 db_path: str = None, verifier=None, **watcher_options):
+        from python_verifier import PDFVerifier
+        from results_store import ResultsStore, DEFAULT_DB_PATH
+        from verify_scheduler import VerifyScheduler
+
+        self.on_result = on_result
+        self.verifier = verifier or PDFVerifier()
+        try:
+            self.store = ResultsStore(db_path or DEFAULT_DB_PATH)
+        except Exception as e:
+            logger.error(f"[结果库] 打开失败，不保存监视结果: {e}")
+            self.store = None
+        self.run_id = None
+        self.scheduler = VerifyScheduler(route=self._route, work=self._verify, on_done=self._on_done)
+        self.watcher = FolderWatcher(directory, self.submit, **watcher_options)
+        self.counts = {'verified': 0, 'cached': 0, 'failed': 0}
+        self._lock = threading.Lock()
+        self._inflight = set()
+        self._dirty: Dict[str, Dict] = {}  # 验证期间又有变化的记录，完成后重新验证
+
+    def start(self):
+        self.run_id = self._store_call('begin_run', 'watch', 0)
+        self.watcher.start()
+
+    def stop(self):
+        self.watcher.stop()
+        self.scheduler.shutdown(wait=True)
+        if self.run_id is not None:
+            self._store_call('finish_run', self.run_id, sum(self.counts.values()))
+        if self.store is not None:
+            self.store.close()
+        dump_metrics(source='watch', run_id=self.run_id, directory=self.watcher.directory, counts=dict(self.counts))
+
+    def _store_call(self, method: str, *args):
+        if self.store is None:
+            return None
+        try:
+            return getattr(self.store, method)(*args)
+        except Exception as e:
+            logger.error(f"[结果库] {method} 失败: {e}", exc_info=True)
+            return None
+
+    def submit(self, json_path: str, metadata: Dict):
+        """监视线程回调：复用未变化的结果，否则提交到调度器"""
+        with self._lock:
+            if json_path in self._inflight:
+                self._dirty[json_path] = metadata
+                return
+            self._inflight.add(json_path)
+
+        cached = self._store_call('lookup_unchanged', json_path)
+        if cached is not None:
+            cached['cached'] = True
+            self._store_call('record_cached', self.run_id, json_path, cached)
+            self._finish(json_path, cached, True)
+            return
+        self.scheduler.submit({'json_file': json_path, 'metadata': metadata})
+
+    def _route(self, job: Dict) -> str:
+        from verify_scheduler import LANE_CPU, LANE_OCR
+        estimate = self.verifier.estimate_paper_cost(job['metadata'], job['json_file'])
+        return LANE_OCR if estimate['needs_ocr'] else LANE_CPU
+
+    def _verify(self, job: Dict) -> Dict:
+        return self.verifier.verify_paper(job['metadata'], json_file_path=job['json_file'])
+
+    def _on_done(self, job: Dict, result, lane: str):
+        json_path = job['json_file']
+        if isinstance(result, Exception):
+            logger.error(f"[监视] 验证失败: {json_path}: {result}")
+            self._store_call('record_failed', self.run_id, json_path)
+        else:
+            pdf_paths = [file_info['filePath'] for file_info in job['metadata']['files']]
+            self._store_call('save_result', self.run_id, json_path, pdf_paths, result)
+        self._finish(json_path, result, False)
+
+    def _finish(self, json_path: str, result, cached: bool):
+        with self._lock:
+            key = 'failed' if isinstance(result, Exception) else 'cached' if cached else 'verified'
+            self.counts[key] += 1
+            self._inflight.discard(json_path)
+            again = self._dirty.pop(json_path, None)
+        if self.on_result is not None:
+            try:
+                self.on_result(json_path, result, cached)
+            except Exception as e:
+                logger.error(f"[监视] 结果回调出错: {e}", exc_info=True)
+        if again is not None:
+            self.submit(json_path, again)
+
+
+def format_result_line(json_path: str, result, cached: bool) -> str:
+    """一条验证结果的单行摘要"""
+    name = os.path.basename(json_path)
+    if isinstance(result, Exception):
+        return f"✗ 验证失败 {name}: {result}"
+    matches = result.get('overall_matches', {})
+    marks = '  '.join(f"{label}{'✓' if matches.get(key) else '✗'}"
+                      for key, label in (('author', '作者'), ('date', '日期'), ('title', '标题')))
+    return f"{marks}  {name}{'（未变化，复用结果）' if cached else ''}"
+
+
+def main(argv: List[str] = None):
+    from python_verifier import setup_logging
+
+    arg_parser = argparse.ArgumentParser(description='监视下载目录，自动验证新下载的论文')
+    arg_parser.add_argument('directory', nargs='?', help='下载目录（默认读取 gui_config.json 的 downloadDirectory）')
+    arg_parser.add_argument('--existing', action='store_true', help='启动时验证目录中已有的记录')
+    arg_parser.add_argument('--poll', action='store_true', help='强制使用轮询（不使用 inotify）')
+    arg_parser.add_argument('--settle', type=float, default=WATCH_SETTLE_SECONDS, help='文件不再变化多少秒视为写完')
+    arg_parser.add_argument('--interval', type=float, default=WATCH_POLL_INTERVAL, help='轮询间隔（秒）')
+    arg_parser.add_argument('--db', default=None, help='结果库路径')
+    args = arg_parser.parse_args(argv)
+
+    setup_logging()
+    directory = args.directory or load_download_dir()
+    if not directory or not os.path.isdir(directory):
+        raise SystemExit(f"下载目录不存在: {directory or '(未配置)'}，请在 {GUI_CONFIG_FILE} 中设置 downloadDirectory")
+
+    def on_result(json_path, result, cached):
+        print(f"[{time.strftime('%H:%M:%S')}] {format_result_line(json_path, result, cached)}", flush=True)
+
+    auto = AutoVerifier(directory, on_result, db_path=args.db, use_inotify=not args.poll,
+                        include_existing=args.existing, settle_seconds=args.settle, poll_interval=args.interval)
+    auto.start()
+    print(f"正在监视 {auto.watcher.directory}（{auto.watcher.mode}），按 Ctrl+C 停止", flush=True)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        auto.stop()
+        print(f"已停止：验证 {auto.counts['verified']} 篇，复用 {auto.counts['cached']} 篇，失败 {auto.counts['failed']} 篇")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,12 +7,16 @@ OCR API模块 - Python版本
 
 import json
 import re
+import time
 import logging
 import base64
 import requests
 from typing import Dict, Optional, Tuple
 from pathlib import Path
 
+from verify_timing import Timings, span
+from verify_metrics import API_CALLS, API_LATENCY, API_RETRIES, API_UPLOAD_BYTES
+
 logger = logging.getLogger('OCRAPI')
 
 # OCR配置（默认值，可以从配置文件或环境变量读取）
@@ -30,6 +34,10 @@ LLM_CONFIG = {
 }
 
 
+# 复用到API服务器的HTTPS连接（批量验证和长驻服务中各次调用不再重新握手），Session 可在线程间共享发送请求
+_http_session = requests.Session()
+
+
 def load_config_from_file(config_file: str = 'ocr_config.json'):
     """从配置文件加载OCR和LLM配置"""
     global OCR_CONFIG, LLM_CONFIG
@@ -129,8 +137,8 @@ def is_degenerate_ocr_output(text: str) -> bool:
 
 
 def call_chat_completions(base_url: str, api_key: str, model: str, messages: list, 
-                          temperature: float = 0, max_tokens: int = 2048) -> Dict:
-    """调用Chat Completions API（与插件逻辑一致）"""
+                          temperature: float = 0, max_tokens: int = 2048, kind: str = 'ocr') -> Dict:
+    """调用Chat Completions API（与插件逻辑一致）；kind（'ocr' / 'llm'）为指标中的调用类别"""
     
     if not base_url:
         raise ValueError('Base URL未配置')
@@ -157,18 +165,30 @@ def call_chat_completions(base_url: str, api_key: str, model: str, messages: lis
         'Authorization': f'Bearer {api_key}'
     }
     
-    logger.debug(f"发送API请求到: {api_url}")
-    response = requests.post(api_url, json=request_body, headers=headers, timeout=60)
-    
-    if not response.ok:
-        error_text = response.text
-        raise Exception(f'API请求失败: {response.status_code} {response.reason} - {error_text}')
+    # 自行序列化（与 requests 的 json= 相同），以便统计上传字节数
+    body = json.dumps(request_body).encode('utf-8')
+    API_UPLOAD_BYTES.inc(len(body), kind=kind)
     
-    data = response.json()
-    content = data.get('choices', [{}])[0].get('message', {}).get('content')
-    
-    if not content:
-        raise Exception('API返回内容为空')
+    logger.debug(f"发送API请求到: {api_url}")
+    start = time.perf_counter()
+    try:
+        response = _http_session.post(api_url, data=body, headers=headers, timeout=60)
+        
+        if not response.ok:
+            error_text = response.text
+            raise Exception(f'API请求失败: {response.status_code} {response.reason} - {error_text}')
+        
+        data = response.json()
+        content = data.get('choices', [{}])[0].get('message', {}).get('content')
+        
+        if not content:
+            raise Exception('API返回内容为空')
+    except Exception:
+        API_CALLS.inc(kind=kind, outcome='error')
+        raise
+    finally:
+        API_LATENCY.observe((time.perf_counter() - start) * 1000, kind=kind)
+    API_CALLS.inc(kind=kind, outcome='ok')
     
     return {'content': content, 'raw': data}
 
@@ -239,14 +259,22 @@ def build_structuring_input_text(ocr_text: str, max_chars: int = 8000) -> Tuple[
     return cleaned, truncated
 
 
-def ocr_extract_text_from_image_data_url(image_data_url: str) -> str:
-    """第一段OCR：从图片提取纯文本（与插件逻辑一致）"""
+def ocr_config_error() -> Optional[str]:
+    """OCR配置缺失时返回错误信息（重试也不会成功），配置完整时返回 None"""
     if not OCR_CONFIG.get('apiKey'):
-        raise ValueError('OCR API Key未配置，请在配置文件中配置API Key')
+        return 'OCR API Key未配置，请在配置文件中配置API Key'
     if not OCR_CONFIG.get('baseUrl'):
-        raise ValueError('OCR Base URL未配置')
+        return 'OCR Base URL未配置'
     if not OCR_CONFIG.get('model'):
-        raise ValueError('OCR模型未配置')
+        return 'OCR模型未配置'
+    return None
+
+
+def ocr_extract_text_from_image_data_url(image_data_url: str) -> str:
+    """第一段OCR：从图片提取纯文本（与插件逻辑一致）"""
+    config_error = ocr_config_error()
+    if config_error:
+        raise ValueError(config_error)
     
     retry_prompts = [
         get_ocr_pure_text_prompt(),
@@ -291,10 +319,13 @@ def ocr_extract_text_from_image_data_url(image_data_url: str) -> str:
                 return content
             
             logger.warning('[OCR] 检测到异常输出（低多样性/重复符号），准备重试...')
+            if i < len(retry_prompts) - 1:
+                API_RETRIES.inc(kind='ocr', reason='degenerate')
         except Exception as e:
             logger.error(f'[OCR] 第{i+1}次尝试失败: {e}')
             if i == len(retry_prompts) - 1:
                 raise
+            API_RETRIES.inc(kind='ocr', reason='error')
     
     logger.warning('[OCR] 多次重试后仍异常，返回最后一次输出')
     return last_content
@@ -332,7 +363,8 @@ def structure_academic_info_from_ocr_text(ocr_text: str) -> Dict:
                 {'role': 'user', 'content': f"{get_academic_structuring_prompt()}\n\nOCR文本如下：\n{struct_input_text}"}
             ],
             temperature=0,
-            max_tokens=2048
+            max_tokens=2048,
+            kind='llm'
         )
         
         content = result['content']
@@ -356,28 +388,37 @@ def structure_academic_info_from_ocr_text(ocr_text: str) -> Dict:
         }
 
 
-def perform_two_stage_ocr(image_data_url: str) -> Dict:
-    """执行二段式OCR（与插件逻辑一致）"""
+def perform_two_stage_ocr(image_data_url: str, timings: Optional[Timings] = None) -> Dict:
+    """执行二段式OCR（与插件逻辑一致），传入 timings 时记录 ocr.api / ocr.llm 两段耗时"""
     logger.info('[OCR] 开始二段式OCR识别...')
     
     # 第一段：OCR提取纯文本
     logger.info('[OCR] 第一段：提取纯文本...')
-    ocr_text = ocr_extract_text_from_image_data_url(image_data_url)
+    with span(timings, 'ocr.api') as extra:
+        extra['bytes_in'] = len(image_data_url)
+        ocr_text = ocr_extract_text_from_image_data_url(image_data_url)
+        extra['bytes_out'] = len(ocr_text.encode('utf-8'))
     logger.info(f'[OCR] ✓ OCR识别完成，文本长度: {len(ocr_text)}')
-    logger.info(f'[OCR] ========== OCR原始文本输出 ==========')
-    logger.info(f'[OCR] {ocr_text}')
-    logger.info(f'[OCR] ========== OCR原始文本结束 ==========')
+    # 完整原始文本只在DEBUG级别输出（文本可达数KB，工作线程中不做无用的格式化）
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug('[OCR] ========== OCR原始文本输出 ==========')
+        logger.debug('[OCR] %s', ocr_text)
+        logger.debug('[OCR] ========== OCR原始文本结束 ==========')
     
     # 第二段：LLM结构化
     logger.info('[LLM] 开始从OCR文本提取结构化信息...')
-    llm_result = structure_academic_info_from_ocr_text(ocr_text)
+    with span(timings, 'ocr.llm') as extra:
+        extra['bytes_in'] = len(ocr_text.encode('utf-8'))
+        llm_result = structure_academic_info_from_ocr_text(ocr_text)
+        extra['bytes_out'] = len(llm_result['rawText'].encode('utf-8'))
     logger.info(f'[LLM] ✓ 结构化完成，是否结构化: {llm_result["isStructured"]}, 解析错误: {llm_result.get("parseError") or "无"}')
-    logger.info(f'[LLM] ========== LLM原始输出 ==========')
-    logger.info(f'[LLM] {llm_result["rawText"]}')
-    logger.info(f'[LLM] ========== LLM原始输出结束 ==========')
-    logger.info(f'[LLM] ========== LLM结构化结果 ==========')
-    logger.info(f'[LLM] {json.dumps(llm_result["structured"], indent=2, ensure_ascii=False)}')
-    logger.info(f'[LLM] ========== LLM结构化结果结束 ==========')
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug('[LLM] ========== LLM原始输出 ==========')
+        logger.debug('[LLM] %s', llm_result['rawText'])
+        logger.debug('[LLM] ========== LLM原始输出结束 ==========')
+        logger.debug('[LLM] ========== LLM结构化结果 ==========')
+        logger.debug('[LLM] %s', json.dumps(llm_result['structured'], indent=2, ensure_ascii=False))
+        logger.debug('[LLM] ========== LLM结构化结果结束 ==========')
     
     return {
         'text': ocr_text,
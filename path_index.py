@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PDF路径解析模块
+把JSON中的文件路径（相对路径、正/反斜杠混用）解析为本地路径，两个GUI、批量验证和目录监视共用。
+
+每个目录用 os.scandir 建立一次 文件名 -> 路径 索引，之后按目录修改时间判断是否失效，变化时才重新列出；
+REVALIDATE_SECONDS 内的命中连目录也不 stat。大的或网络挂载的下载目录中，
+批量解析不再对每个候选位置逐一 stat。
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger('PathIndex')
+
+MAX_CACHED_DIRS = 256
+# 修改时间精度较粗的文件系统（FAT、部分网络盘）上，建索引前后同一时间片内的修改不会改变目录修改时间；
+# 目录修改时间距建索引时间不足该秒数时，下次查找重新列出
+RACY_SECONDS = 2.0
+# 该时间内再次查找同一目录时不重新 stat：命中直接返回，未命中才重新检查目录；不存在的目录直接返回未命中
+REVALIDATE_SECONDS = 1.0
+DOWNLOADS_DIR = os.path.join(os.path.expanduser('~'), 'Downloads')
+
+
+def normalize_separators(file_path: str) -> str:
+    """统一路径分隔符（扩展在 Windows 上也使用正斜杠）"""
+    return os.path.normpath(file_path.replace('/', os.sep).replace('\\', os.sep))
+
+
+class PathIndex:
+    """按目录缓存文件名索引，目录修改时间变化时失效"""
+
+    def __init__(self, max_dirs: int = MAX_CACHED_DIRS):
+        self.max_dirs = max_dirs
+        # 目录 -> (mtime_ns, 建索引时间, 上次检查时间, {normcase(文件名): 路径})；目录不存在时索引为 None
+        self._dirs: 'OrderedDict[str, Tuple[Optional[int], float, float, Optional[Dict[str, str]]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'lookups': 0, 'dir_stats': 0, 'listings': 0}
+
+    def _store(self, key: str, entry: Tuple):
+        with self._lock:
+            self._dirs[key] = entry
+            self._dirs.move_to_end(key)
+            while len(self._dirs) > self.max_dirs:
+                self._dirs.popitem(last=False)
+
+    def _listing(self, directory: str, revalidate: bool) -> Tuple[Optional[Dict[str, str]], bool]:
+        """目录的文件名索引（目录不存在时为 None），以及本次是否检查过目录修改时间"""
+        key = os.path.normcase(os.path.abspath(directory))
+        now = time.monotonic()
+        with self._lock:
+            cached = self._dirs.get(key)
+            if cached is not None:
+                self._dirs.move_to_end(key)
+                if not revalidate and now - cached[2] < REVALIDATE_SECONDS:
+                    return cached[3], False
+
+        with self._lock:
+            self.stats['dir_stats'] += 1
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            self._store(key, (None, 0.0, now, None))
+            return None, True
+        if cached is not None and cached[0] == mtime_ns and cached[1] - mtime_ns / 1e9 >= RACY_SECONDS:
+            self._store(key, cached[:2] + (now, cached[3]))
+            return cached[3], True
+
+        built_at = time.time()
+        names = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if not entry.is_dir():
+                            names[os.path.normcase(entry.name)] = entry.path
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.warning(f"[路径索引] 无法列出目录: {directory}: {e}")
+            return None, True
+        with self._lock:
+            self.stats['listings'] += 1
+        self._store(key, (mtime_ns, built_at, now, names))
+        return names, True
+
+    def lookup(self, directory: str, name: str) -> Optional[str]:
+        """目录中名为 name 的文件路径，不存在时返回 None"""
+        with self._lock:
+            self.stats['lookups'] += 1
+        name = os.path.normcase(name)
+        names, validated = self._listing(directory, revalidate=False)
+        if names is not None and name not in names and not validated:
+            # 缓存未命中：目录可能刚有新文件，检查修改时间后再查一次
+            names, _ = self._listing(directory, revalidate=True)
+        return names.get(name) if names is not None else None
+
+    def exists(self, path: str) -> bool:
+        directory, name = os.path.split(os.path.abspath(path))
+        return self.lookup(directory, name) is not None
+
+    def invalidate(self, directory: str = None):
+        """丢弃某个目录（默认全部）的索引"""
+        with self._lock:
+            if directory is None:
+                self._dirs.clear()
+            else:
+                self._dirs.pop(os.path.normcase(os.path.abspath(directory)), None)
+
+    def resolve(self, file_path: str, json_file_path: str = None) -> str:
+        """把JSON中的文件路径解析为本地路径（找不到时返回标准化后的原路径）
+
+        相对路径依次在 JSON文件所在目录、当前工作目录、用户下载目录中查找，
+        最后按文件名在JSON目录中查找。
+        """
+        if not file_path:
+            return ''
+        path = normalize_separators(file_path)
+        if os.path.isabs(path):
+            return path
+
+        json_dir = os.path.dirname(os.path.abspath(json_file_path)) if json_file_path else os.getcwd()
+        for base_dir in (json_dir, os.getcwd(), DOWNLOADS_DIR):
+            candidate = os.path.normpath(os.path.join(base_dir, path))
+            found = self.lookup(os.path.dirname(candidate), os.path.basename(candidate))
+            if found:
+                return found
+        found = self.lookup(json_dir, os.path.basename(path))
+        return found or path
+
+
+# 进程内共享的索引
+PATH_INDEX = PathIndex()
+
+
+def resolve_pdf_path(file_path: str, json_file_path: str = None) -> str:
+    return PATH_INDEX.resolve(file_path, json_file_path)
@@ -6,42 +6,125 @@ import os
 import sys
 import re
 import logging
+import logging.handlers
+import atexit
+import queue
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 import threading
+import time
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
-# 配置日志系统
-def setup_logging(log_file=None):
-    """设置日志系统，输出到文件和控制台"""
+# 日志配置（环境变量可覆盖）：文件/控制台级别、轮转大小和保留份数
+LOG_FILE_LEVEL = os.environ.get('VERIFIER_LOG_LEVEL', 'INFO').upper()
+LOG_CONSOLE_LEVEL = os.environ.get('VERIFIER_CONSOLE_LOG_LEVEL', 'INFO').upper()
+LOG_MAX_BYTES = int(os.environ.get('VERIFIER_LOG_MAX_BYTES', 10 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.environ.get('VERIFIER_LOG_BACKUP_COUNT', 5))
+# 第三方库的调试日志量很大（pdfminer逐个对象输出），统一压到WARNING
+NOISY_LOGGERS = ('pdfminer', 'PIL', 'urllib3', 'requests')
+
+_log_listener = None
+_log_config = None  # 当前日志配置 (文件, 文件级别, 控制台级别)，隔离验证子进程按同样的配置初始化
+
+
+def _resolve_log_level(name, invalid: List[str]) -> int:
+    """日志级别名转为数值；无法识别的名称记入 invalid 并使用 INFO"""
+    if isinstance(name, int):
+        return name
+    name = str(name).strip().upper()
+    if name.isdigit():
+        return int(name)
+    level = logging.getLevelName(name)
+    if isinstance(level, int):
+        return level
+    invalid.append(name)
+    return logging.INFO
+
+
+# 配置日志系统（只由命令行/界面入口调用，导入模块时不改动根日志配置）
+def setup_logging(log_file=None, file_level: str = None, console_level: str = None, force: bool = False):
+    """设置日志系统，输出到文件和控制台
+
+    工作线程只把日志记录放入队列（QueueHandler），由后台 QueueListener 线程写入
+    轮转日志文件和控制台，文件写入不再阻塞验证线程。重复调用时直接返回（force=True 时重新配置）。
+    """
+    global _log_listener, _log_config
+    logger = logging.getLogger('PDFVerifier')
+    if _log_listener is not None:
+        if not force:
+            return logger
+        shutdown_logging()
+    
     if log_file is None:
         # 默认日志文件：当前目录下的verifier.log
         log_dir = os.path.dirname(os.path.abspath(__file__))
         log_file = os.path.join(log_dir, 'verifier.log')
+    invalid_levels = []
+    file_level = _resolve_log_level(file_level or LOG_FILE_LEVEL, invalid_levels)
+    console_level = _resolve_log_level(console_level or LOG_CONSOLE_LEVEL, invalid_levels)
     
     # 创建日志格式
     log_format = '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
     date_format = '%Y-%m-%d %H:%M:%S'
+    formatter = logging.Formatter(log_format, datefmt=date_format)
     
-    # 配置日志
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format=log_format,
-        datefmt=date_format,
-        handlers=[
-            logging.FileHandler(log_file, encoding='utf-8', mode='a'), 
-            logging.StreamHandler(sys.stdout)  # 同时输出到控制台
-        ]
-    )
+    if multiprocessing.parent_process() is None:
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8')
+    else:
+        # 隔离验证子进程只追加写入，轮转由主进程负责（多进程同时轮转会互相覆盖）
+        file_handler = logging.FileHandler(log_file, encoding='utf-8', mode='a')
+    file_handler.setLevel(file_level)
+    file_handler.setFormatter(formatter)
+    console_handler = logging.StreamHandler(sys.stdout)  # 同时输出到控制台
+    console_handler.setLevel(console_level)
+    console_handler.setFormatter(formatter)
     
-    logger = logging.getLogger('PDFVerifier')
-    logger.info(f"日志系统已初始化，日志文件: {log_file}")
+    # 根日志级别取两者中较低的一个，isEnabledFor 据此跳过不会输出的消息
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(min(file_level, console_level))
+    for name in NOISY_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+    
+    _log_listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler,
+                                                   respect_handler_level=True)
+    _log_listener.start()
+    _log_config = (log_file, file_level, console_level)
+    for name in invalid_levels:
+        logger.warning(f"无法识别的日志级别 '{name}'（VERIFIER_LOG_LEVEL / VERIFIER_CONSOLE_LOG_LEVEL），使用 INFO")
+    logger.info(f"日志系统已初始化，日志文件: {log_file}，级别: 文件 {logging.getLevelName(file_level)} / "
+                f"控制台 {logging.getLevelName(console_level)}")
     return logger
 
-# 初始化日志
-logger = setup_logging()
+
+def shutdown_logging():
+    """停止后台日志线程并写完队列中剩余的日志（进程退出时自动调用）"""
+    global _log_listener, _log_config
+    if _log_listener is None:
+        return
+    listener, _log_listener = _log_listener, None
+    _log_config = None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root.removeHandler(handler)
+
+
+atexit.register(shutdown_logging)
+
+logger = logging.getLogger('PDFVerifier')
 
 # PDF处理库
 try:
@@ -58,6 +141,19 @@ except ImportError:
     HAS_PDFPLUMBER = False
     print("警告: pdfplumber未安装，将使用备用方法")
 
+# 元数据快速读取（只解析trailer/Info/XMP，不解析页面）
+from pdf_metadata_reader import read_pdf_metadata, PDFMetadataError
+from verify_scheduler import VerifyScheduler, CancelToken, LANE_CPU, LANE_OCR, install_ocr_slot, ocr_slot
+from verify_timing import Timings, span, rollup, format_rollup
+from verify_metrics import PAPERS, STAGE_LATENCY, dump_metrics, observe_matches, observe_timings
+from results_store import ResultsStore, DEFAULT_DB_PATH, INCOMPLETE_FILE_ERRORS, RESULT_VERSION
+from path_index import PATH_INDEX
+from ui_bridge import UIBridge
+from result_table import ResultTable
+from result_export import ResultExporter, slim_result, PROFILE_FULL, PROFILE_SLIM
+from result_records import FileResult, PaperResult, ExtractedDates, Matches
+from sidecar_loader import load_sidecar, load_sidecars
+
 # OCR库（按优先级尝试）
 HAS_OCR = False
 OCR_METHOD = None
@@ -111,12 +207,242 @@ except ImportError:
     HAS_DATEUTIL = False
     print("警告: python-dateutil未安装，日期解析可能不准确")
 
+# 子进程资源限制（仅类Unix系统可用）
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:
+    HAS_RESOURCE = False
+
+
+def _build_substring_matcher(words: List[str]) -> 're.Pattern':
+    """把子串黑名单编译成按前缀合并的正则（等价于 any(w in s for w in words)；空列表时永不匹配）"""
+    if not words:
+        return re.compile(r'(?!)')
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node: Dict) -> str:
+        # 子串判断只需命中最短的词，后续分支可以省略
+        if '' in node:
+            return ''
+        alternatives = [re.escape(ch) + build(child) for ch, child in sorted(node.items())]
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return '(?:' + '|'.join(alternatives) + ')'
+
+    return re.compile(build(trie))
+
+
+def _build_pattern_matcher(patterns: List[str]) -> 're.Pattern':
+    """把多个正则合并成一个（等价于逐个 re.match，忽略大小写）"""
+    return re.compile('|'.join(f'(?:{p})' for p in patterns), re.IGNORECASE)
+
+
+# PDF元数据作者黑名单（Author字段常被写成期刊名、软件名或设备名）
+METADATA_AUTHOR_BLACKLIST = [
+    'direct journals', 'expert systems', 'fields', 'open access',
+    'international journal', 'elsevier', 'science direct',
+    'compaq', 'hp', 'dell', 'lenovo', 'computer', 'system',
+    'creative commons', 'the author', 'this article'
+]
+
+# 结果详情中显示作者匹配时使用的较短黑名单（不含 'hp' / 'system' 等短词，避免误伤真实姓名）
+DISPLAY_AUTHOR_BLACKLIST = [
+    'direct journals', 'expert systems', 'fields', 'open access',
+    'international journal', 'elsevier', 'science direct'
+]
+
+# 正文作者黑名单（品牌名、期刊名、系统名等）
+INVALID_AUTHOR_NAMES = [
+    'compaq', 'hp', 'dell', 'lenovo', 'acer', 'microsoft', 'apple', 'samsung',
+    'huawei', 'xiaomi', 'computer', 'pc', 'desktop', 'laptop', 'server', 'system',
+    'device', 'machine', 'fields', 'admin', 'user', 'asus', 'administrator', 'test',
+    'open access', 'international journal', 'expert systems', 'direct journals',
+    'elsevier', 'science direct', 'creative commons', 'the author', 'this article',
+    'attribution', 'noderivatives', 'research', 'volume', 'vol.', 'int. j.',
+    'introduction', 'abstract', 'keywords', 'received', 'accepted', 'published',
+    'nanoscale', 'royal society', 'chemistry', 'view article', 'view journal',
+    'check for updates', 'cite this', 'doi:', 'rsc.li', 'dear professor', 'dear dr',
+    'manuscript number', 'engineering structures', 'engineering failure',
+    'engineering failure analysis', 'failure analysis', 'analysis', 'engineering',
+    'journal', 'article', 'paper', 'publication', 'publisher', 'editorial',
+    'editor', 'reviewer', 'correspondence', 'corresponding author', 'author',
+    'authors', 'affiliation', 'department', 'university', 'institute', 'college',
+    'school', 'laboratory', 'lab', 'center', 'centre', 'organization', 'company'
+]
+
+# 作者候选中不应出现的关键词（正则）
+INVALID_AUTHOR_KEYWORDS = [
+    r'Open\s+Access', r'Creative\s+Commons', r'©\s*The\s*Author',
+    r'This\s+article', r'Attribution', r'NoDerivatives', r'RESEARCH',
+    r'International\s+Journal', r'Int\.\s*J\.', r'Vol\.', r'Volume',
+    r'Expert\s+Systems', r'Direct\s+Journals', r'Science\s+Direct',
+    r'Introduction', r'Abstract', r'Keywords', r'Engineering\s+Failure',
+    r'Failure\s+Analysis', r'Engineering\s+Structures', r'Journal\s+of',
+    r'Article\s+in\s+Press', r'Available\s+online', r'Published\s+by',
+    r'Copyright', r'All\s+Rights\s+Reserved', r'Elsevier', r'Springer',
+    r'IEEE', r'ACM', r'Publisher', r'Editorial', r'Correspondence'
+]
+
+# 无效标题模式（页眉、页脚、期刊信息等）
+INVALID_TITLE_PATTERNS = [
+    r'^\d+\.\.\d+',  # 如 "1..11 ++"
+    r'^[A-Z0-9]{5,20}\s+\d+',  # 如 "D5NR03036F 1"
+    r'^view\s+(article|journal|pdf)',  # "View Article Online"
+    r'^published\s+on',  # "Published on ..."
+    r'^downloaded\s+on',  # "Downloaded on ..."
+    r'^doi:',  # "DOI: ..."
+    r'^rsc\.li/',  # "rsc.li/..."
+    r'^check\s+for\s+updates',  # "Check for updates"
+    r'^cite\s+this:',  # "Cite this:"
+    r'^received\s+\d+',  # "Received ..."
+    r'^accepted\s+\d+',  # "Accepted ..."
+    r'^nanoscale|^paper$',  # 期刊名
+    r'^royal\s+society',  # "Royal Society"
+]
+
+# 导入时编译一次，作者/标题/元数据三处共用
+METADATA_AUTHOR_BLACKLIST_RE = _build_substring_matcher(METADATA_AUTHOR_BLACKLIST)
+DISPLAY_AUTHOR_BLACKLIST_RE = _build_substring_matcher(DISPLAY_AUTHOR_BLACKLIST)
+INVALID_AUTHOR_NAMES_RE = _build_substring_matcher(INVALID_AUTHOR_NAMES)
+INVALID_AUTHOR_KEYWORDS_RE = _build_pattern_matcher(INVALID_AUTHOR_KEYWORDS)
+INVALID_TITLE_RE = _build_pattern_matcher(INVALID_TITLE_PATTERNS)
+
+
+def is_invalid_metadata_author(author: str) -> bool:
+    """检查PDF元数据中的作者是否命中黑名单"""
+    return bool(METADATA_AUTHOR_BLACKLIST_RE.search(author.lower()))
+
+
+def is_invalid_author_line(line: str) -> bool:
+    """检查文本行（或候选作者）是否包含无效名称"""
+    return bool(INVALID_AUTHOR_NAMES_RE.search(line.lower()))
+
+
+def is_invalid_title_line(line: str) -> bool:
+    """检查文本行是否是页眉、页脚、期刊信息等无效标题"""
+    return bool(INVALID_TITLE_RE.match(line))
+
+
+# PDF预检（不做版面分析，只看页面资源和内容流）
+PREFLIGHT_MAX_PAGES = 2
+PREFLIGHT_MIN_GLYPHS = 20  # 可见字形少于该值视为没有文本层
+PREFLIGHT_MAX_STREAM_BYTES = 512 * 1024  # 每页最多扫描的内容流字节数
+# 判为扫描件时最大图像至少覆盖的页面比例（徽标、签名远低于此值；截图粘贴到A4页面的录用通知约为0.3~0.5）
+PREFLIGHT_MIN_IMAGE_COVERAGE = 0.25
+PREFLIGHT_MAX_FORM_DEPTH = 3  # Form XObject 嵌套的最大检查深度
+
+_TEXT_BLOCK_RE = re.compile(rb'\bBT\b(.*?)\bET\b', re.S)
+_LITERAL_STRING_RE = re.compile(rb'\((?:\\.|[^\\()])*\)', re.S)
+_HEX_STRING_RE = re.compile(rb'<([0-9A-Fa-f\s]+)>')
+_IMAGE_DRAW_RE = re.compile(
+    rb'(-?[\d.]+)\s+(-?[\d.]+)\s+(-?[\d.]+)\s+(-?[\d.]+)\s+-?[\d.]+\s+-?[\d.]+\s+cm\s*/([^\s/\[\]<>()]+)\s+Do'
+)
+_XOBJECT_DO_RE = re.compile(rb'/([^\s/\[\]<>()]+)\s+Do')
+_CID_GLYPH_RE = re.compile(r'\(cid:\d+\)')
+
+
+def count_visible_glyphs(content: bytes) -> int:
+    """统计内容流中文本操作符（BT...ET内的Tj/TJ）实际绘制的非空白字形数"""
+    glyphs = 0
+    for block in _TEXT_BLOCK_RE.finditer(content):
+        body = block.group(1)
+        for literal in _LITERAL_STRING_RE.findall(body):
+            glyphs += len(literal[1:-1].strip())
+        for hex_string in _HEX_STRING_RE.findall(body):
+            glyphs += len(re.sub(rb'\s+', b'', hex_string)) // 4 or 1
+    return glyphs
+
+
+def is_garbage_text(text: str) -> bool:
+    """检查提取出的文本层是否是乱码（CID字形编号、私有区字符、替换符等）"""
+    if not text:
+        return False
+    stripped = re.sub(r'\s+', '', text)
+    if len(stripped) < 50:
+        return False
+    cid_chars = sum(len(m) for m in _CID_GLYPH_RE.findall(stripped))
+    bad_chars = sum(1 for ch in stripped
+                    if ch == '\ufffd' or '\ue000' <= ch <= '\uf8ff' or ord(ch) < 32)
+    return (cid_chars + bad_chars) / len(stripped) > 0.3
+
+
+# 文本提取后端（按成本从低到高排列），质量不达标时依次升级，最后才是OCR
+TEXT_BACKENDS = ('pypdf2', 'pdfplumber')
+QUALITY_MIN_CHARS = 100  # 非空白字符数下限（与OCR触发阈值一致）
+QUALITY_MIN_WORD_RATIO = 0.15  # 常见词占比下限，粘连/乱码文本通常远低于此值
+
+# 常见英文词（功能词 + 学术论文/录用通知高频词），用于估计文本是否被正确分词
+COMMON_WORDS = frozenset("""
+a about above after all also an analysis and any approach are article as at based be been between both
+but by can data de design different during each et for from has have high however in into is it its
+journal large learning low manuscript may method methods model more most new not of on one or other
+our paper performance present proposed received accepted revised available online published results
+review show shown such system than that the their these this through to two university used using
+via was we were which while with within work
+""".split())
+
+_WORD_TOKEN_RE = re.compile(r'[A-Za-z]+')
+# 逐页提前停止用的廉价日期信号：Received / Available online 类关键词后200字符内出现年份
+# 只对新增的一页做检查；出现信号后才运行完整的日期/标题/作者提取
+_DATE_SIGNAL_RE = re.compile(
+    r'(?:received|submitted|submission\s+date|available\s+online|published\s+online|online\s+available)'
+    r'[\s\S]{0,200}?\b(?:19|20)\d{2}\b', re.IGNORECASE)
+FIELD_CACHE_SIZE = 32  # 文本字段提取结果缓存条数（提前停止检查、质量评分和后续步骤共用）
+_CJK_CHAR_RE = re.compile(r'[\u4e00-\u9fa5]')
+
+# 单文件隔离验证：子进程 + 墙钟时限 + 地址空间上限
+FILE_TIMEOUT_SECONDS = 180  # 含子进程启动和导入依赖的时间
+FILE_MEMORY_LIMIT_MB = 2048  # RLIMIT_AS，0 表示不限制
+
+# 同一论文记录内多个文件（全文、录用通知、邮件截图、作者页）的并发验证数
+MAX_FILE_WORKERS = 4
+
+# 短路策略：
+#   'exhaustive'       - 验证所有文件
+#   'first_sufficient' - 先验证廉价文件，作者/日期/标题都匹配后跳过或取消剩余文件
+MATCH_POLICIES = ('exhaustive', 'first_sufficient')
+DEFAULT_MATCH_POLICY = 'exhaustive'
+
+# 预估成本（相对单位）：OCR需要栅格化 + 两次API往返，远高于文本提取
+FILE_COST_TEXT = 1.0
+FILE_COST_UNKNOWN = 2.0
+FILE_COST_OCR = 10.0
+FILE_COST_PER_MB = 0.1
+ESTIMATE_CACHE_SIZE = 4096  # 成本预估缓存条数（按路径+修改时间+大小）
+
 
 class PDFVerifier:
     
-    def __init__(self):
+    def __init__(self, isolate_files: bool = False, file_timeout: float = FILE_TIMEOUT_SECONDS,
+                 memory_limit_mb: int = FILE_MEMORY_LIMIT_MB, max_file_workers: int = MAX_FILE_WORKERS,
+                 match_policy: str = DEFAULT_MATCH_POLICY):
         self.results = []
         self.logger = logging.getLogger('PDFVerifier')
+        # 隔离模式：每个文件在独立子进程中验证，超时或超内存时终止子进程
+        self.isolate_files = isolate_files
+        self.file_timeout = file_timeout
+        self.memory_limit_mb = memory_limit_mb
+        # 论文内文件并发数与短路策略（见 MATCH_POLICIES）
+        self.max_file_workers = max_file_workers
+        if match_policy not in MATCH_POLICIES:
+            raise ValueError(f"未知的匹配策略: {match_policy}，可选: {MATCH_POLICIES}")
+        self.match_policy = match_policy
+        # 成本预估缓存：批量调度路由和 verify_paper 排序共用同一次预检
+        self._estimate_cache = {}
+        self._estimate_lock = threading.Lock()
+        # 各提取后端的命中率与耗时（文本后端 + OCR）
+        self.backend_stats = {name: {'attempts': 0, 'hits': 0, 'total_ms': 0.0}
+                              for name in TEXT_BACKENDS + ('ocr',)}
+        self._stats_lock = threading.Lock()
+        # 文本字段提取缓存：同一段文本的日期/标题/作者只提取一次
+        self._field_cache = OrderedDict()
+        self._field_lock = threading.Lock()
     
     def normalize_date(self, date_string: str) -> Optional[str]:
         """标准化日期格式为 YYYY-MM-DD（与扩展逻辑一致）"""
@@ -171,70 +497,369 @@ class PDFVerifier:
         return None
     
     def extract_pdf_text(self, pdf_path: str, max_pages: int = 5) -> str:
-        """提取PDF文本"""
+        """提取PDF文本（按成本从低到高尝试后端）"""
         self.logger.info(f"[PDF文本提取] 开始提取: {pdf_path}, 最大页数: {max_pages}")
+        text, _, _ = self.extract_text_cascade(pdf_path, max_pages, early_exit=False)
+        self.logger.info(f"[PDF文本提取] 提取完成，文本长度: {len(text)}")
+        return text
+    
+    def iter_page_text(self, pdf_path: str, max_pages: int = 5, backend: str = None) -> Iterator[str]:
+        """逐页提取PDF文本（惰性生成，调用方停止迭代后不再解析后续页面）
+        
+        每页产出一个字符串，空页（可能是扫描件）或提取失败的页产出空字符串。
+        backend 为 None 时使用成本最低的可用后端。
+        """
+        if backend is None:
+            available = self.available_text_backends()
+            backend = available[0] if available else None
         try:
-            if HAS_PDFPLUMBER:
+            if backend == 'pdfplumber' and HAS_PDFPLUMBER:
                 self.logger.debug("[PDF文本提取] 使用 pdfplumber")
-                text = self._extract_with_pdfplumber(pdf_path, max_pages)
-                self.logger.info(f"[PDF文本提取] 提取完成，文本长度: {len(text)}")
-                return text
-            elif HAS_PYPDF2:
+                yield from self._iter_pdfplumber_pages(pdf_path, max_pages)
+            elif backend == 'pypdf2' and HAS_PYPDF2:
                 self.logger.debug("[PDF文本提取] 使用 PyPDF2")
-                text = self._extract_with_pypdf2(pdf_path, max_pages)
-                self.logger.info(f"[PDF文本提取] 提取完成，文本长度: {len(text)}")
-                return text
+                yield from self._iter_pypdf2_pages(pdf_path, max_pages)
             else:
-                self.logger.warning("[PDF文本提取] 未找到PDF处理库")
-                return ""
+                self.logger.warning(f"[PDF文本提取] 未找到PDF处理库: {backend}")
         except Exception as e:
             self.logger.error(f"[PDF文本提取] 提取失败: {e}", exc_info=True)
-            return ""
     
-    def _extract_with_pdfplumber(self, pdf_path: str, max_pages: int) -> str:
-        """使用pdfplumber提取文本"""
-        text = ""
+    def available_text_backends(self) -> List[str]:
+        """已安装的文本提取后端（按成本从低到高）"""
+        installed = {'pypdf2': HAS_PYPDF2, 'pdfplumber': HAS_PDFPLUMBER}
+        return [name for name in TEXT_BACKENDS if installed[name]]
+    
+    def extract_text_cascade(self, pdf_path: str, max_pages: int = 5, early_exit: bool = True,
+                             timings: Optional[Timings] = None) -> Tuple[str, int, Dict]:
+        """文本提取级联：先用最便宜的后端，质量门槛不通过时再升级到下一个后端
+        
+        返回 (文本, 解析页数, 质量评估)。所有后端都不达标时返回得分最高的结果，
+        质量评估中 passed=False，由调用方决定是否升级到OCR。
+        """
+        best = ('', 0, self.score_text_quality(''))
+        for backend in self.available_text_backends():
+            start = time.perf_counter()
+            if early_exit:
+                text, pages_parsed = self.extract_text_until_sufficient(pdf_path, max_pages, backend=backend)
+            else:
+                text, pages_parsed = '', 0
+                for page_text in self.iter_page_text(pdf_path, max_pages, backend=backend):
+                    pages_parsed += 1
+                    if page_text:
+                        text += page_text + "\n"
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if timings is not None:
+                timings.add(f'text.{backend}', elapsed_ms, bytes_out=len(text.encode('utf-8')))
+            
+            quality = self.score_text_quality(text)
+            quality['backend'] = backend
+            self.record_backend_result(backend, quality['passed'], elapsed_ms)
+            self.logger.info(f"[PDF文本提取] 后端 {backend}: 耗时 {elapsed_ms:.0f}ms, 文本长度 {quality['length']}, "
+                             f"常见词占比 {quality['word_ratio']:.2f}, 日期 {quality['has_date']}, 标题 {quality['has_title']}, "
+                             f"{'通过' if quality['passed'] else '未通过'}质量门槛")
+            if quality['passed']:
+                return text, pages_parsed, quality
+            if quality['score'] > best[2]['score'] or best[2].get('backend') is None:
+                best = (text, pages_parsed, quality)
+        return best
+    
+    def score_text_quality(self, text: str) -> Dict:
+        """评估提取文本的质量：长度、常见词占比、是否包含日期/标题信号"""
+        length = len(re.sub(r'\s+', '', text))
+        tokens = _WORD_TOKEN_RE.findall(text)
+        cjk_words = len(_CJK_CHAR_RE.findall(text)) // 2  # 中文按两字一词估计
+        dictionary_hits = sum(1 for token in tokens if token.lower() in COMMON_WORDS)
+        units = len(tokens) + cjk_words
+        word_ratio = (dictionary_hits + cjk_words) / units if units else 0.0
+        
+        has_date = False
+        has_title = False
+        if length >= QUALITY_MIN_CHARS:
+            # 与逐页提前停止检查、后续日期/候选步骤共用字段缓存，同一文本不重复提取
+            dates = self.cached_dates(text)
+            has_date = any(value for key, value in dates.items() if key != 'other')
+            has_title = bool(self.cached_title(text))
+        
+        score = (0.3 * min(1.0, length / 500) + 0.4 * min(1.0, word_ratio / 0.3) +
+                 0.15 * has_date + 0.15 * has_title)
+        passed = length >= QUALITY_MIN_CHARS and word_ratio >= QUALITY_MIN_WORD_RATIO and (has_date or has_title)
+        return {
+            'backend': None,
+            'length': length,
+            'word_ratio': round(word_ratio, 3),
+            'has_date': has_date,
+            'has_title': has_title,
+            'score': round(score, 3),
+            'passed': passed
+        }
+    
+    def record_backend_result(self, backend: str, hit: bool, elapsed_ms: float):
+        """记录一次后端调用（命中 = 输出通过质量门槛/OCR有结果）"""
+        with self._stats_lock:
+            stats = self.backend_stats.setdefault(backend, {'attempts': 0, 'hits': 0, 'total_ms': 0.0})
+            stats['attempts'] += 1
+            stats['hits'] += 1 if hit else 0
+            stats['total_ms'] += elapsed_ms
+    
+    def get_backend_stats(self) -> Dict:
+        """各后端的调用次数、命中率和平均耗时"""
+        with self._stats_lock:
+            summary = {}
+            for name, stats in self.backend_stats.items():
+                attempts = stats['attempts']
+                summary[name] = {
+                    'attempts': attempts,
+                    'hits': stats['hits'],
+                    'hit_rate': round(stats['hits'] / attempts, 3) if attempts else 0.0,
+                    'avg_ms': round(stats['total_ms'] / attempts, 1) if attempts else 0.0,
+                    'total_ms': round(stats['total_ms'], 1)
+                }
+            return summary
+    
+    def _iter_pdfplumber_pages(self, pdf_path: str, max_pages: int) -> Iterator[str]:
+        """使用pdfplumber逐页提取文本"""
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                self.logger.debug(f"[PDF文本提取] pdfplumber打开成功，总页数: {len(pdf.pages)}")
-                for i, page in enumerate(pdf.pages[:max_pages]):
-                    try:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += page_text + "\n"
-                            self.logger.debug(f"[PDF文本提取] 第{i+1}页提取成功，文本长度: {len(page_text)}")
-                        else:
-                            self.logger.debug(f"[PDF文本提取] 第{i+1}页文本为空（可能是扫描件）")
-                    except Exception as e:
-                        self.logger.warning(f"[PDF文本提取] 第{i+1}页提取失败: {e}")
-                        continue
+            pdf = pdfplumber.open(pdf_path)
         except Exception as e:
             self.logger.error(f"[PDF文本提取] pdfplumber打开失败: {e}", exc_info=True)
-        self.logger.info(f"[PDF文本提取] pdfplumber提取完成，总文本长度: {len(text)}")
-        return text
+            return
+        with pdf:
+            self.logger.debug(f"[PDF文本提取] pdfplumber打开成功，总页数: {len(pdf.pages)}")
+            for i, page in enumerate(pdf.pages[:max_pages]):
+                yield self._extract_page_text(page, i)
+    
+    def _iter_pypdf2_pages(self, pdf_path: str, max_pages: int) -> Iterator[str]:
+        """使用PyPDF2逐页提取文本"""
+        try:
+            file = open(pdf_path, 'rb')
+        except Exception as e:
+            self.logger.error(f"[PDF文本提取] PyPDF2打开失败: {e}", exc_info=True)
+            return
+        with file:
+            try:
+                pdf_reader = PyPDF2.PdfReader(file)
+                pages = pdf_reader.pages[:max_pages]
+            except Exception as e:
+                self.logger.error(f"[PDF文本提取] PyPDF2打开失败: {e}", exc_info=True)
+                return
+            self.logger.debug(f"[PDF文本提取] PyPDF2打开成功，总页数: {len(pdf_reader.pages)}")
+            for i, page in enumerate(pages):
+                yield self._extract_page_text(page, i)
+    
+    def _extract_page_text(self, page, page_index: int) -> str:
+        """提取单页文本（pdfplumber和PyPDF2的页对象都提供extract_text）"""
+        try:
+            page_text = page.extract_text()
+        except Exception as e:
+            self.logger.warning(f"[PDF文本提取] 第{page_index+1}页提取失败: {e}")
+            return ""
+        if page_text:
+            self.logger.debug(f"[PDF文本提取] 第{page_index+1}页提取成功，文本长度: {len(page_text)}")
+            return page_text
+        self.logger.debug(f"[PDF文本提取] 第{page_index+1}页文本为空（可能是扫描件）")
+        return ""
     
-    def _extract_with_pypdf2(self, pdf_path: str, max_pages: int) -> str:
-        """使用PyPDF2提取文本"""
+    def extract_text_until_sufficient(self, pdf_path: str, max_pages: int = 5,
+                                      backend: str = None) -> Tuple[str, int]:
+        """逐页提取文本，日期/标题/作者都能提取到时提前停止
+        
+        返回 (文本, 实际解析的页数)
+        """
         text = ""
+        pages_parsed = 0
+        date_signal = False
+        pages = self.iter_page_text(pdf_path, max_pages, backend=backend)
+        try:
+            for page_text in pages:
+                pages_parsed += 1
+                if not page_text:
+                    continue
+                text += page_text + "\n"
+                # 廉价的日期信号只检查新增的一页，出现后才做完整的字段检查
+                date_signal = date_signal or bool(_DATE_SIGNAL_RE.search(page_text))
+                if pages_parsed < max_pages and date_signal and self._has_required_fields(text):
+                    self.logger.info(f"[PDF文本提取] 前{pages_parsed}页已包含日期/标题/作者，停止解析后续页面")
+                    break
+        finally:
+            pages.close()
+        return text, pages_parsed
+    
+    def _has_required_fields(self, text: str) -> bool:
+        """检查文本是否已足够提取日期、标题和作者（与后续匹配步骤的需求一致）
+        
+        标题/作者只看文本开头，前面的页提取过后不再重复；结果进入字段缓存，后续步骤直接复用
+        """
+        if not self.cached_title(text) or not self.cached_author(text):
+            return False
+        dates = self.cached_dates(text)
+        return bool(dates.get('received') or dates.get('availableOnline'))
+    
+    def _cached_field(self, field: str, key: str, extract):
+        """字段提取结果缓存（按字段和参与提取的文本，LRU，线程安全）"""
+        cache_key = (field, key)
+        with self._field_lock:
+            if cache_key in self._field_cache:
+                self._field_cache.move_to_end(cache_key)
+                return self._field_cache[cache_key]
+        value = extract(key)
+        with self._field_lock:
+            self._field_cache[cache_key] = value
+            while len(self._field_cache) > FIELD_CACHE_SIZE:
+                self._field_cache.popitem(last=False)
+        return value
+    
+    def cached_title(self, text: str) -> str:
+        """extract_title_from_text 的缓存版本（标题提取只使用前5000个字符）"""
+        return self._cached_field('title', text[:5000], self.extract_title_from_text) if text else ''
+    
+    def cached_author(self, text: str) -> str:
+        """extract_author_from_text 的缓存版本（作者提取只使用前3000个字符）"""
+        return self._cached_field('author', text[:3000], self.extract_author_from_text) if text else ''
+    
+    def cached_dates(self, text: str) -> Dict:
+        """extract_dates_from_text 的缓存版本（返回副本，调用方可以修改）"""
+        dates = self._cached_field('dates', text, self.extract_dates_from_text)
+        return dict(dates, other=list(dates.get('other', [])))
+    
+    def preflight_classify(self, pdf_path: str, max_pages: int = PREFLIGHT_MAX_PAGES) -> Dict:
+        """快速预检PDF类型（不做版面分析）
+        
+        只读取前几页的字体、图像XObject和内容流中的文本操作符（包括Form XObject内部），判断：
+          'text'    - 有正常文本层，走文本提取
+          'scanned' - 没有可见文本，图像覆盖页面的主要部分，直接OCR
+          'garbage' - 有文本但字体缺少ToUnicode（CID乱码），直接OCR
+          'unknown' - 无法判断（库缺失、解析失败、只有小图像），按原流程处理
+        """
+        result = {
+            'kind': 'unknown',
+            'page_count': 0,
+            'pages_checked': 0,
+            'glyphs': 0,
+            'font_count': 0,
+            'fonts_without_unicode': 0,
+            'image_count': 0,
+            'image_coverage': 0.0,
+            'reason': ''
+        }
+        if not HAS_PYPDF2:
+            result['reason'] = 'PyPDF2未安装'
+            return result
+        
         try:
             with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                self.logger.debug(f"[PDF文本提取] PyPDF2打开成功，总页数: {len(pdf_reader.pages)}")
-                for i, page in enumerate(pdf_reader.pages[:max_pages]):
-                    try:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += page_text + "\n"
-                            self.logger.debug(f"[PDF文本提取] 第{i+1}页提取成功，文本长度: {len(page_text)}")
-                        else:
-                            self.logger.debug(f"[PDF文本提取] 第{i+1}页文本为空（可能是扫描件）")
-                    except Exception as e:
-                        self.logger.warning(f"[PDF文本提取] 第{i+1}页提取失败: {e}")
-                        continue
+                pdf_reader = PyPDF2.PdfReader(file, strict=False)
+                result['page_count'] = len(pdf_reader.pages)
+                for page in pdf_reader.pages[:max_pages]:
+                    self._inspect_page_resources(page, result)
+                    result['pages_checked'] += 1
         except Exception as e:
-            self.logger.error(f"[PDF文本提取] PyPDF2打开失败: {e}", exc_info=True)
-        self.logger.info(f"[PDF文本提取] PyPDF2提取完成，总文本长度: {len(text)}")
-        return text
+            self.logger.warning(f"[PDF预检] 解析失败，按原流程处理: {e}")
+            result['reason'] = f'解析失败: {e}'
+            return result
+        
+        if result['glyphs'] < PREFLIGHT_MIN_GLYPHS:
+            if result['image_coverage'] >= PREFLIGHT_MIN_IMAGE_COVERAGE:
+                result['kind'] = 'scanned'
+                result['reason'] = f"无可见文本（{result['glyphs']}个字形），页面由图像构成（覆盖率{result['image_coverage']:.0%}）"
+            elif result['image_count']:
+                result['reason'] = f"无可见文本，图像只覆盖页面的{result['image_coverage']:.0%}（可能是徽标或签名）"
+            else:
+                result['reason'] = '既无文本也无图像'
+        elif result['font_count'] and result['fonts_without_unicode'] == result['font_count']:
+            result['kind'] = 'garbage'
+            result['reason'] = f"所有复合字体都缺少ToUnicode（{result['font_count']}个），文本层可能是CID乱码"
+        else:
+            result['kind'] = 'text'
+            result['reason'] = f"有文本层（{result['glyphs']}个字形）"
+        
+        self.logger.info(f"[PDF预检] {os.path.basename(pdf_path)}: {result['kind']} - {result['reason']}")
+        return result
+    
+    def _inspect_page_resources(self, page, stats: Dict):
+        """统计单页的字体、图像和文本操作符（供preflight_classify使用）"""
+        contents = page.get('/Contents')
+        data = b''
+        if contents is not None:
+            contents = contents.get_object()
+            streams = contents if isinstance(contents, list) else [contents]
+            for stream in streams:
+                data += stream.get_object().get_data()
+                if len(data) >= PREFLIGHT_MAX_STREAM_BYTES:
+                    data = data[:PREFLIGHT_MAX_STREAM_BYTES]
+                    break
+        mediabox = page.mediabox
+        page_area = abs(float(mediabox.width) * float(mediabox.height)) or 1.0
+        largest_image = self._inspect_content(page.get('/Resources'), data, stats, set(), 0)
+        stats['image_coverage'] = max(stats['image_coverage'], min(1.0, largest_image / page_area))
+    
+    def _inspect_content(self, resources, data: bytes, stats: Dict, seen_fonts: set, depth: int) -> float:
+        """统计一段内容流（页面或Form XObject）及其资源，返回其中最大图像的绘制面积（该内容流的坐标单位）
+        
+        Form XObject 中的文本、字体和图像与页面上的一样计入；同一字体对象在一页内只计一次
+        """
+        resources = resources.get_object() if resources is not None else {}
+        
+        fonts = resources.get('/Font')
+        if fonts is not None:
+            for ref in fonts.get_object().values():
+                key = (ref.idnum, ref.generation) if isinstance(ref, PyPDF2.generic.IndirectObject) else id(ref)
+                if key in seen_fonts:
+                    continue
+                seen_fonts.add(key)
+                font = ref.get_object()
+                stats['font_count'] += 1
+                # 简单字体有标准编码，缺少ToUnicode也能正确提取；复合字体/Type3则不行
+                if font.get('/Subtype') in ('/Type0', '/Type3') and '/ToUnicode' not in font:
+                    stats['fonts_without_unicode'] += 1
+        
+        image_names = set()
+        forms = {}
+        xobjects = resources.get('/XObject')
+        if xobjects is not None:
+            for name, xobject in xobjects.get_object().items():
+                xobject = xobject.get_object()
+                subtype = xobject.get('/Subtype')
+                if subtype == '/Image':
+                    image_names.add(name.lstrip('/'))
+                elif subtype == '/Form':
+                    forms[name.lstrip('/')] = xobject
+        stats['image_count'] += len(image_names)
+        stats['glyphs'] += count_visible_glyphs(data)
+        
+        if not image_names and not forms:
+            return 0.0
+        # 紧挨着 Do 的 cm 给出绘制矩阵；图像是单位正方形，面积即矩阵行列式
+        scales = {}
+        for match in _IMAGE_DRAW_RE.finditer(data):
+            try:
+                a, b, c, d = (float(value) for value in match.groups()[:4])
+            except ValueError:
+                continue
+            scales[match.end()] = abs(a * d - b * c)
+        largest = 0.0
+        form_areas = {}
+        for match in _XOBJECT_DO_RE.finditer(data):
+            name = match.group(1).decode('latin-1')
+            scale = scales.get(match.end(), 1.0)
+            if name in image_names:
+                largest = max(largest, scale)
+            elif name in forms and depth < PREFLIGHT_MAX_FORM_DEPTH:
+                if name not in form_areas:
+                    form_areas[name] = self._inspect_form(forms[name], resources, stats, seen_fonts, depth + 1)
+                largest = max(largest, form_areas[name] * scale)
+        return largest
+    
+    def _inspect_form(self, form, parent_resources, stats: Dict, seen_fonts: set, depth: int) -> float:
+        """检查Form XObject的内容流，返回最大图像在引用它的内容流坐标中的面积"""
+        data = form.get_data()[:PREFLIGHT_MAX_STREAM_BYTES]
+        # 没有自己的资源字典时沿用父级资源（旧版PDF写法）
+        resources = form.get('/Resources', parent_resources)
+        area = self._inspect_content(resources, data, stats, seen_fonts, depth)
+        matrix = form.get('/Matrix')
+        if area and matrix is not None and len(matrix) == 6:
+            a, b, c, d = (float(value) for value in list(matrix)[:4])
+            area *= abs(a * d - b * c)
+        return area
     
     def extract_pdf_metadata(self, pdf_path: str) -> Dict:
         """提取PDF元数据（使用多种方法，提高兼容性）"""
@@ -246,26 +871,53 @@ class PDFVerifier:
             'firstAuthor': ''
         }
         
+        # 方法0：快速路径，只读取trailer中的Info字典和XMP流
+        # 成功时PyPDF2/pdfplumber读到的也是同一个Info字典，无需再解析
+        fast_path_ok = False
+        try:
+            raw_metadata = read_pdf_metadata(pdf_path)
+            info, xmp = raw_metadata['info'], raw_metadata['xmp']
+            metadata['title'] = info.get('/Title', '') or xmp['title']
+            raw_author = info.get('/Author', '') or ', '.join(xmp['creators'])
+            if raw_author:
+                is_invalid = is_invalid_metadata_author(raw_author)
+                if not is_invalid and len(raw_author) >= 5 and len(raw_author) <= 200:
+                    metadata['author'] = raw_author
+                    authors = xmp['creators'] or [a.strip() for a in raw_author.split(',')]
+                    if authors:
+                        metadata['firstAuthor'] = authors[0]
+            if info.get('/CreationDate'):
+                metadata['date'] = self._parse_pdf_date(info['/CreationDate'])
+            elif xmp['createDate']:
+                metadata['date'] = xmp['createDate'][:10]
+            if xmp['doi']:
+                metadata['doi'] = xmp['doi']
+            fast_path_ok = True
+            self.logger.debug("[PDF元数据] 快速路径读取成功")
+        except PDFMetadataError as e:
+            self.logger.debug(f"[PDF元数据] 快速路径失败，回退到完整解析: {e}")
+        except Exception as e:
+            # 快速读取器只是优化，任何意外错误都交给PyPDF2/pdfplumber重新解析
+            self.logger.warning(f"[PDF元数据] 快速路径出错，回退到完整解析: {type(e).__name__}: {e}")
+        if not fast_path_ok:
+            metadata = {'title': '', 'author': '', 'date': '', 'firstAuthor': ''}  # 丢弃快速路径读到一半的字段
+        
         # 方法1：尝试使用PyPDF2
-        if HAS_PYPDF2:
+        if HAS_PYPDF2 and not fast_path_ok:
             try:
                 with open(pdf_path, 'rb') as file:
                     pdf_reader = PyPDF2.PdfReader(file)
                     if pdf_reader.metadata:
                         try:
-                            metadata['title'] = pdf_reader.metadata.get('/Title', '') or ''
-                            raw_author = pdf_reader.metadata.get('/Author', '') or ''
+                            # 畸形PDF的Info值可能是数组/字典等非字符串对象，只接受字符串
+                            title = pdf_reader.metadata.get('/Title', '')
+                            metadata['title'] = title if isinstance(title, str) else ''
+                            raw_author = pdf_reader.metadata.get('/Author', '')
+                            raw_author = raw_author if isinstance(raw_author, str) else ''
                             
                             # 验证并清理作者名（过滤无效名称）
                             if raw_author:
-                                author_lower = raw_author.lower()
-                                invalid_names = [
-                                    'direct journals', 'expert systems', 'fields', 'open access',
-                                    'international journal', 'elsevier', 'science direct',
-                                    'compaq', 'hp', 'dell', 'lenovo', 'computer', 'system',
-                                    'creative commons', 'the author', 'this article'
-                                ]
-                                is_invalid = any(inv in author_lower for inv in invalid_names)
+                                is_invalid = is_invalid_metadata_author(raw_author)
                                 if not is_invalid and len(raw_author) >= 5 and len(raw_author) <= 200:
                                     metadata['author'] = raw_author
                                     # 提取第一作者（如果有多个作者，取第一个）
@@ -288,25 +940,20 @@ class PDFVerifier:
                 pass
         
         # 方法2：如果PyPDF2失败，尝试使用pdfplumber
-        if (not metadata.get('title') or not metadata.get('firstAuthor')) and HAS_PDFPLUMBER:
+        if (not metadata.get('title') or not metadata.get('firstAuthor')) and HAS_PDFPLUMBER and not fast_path_ok:
             try:
                 self.logger.debug("[PDF元数据] 尝试使用 pdfplumber")
                 with pdfplumber.open(pdf_path) as pdf:
                     if pdf.metadata:
                         if not metadata.get('title'):
-                            metadata['title'] = pdf.metadata.get('Title', '') or ''
+                            title = pdf.metadata.get('Title', '')
+                            metadata['title'] = title if isinstance(title, str) else ''
                         if not metadata.get('author'):
-                            raw_author = pdf.metadata.get('Author', '') or ''
+                            raw_author = pdf.metadata.get('Author', '')
+                            raw_author = raw_author if isinstance(raw_author, str) else ''
                             self.logger.debug(f"[PDF元数据] pdfplumber提取 - 标题: {metadata['title'][:50] if metadata['title'] else '(空)'}, 作者: {raw_author[:50] if raw_author else '(空)'}")
                             if raw_author:
-                                author_lower = raw_author.lower()
-                                invalid_names = [
-                                    'direct journals', 'expert systems', 'fields', 'open access',
-                                    'international journal', 'elsevier', 'science direct',
-                                    'compaq', 'hp', 'dell', 'lenovo', 'computer', 'system',
-                                    'creative commons', 'the author', 'this article'
-                                ]
-                                is_invalid = any(inv in author_lower for inv in invalid_names)
+                                is_invalid = is_invalid_metadata_author(raw_author)
                                 if not is_invalid and len(raw_author) >= 5 and len(raw_author) <= 200:
                                     metadata['author'] = raw_author
                                     authors = [a.strip() for a in raw_author.split(',')]
@@ -473,7 +1120,8 @@ class PDFVerifier:
                             
                             if isinstance(result, list) and len(result) > 0:
                                 self.logger.info(f"[OCR] 处理列表格式，列表长度: {len(result)}, 第一个元素类型: {type(result[0])}")
-                                self.logger.info(f"[OCR] result完整结构预览（前1000字符）: {str(result)[:1000]}")
+                                if self.logger.isEnabledFor(logging.DEBUG):
+                                    self.logger.debug(f"[OCR] result完整结构预览（前1000字符）: {str(result)[:1000]}")
                                 # 遍历每一页的结果
                                 for page_idx, page in enumerate(result):
                                     self.logger.info(f"[OCR] 处理第{page_idx}页，类型: {type(page)}, 长度: {len(page) if isinstance(page, (list, tuple)) else 'N/A'}, 内容预览: {str(page)[:300]}")
@@ -496,13 +1144,13 @@ class PDFVerifier:
                                                         text = str(text_info) if text_info else ''
                                                     if text and text.strip():
                                                         text_lines.append(str(text).strip())
-                                                        self.logger.info(f"[OCR] ✓ 从列表项提取文本: {text[:100]}")
+                                                        self.logger.debug("[OCR] ✓ 从列表项提取文本: %s", text[:100])
                                                 elif isinstance(item, dict):
                                                     # 字典格式，尝试提取text字段
                                                     text = item.get('text', '') or item.get('content', '') or item.get('ocr_text', '')
                                                     if text and text.strip():
                                                         text_lines.append(str(text).strip())
-                                                        self.logger.info(f"[OCR] ✓ 从字典项提取文本: {text[:100]}")
+                                                        self.logger.debug("[OCR] ✓ 从字典项提取文本: %s", text[:100])
                                                 elif isinstance(item, str):
                                                     # 直接是文本
                                                     if item.strip():
@@ -514,13 +1162,13 @@ class PDFVerifier:
                                                         text = str(item[0]).strip()
                                                         if text:
                                                             text_lines.append(text)
-                                                            self.logger.info(f"[OCR] ✓ 从元组项提取文本: {text[:100]}")
+                                                            self.logger.debug("[OCR] ✓ 从元组项提取文本: %s", text[:100])
                                                 else:
                                                     # 其他类型，尝试转换为字符串
                                                     text = str(item).strip()
                                                     if text and len(text) > 3:  # 过滤太短的文本
                                                         text_lines.append(text)
-                                                        self.logger.info(f"[OCR] ✓ 从其他类型项提取文本: {text[:100]}")
+                                                        self.logger.debug("[OCR] ✓ 从其他类型项提取文本: %s", text[:100])
                                             except Exception as e:
                                                 self.logger.warning(f"[OCR] 处理第{page_idx}页第{item_idx}项时出错: {e}", exc_info=True)
                                                 continue
@@ -532,7 +1180,7 @@ class PDFVerifier:
                                             text = str(page).strip()
                                         if text:
                                             text_lines.append(text)
-                                            self.logger.info(f"[OCR] ✓ 从页面直接提取文本: {text[:100]}")
+                                            self.logger.debug("[OCR] ✓ 从页面直接提取文本: %s", text[:100])
                                     elif isinstance(page, dict):
                                         # 字典格式，尝试提取文本
                                         self.logger.info(f"[OCR] 检测到字典格式，字典键: {list(page.keys())[:10]}")  # 显示前10个键
@@ -550,12 +1198,12 @@ class PDFVerifier:
                                                             text = str(rec_item[0]).strip() if len(rec_item) > 0 else ''
                                                             if text:
                                                                 text_lines.append(text)
-                                                                self.logger.info(f"[OCR] ✓ 从 rec_res[{rec_idx}] 提取文本: {text[:100]}")
+                                                                self.logger.debug("[OCR] ✓ 从 rec_res[%s] 提取文本: %s", rec_idx, text[:100])
                                                         elif isinstance(rec_item, dict):
                                                             text = rec_item.get('text', '') or rec_item.get('content', '') or rec_item.get('ocr_text', '') or rec_item.get('result', '')
                                                             if text and text.strip():
                                                                 text_lines.append(str(text).strip())
-                                                                self.logger.info(f"[OCR] ✓ 从 rec_res[{rec_idx}] 字典提取文本: {text[:100]}")
+                                                                self.logger.debug("[OCR] ✓ 从 rec_res[%s] 字典提取文本: %s", rec_idx, text[:100])
                                                         elif isinstance(rec_item, str):
                                                             if rec_item.strip():
                                                                 text_lines.append(rec_item.strip())
@@ -572,7 +1220,7 @@ class PDFVerifier:
                                                 text = rec_res.get('text', '') or rec_res.get('content', '') or rec_res.get('ocr_text', '')
                                                 if text and text.strip():
                                                     text_lines.append(str(text).strip())
-                                                    self.logger.info(f"[OCR] ✓ 从 rec_res 字典提取文本: {text[:100]}")
+                                                    self.logger.debug("[OCR] ✓ 从 rec_res 字典提取文本: %s", text[:100])
                                         
                                         # 检查其他可能的字段
                                         for key in ['rec_text', 'ocr_result', 'result', 'text', 'content', 'ocr_text', 'rec']:
@@ -591,13 +1239,13 @@ class PDFVerifier:
                                                             text = str(item[0]).strip()
                                                             if text:
                                                                 text_lines.append(text)
-                                                                self.logger.info(f"[OCR] ✓ 从字段 '{key}' 列表项提取文本: {text[:100]}")
+                                                                self.logger.debug("[OCR] ✓ 从字段 '%s' 列表项提取文本: %s", key, text[:100])
                                         
                                         # 最后检查其他常见字段
                                         text = page.get('text', '') or page.get('content', '') or page.get('ocr_text', '')
                                         if text and text.strip():
                                             text_lines.append(str(text).strip())
-                                            self.logger.info(f"[OCR] ✓ 从页面字典提取文本: {text[:100]}")
+                                            self.logger.debug("[OCR] ✓ 从页面字典提取文本: %s", text[:100])
                                         
                                         # 如果还没有提取到文本，尝试递归提取
                                         if not text_lines:
@@ -640,10 +1288,10 @@ class PDFVerifier:
                                         text = str(page).strip()
                                         if text and len(text) > 3:
                                             text_lines.append(text)
-                                            self.logger.info(f"[OCR] ✓ 从页面其他类型提取文本: {text[:100]}")
+                                            self.logger.debug("[OCR] ✓ 从页面其他类型提取文本: %s", text[:100])
                                 self.logger.info(f"[OCR] 列表格式解析完成，提取到{len(text_lines)}行文本")
                                 if text_lines:
-                                    self.logger.info(f"[OCR] 提取的文本行示例（前5行）: {text_lines[:5]}")
+                                    self.logger.debug("[OCR] 提取的文本行示例（前5行）: %s", text_lines[:5])
                             
                             # 方法4：处理对象属性（尝试获取常见属性）
                             if not text_lines and hasattr(result, '__dict__'):
@@ -661,10 +1309,10 @@ class PDFVerifier:
                             if text_lines:
                                 text = '\n'.join(text_lines)
                                 self.logger.info(f"[OCR] PaddleOCR识别完成，文本长度: {len(text)}")
-                                self.logger.info(f"[OCR] 识别文本预览（前1000字符）: {text[:1000]}")
+                                self.logger.debug("[OCR] 识别文本预览（前1000字符）: %s", text[:1000])
                                 # 如果文本长度超过1000，也显示后500字符
                                 if len(text) > 1000:
-                                    self.logger.debug(f"[OCR] 识别文本后500字符: {text[-500:]}")
+                                    self.logger.debug("[OCR] 识别文本后500字符: %s", text[-500:])
                                 return text
                             
                             # 如果所有方法都失败，记录详细信息并尝试最后的手段
@@ -764,48 +1412,67 @@ class PDFVerifier:
         
         return ""
     
-    def ocr_image_with_api(self, pdf_path: str, page_num: int = 0) -> Dict:
-        """使用二段式OCR API识别PDF（与插件逻辑一致）"""
+    def ocr_image_with_api(self, pdf_path: str, page_num: int = 0, timings: Optional[Timings] = None) -> Dict:
+        """使用二段式OCR API识别PDF（与插件逻辑一致）
+        
+        失败时返回的 'error' 为错误信息；'unavailable' 为 True 表示OCR在本机无法使用
+        （缺少依赖库、未安装poppler、缺少OCR配置），重试也不会成功
+        """
         try:
             # 导入OCR API模块
             from ocr_api_python import (
                 perform_two_stage_ocr, 
                 load_config_from_file,
+                ocr_config_error,
                 OCR_CONFIG
             )
             
             # 加载配置
             load_config_from_file()
+            config_error = ocr_config_error()
+            if config_error:
+                self.logger.error(f"[OCR API] {config_error}")
+                return {'text': '', 'structured': None, 'error': config_error, 'unavailable': True}
             
             # 将PDF第一页转换为图像并转换为data URL
             try:
                 from pdf2image import convert_from_path
+                from pdf2image.exceptions import PDFInfoNotInstalledError
                 from PIL import Image
                 import io
                 import base64
                 
                 self.logger.info(f"[OCR API] 正在将PDF转换为图像: {pdf_path}, 页码: {page_num}")
-                images = convert_from_path(pdf_path, first_page=page_num+1, last_page=page_num+1, dpi=300)
+                with span(timings, 'ocr.rasterize') as extra:
+                    extra['bytes_in'] = os.path.getsize(pdf_path)
+                    try:
+                        images = convert_from_path(pdf_path, first_page=page_num+1, last_page=page_num+1, dpi=300)
+                    except PDFInfoNotInstalledError as e:
+                        self.logger.error(f"[OCR API] 未安装poppler，无法把PDF转换为图像: {e}")
+                        return {'text': '', 'structured': None, 'error': f'未安装poppler: {e}', 'unavailable': True}
                 if not images:
                     self.logger.warning("[OCR API] PDF转图像失败，未生成图像")
-                    return {'text': '', 'structured': None}
+                    return {'text': '', 'structured': None, 'error': 'PDF转图像失败，未生成图像'}
                 
                 image = images[0]
                 self.logger.info(f"[OCR API] PDF转图像成功，图像尺寸: {image.size}")
                 
                 # 将图像转换为JPEG格式的data URL（与插件一致：scale=4, quality=0.95）
                 # 注意：pdf2image已经设置了高DPI，这里直接转换为JPEG
-                buffer = io.BytesIO()
-                image.save(buffer, format='JPEG', quality=95)
-                image_bytes = buffer.getvalue()
-                image_base64 = base64.b64encode(image_bytes).decode('utf-8')
-                image_data_url = f'data:image/jpeg;base64,{image_base64}'
+                with span(timings, 'ocr.encode') as extra:
+                    buffer = io.BytesIO()
+                    image.save(buffer, format='JPEG', quality=95)
+                    image_bytes = buffer.getvalue()
+                    image_base64 = base64.b64encode(image_bytes).decode('utf-8')
+                    image_data_url = f'data:image/jpeg;base64,{image_base64}'
+                    extra['bytes_in'] = image.size[0] * image.size[1] * len(image.getbands())
+                    extra['bytes_out'] = len(image_data_url)
                 
                 self.logger.info(f"[OCR API] 图像已转换为data URL，长度: {len(image_data_url)}")
                 
                 # 执行二段式OCR
                 self.logger.info("[OCR API] 开始二段式OCR识别...")
-                result = perform_two_stage_ocr(image_data_url)
+                result = perform_two_stage_ocr(image_data_url, timings=timings)
                 
                 self.logger.info(f"[OCR API] ✓ 二段式OCR完成，文本长度: {len(result.get('text', ''))}, 是否结构化: {result.get('isStructured', False)}")
                 
@@ -820,17 +1487,17 @@ class PDFVerifier:
             except ImportError as e:
                 self.logger.error(f"[OCR API] 缺少必要的库: {e}")
                 self.logger.error("[OCR API] 请安装: pip install pdf2image pillow")
-                return {'text': '', 'structured': None}
+                return {'text': '', 'structured': None, 'error': f'缺少必要的库: {e}', 'unavailable': True}
             except Exception as e:
                 self.logger.error(f"[OCR API] OCR识别失败: {e}", exc_info=True)
-                return {'text': '', 'structured': None}
+                return {'text': '', 'structured': None, 'error': f'OCR识别失败: {e}'}
                 
         except ImportError:
             self.logger.error("[OCR API] 无法导入ocr_api_python模块，请确保ocr_api_python.py在同一目录")
-            return {'text': '', 'structured': None}
+            return {'text': '', 'structured': None, 'error': '无法导入ocr_api_python模块', 'unavailable': True}
         except Exception as e:
             self.logger.error(f"[OCR API] OCR API调用失败: {e}", exc_info=True)
-            return {'text': '', 'structured': None}
+            return {'text': '', 'structured': None, 'error': f'OCR API调用失败: {e}'}
     
     def extract_dates_from_text(self, text: str) -> Dict:
         """从文本中提取日期（参考test_pdf_extraction.html的逻辑）"""
@@ -906,7 +1573,7 @@ class PDFVerifier:
                 keyword_index = keyword_match.start()
                 context = text[keyword_index:keyword_index + 200]
                 context_normalized = re.sub(r'\s+', ' ', context)
-                self.logger.debug(f"[日期提取] 检查Revised日期，关键词: {keyword}, 上下文: {context_normalized[:100]}")
+                self.logger.debug("[日期提取] 检查Revised日期，关键词: %s, 上下文: %s", keyword, context_normalized[:100])
                 for pattern in date_patterns:
                     match = pattern.search(context_normalized)
                 if match:
@@ -928,7 +1595,7 @@ class PDFVerifier:
                 
                 context = text[keyword_index:keyword_index + 200]
                 context_normalized = re.sub(r'\s+', ' ', context)
-                self.logger.debug(f"[日期提取] 检查Received日期，关键词: {keyword}, 上下文: {context_normalized[:100]}")
+                self.logger.debug("[日期提取] 检查Received日期，关键词: %s, 上下文: %s", keyword, context_normalized[:100])
                 for pattern in date_patterns:
                     date_match = pattern.search(context_normalized)
                     if date_match:
@@ -948,7 +1615,7 @@ class PDFVerifier:
                 keyword_index = keyword_match.start()
                 context = text[keyword_index:keyword_index + 200]
                 context_normalized = re.sub(r'\s+', ' ', context)
-                self.logger.debug(f"[日期提取] 检查Accepted日期，关键词: {keyword}, 上下文: {context_normalized[:100]}")
+                self.logger.debug("[日期提取] 检查Accepted日期，关键词: %s, 上下文: %s", keyword, context_normalized[:100])
                 for pattern in date_patterns:
                     match = pattern.search(context_normalized)
                     if match:
@@ -969,7 +1636,7 @@ class PDFVerifier:
                 keyword_length = len(keyword_match.group(0))
                 # 增加上下文长度到300字符
                 context = text[keyword_index:keyword_index + 300]
-                self.logger.debug(f"[日期提取] 检查Available online日期，关键词: {keyword}, 匹配位置: {keyword_index}, 上下文: {context[:150]}")
+                self.logger.debug("[日期提取] 检查Available online日期，关键词: %s, 匹配位置: %s, 上下文: %s", keyword, keyword_index, context[:150])
                 
                 # 在"Available online"之后直接查找日期
                 found_date = False
@@ -996,7 +1663,7 @@ class PDFVerifier:
                                     found_date = True
                                     break
                         else:
-                                    self.logger.debug(f"[日期提取] 跳过日期（期刊信息干扰）: {date_str}, 距离: {distance_from_keyword}")
+                                    self.logger.debug("[日期提取] 跳过日期（期刊信息干扰）: %s, 距离: %s", date_str, distance_from_keyword)
                     if found_date:
                         break
                 
@@ -1004,7 +1671,7 @@ class PDFVerifier:
                 if not found_date:
                     search_start = keyword_index + keyword_length
                     search_text = text[search_start:search_start + 100]  # 只搜索100字符
-                    self.logger.debug(f"[日期提取] Available online后搜索区域（宽松匹配）: {search_text[:100]}")
+                    self.logger.debug("[日期提取] Available online后搜索区域（宽松匹配）: %s", search_text[:100])
                     for pattern in date_patterns:
                         match = pattern.search(search_text)
                         if match:
@@ -1025,7 +1692,7 @@ class PDFVerifier:
                     keyword_index = keyword_match.start()
                     context = text[keyword_index:keyword_index + 200]
                     context_normalized = re.sub(r'\s+', ' ', context)
-                    self.logger.debug(f"[日期提取] 检查Published日期，关键词: {keyword}, 上下文: {context_normalized[:100]}")
+                    self.logger.debug("[日期提取] 检查Published日期，关键词: %s, 上下文: %s", keyword, context_normalized[:100])
                     for pattern in date_patterns:
                         match = pattern.search(context_normalized)
                         if match:
@@ -1484,23 +2151,6 @@ class PDFVerifier:
         lines = search_text.split('\n')
         self.logger.debug(f"[标题提取] 检查前 {len(lines)} 行，文本长度: {len(search_text)}")
         
-        # 无效标题模式（页眉、页脚、期刊信息等）
-        invalid_patterns = [
-            r'^\d+\.\.\d+',  # 如 "1..11 ++"
-            r'^[A-Z0-9]{5,20}\s+\d+',  # 如 "D5NR03036F 1"
-            r'^view\s+(article|journal|pdf)',  # "View Article Online"
-            r'^published\s+on',  # "Published on ..."
-            r'^downloaded\s+on',  # "Downloaded on ..."
-            r'^doi:',  # "DOI: ..."
-            r'^rsc\.li/',  # "rsc.li/..."
-            r'^check\s+for\s+updates',  # "Check for updates"
-            r'^cite\s+this:',  # "Cite this:"
-            r'^received\s+\d+',  # "Received ..."
-            r'^accepted\s+\d+',  # "Accepted ..."
-            r'^nanoscale|^paper$',  # 期刊名
-            r'^royal\s+society',  # "Royal Society"
-        ]
-        
         # 候选标题列表（按优先级排序）
         candidates = []
         
@@ -1514,13 +2164,7 @@ class PDFVerifier:
             line = re.sub(r'^(title|标题)[:\s]+', '', line, flags=re.IGNORECASE).strip()
             
             # 跳过明显无效的行
-            is_invalid = False
-            for pattern in invalid_patterns:
-                if re.match(pattern, line, re.IGNORECASE):
-                    is_invalid = True
-                    break
-            
-            if is_invalid:
+            if is_invalid_title_line(line):
                 continue
             
             # 跳过 "Introduction" 等章节标题
@@ -1596,13 +2240,7 @@ class PDFVerifier:
                 continue
             
             # 跳过明显无效的行
-            is_invalid = False
-            for pattern in invalid_patterns:
-                if re.match(pattern, line, re.IGNORECASE):
-                    is_invalid = True
-                    break
-            
-            if is_invalid:
+            if is_invalid_title_line(line):
                 if title_parts_auto:  # 遇到无效行，停止合并
                     break
                 continue
@@ -1649,25 +2287,6 @@ class PDFVerifier:
         self.logger.info(f"[作者提取] 检查前 {len(lines)} 行，文本长度: {len(search_text)}")
         self.logger.debug(f"[作者提取] 前20行内容: {lines[:20]}")
         
-        # 无效作者名列表（品牌名、期刊名、系统名等）
-        invalid_names = [
-            'compaq', 'hp', 'dell', 'lenovo', 'acer', 'microsoft', 'apple', 'samsung',
-            'huawei', 'xiaomi', 'computer', 'pc', 'desktop', 'laptop', 'server', 'system',
-            'device', 'machine', 'fields', 'admin', 'user', 'asus', 'administrator', 'test',
-            'open access', 'international journal', 'expert systems', 'direct journals',
-            'elsevier', 'science direct', 'creative commons', 'the author', 'this article',
-            'attribution', 'noderivatives', 'research', 'volume', 'vol.', 'int. j.',
-            'introduction', 'abstract', 'keywords', 'received', 'accepted', 'published',
-            'nanoscale', 'royal society', 'chemistry', 'view article', 'view journal',
-            'check for updates', 'cite this', 'doi:', 'rsc.li', 'dear professor', 'dear dr',
-            'manuscript number', 'engineering structures', 'engineering failure',
-            'engineering failure analysis', 'failure analysis', 'analysis', 'engineering',
-            'journal', 'article', 'paper', 'publication', 'publisher', 'editorial',
-            'editor', 'reviewer', 'correspondence', 'corresponding author', 'author',
-            'authors', 'affiliation', 'department', 'university', 'institute', 'college',
-            'school', 'laboratory', 'lab', 'center', 'centre', 'organization', 'company'
-        ]
-        
         # 作者匹配模式（按优先级排序）
         author_patterns = [
             # 格式1: "Firstname Lastname, Firstname Lastname, ..." (多个作者，逗号分隔)
@@ -1694,14 +2313,7 @@ class PDFVerifier:
                 continue
             
             # 跳过明显无效的行
-            line_lower = line.lower()
-            is_invalid = False
-            for invalid in invalid_names:
-                if invalid in line_lower:
-                    is_invalid = True
-                    break
-            
-            if is_invalid:
+            if is_invalid_author_line(line):
                 continue
             
             # 尝试匹配作者模式
@@ -1726,17 +2338,8 @@ class PDFVerifier:
                     if not author:
                         continue
                     
-                    # 验证作者名是否合理
-                    author_lower = author.lower()
-                    
-                    # 检查是否是无效名称
-                    is_invalid_author = False
-                    for invalid in invalid_names:
-                        if invalid in author_lower or author_lower == invalid:
-                            is_invalid_author = True
-                            break
-                    
-                    if is_invalid_author:
+                    # 验证作者名是否合理：检查是否是无效名称
+                    if is_invalid_author_line(author):
                         continue
                     
                     # 检查长度（作者名通常不会太长）
@@ -1748,23 +2351,7 @@ class PDFVerifier:
                         continue
                     
                     # 检查是否包含无效关键词
-                    invalid_keywords = [
-                        r'Open\s+Access', r'Creative\s+Commons', r'©\s*The\s*Author',
-                        r'This\s+article', r'Attribution', r'NoDerivatives', r'RESEARCH',
-                        r'International\s+Journal', r'Int\.\s*J\.', r'Vol\.', r'Volume',
-                        r'Expert\s+Systems', r'Direct\s+Journals', r'Science\s+Direct',
-                        r'Introduction', r'Abstract', r'Keywords', r'Engineering\s+Failure',
-                        r'Failure\s+Analysis', r'Engineering\s+Structures', r'Journal\s+of',
-                        r'Article\s+in\s+Press', r'Available\s+online', r'Published\s+by',
-                        r'Copyright', r'All\s+Rights\s+Reserved', r'Elsevier', r'Springer',
-                        r'IEEE', r'ACM', r'Publisher', r'Editorial', r'Correspondence'
-                    ]
-                    for keyword in invalid_keywords:
-                        if re.search(keyword, author, re.IGNORECASE):
-                            is_invalid_author = True
-                            break
-                    
-                    if is_invalid_author:
+                    if INVALID_AUTHOR_KEYWORDS_RE.search(author):
                         continue
                     
                     # 检查格式：应该是 "Firstname Lastname" 格式
@@ -1804,8 +2391,12 @@ class PDFVerifier:
         self.logger.info("[作者提取] ========== 作者提取完成 ==========")
         return ''
     
-    def verify_paper(self, metadata: Dict, json_file_path: str = None) -> Dict:
-        """验证论文（支持多个文件，与扩展逻辑一致）"""
+    def verify_paper(self, metadata: Dict, json_file_path: str = None, cancel_token=None) -> Dict:
+        """验证论文（支持多个文件，与扩展逻辑一致）
+        
+        cancel_token（CancelToken 或 threading.Event）取消后，各文件在下一阶段开始前停止，
+        未完成的文件记为 'cancelled'，结果的 errors 中包含 'cancelled'。
+        """
         title = metadata.get('title', 'N/A')
         first_author = metadata.get('firstAuthor', 'N/A')
         self.logger.info(f"="*60)
@@ -1813,22 +2404,126 @@ class PDFVerifier:
         self.logger.info(f"[验证开始] 第一作者: {first_author}")
         self.logger.info(f"[验证开始] JSON文件: {json_file_path}")
         
-        result = {
-            'metadata': metadata,
-            'files': [],
-            'overall_matches': {
-                'author': False,
-                'date': False,
-                'title': False
-            },
-            'errors': []
-        }
+        paper_timings = Timings()
+        result = PaperResult(metadata, match_policy=self.match_policy, timings=paper_timings.stages)
+        paper_start = time.perf_counter()
         
         # 获取文件列表
-        files = metadata.get('files', [])
+        files = self.get_paper_files(metadata)
         self.logger.info(f"[验证开始] 文件数量: {len(files)}")
         
-        # 兼容旧格式
+        if not files:
+            result.errors.append("JSON中未找到文件信息")
+            return result.to_dict()
+        if cancel_token is not None and cancel_token.is_set():
+            result.errors.append('cancelled')
+            return result.to_dict()
+        
+        # 按预估成本排序（文本PDF在前，需要OCR的扫描件在后），预检结果在验证时复用
+        with paper_timings.span('estimate'):
+            estimates = [self.estimate_file_cost(file_info, json_file_path) for file_info in files]
+        order = sorted(range(len(files)), key=lambda i: estimates[i]['cost'])
+        if self.match_policy == 'first_sufficient':
+            # 先跑不需要OCR的文件，三项都匹配后OCR文件整批跳过
+            tiers = [[i for i in order if not estimates[i]['needs_ocr']],
+                     [i for i in order if estimates[i]['needs_ocr']]]
+        else:
+            tiers = [order]
+        
+        # 并发验证每个文件（有界线程池），按完成顺序合并整体匹配结果
+        overall = result.overall_matches
+        file_results = [None] * len(files)
+        cancel_event = CancelToken(parent=cancel_token)
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.max_file_workers, len(files))),
+                                      thread_name_prefix='verify-file')
+        try:
+            for tier in tiers:
+                if cancel_event.is_set():
+                    break
+                futures = {
+                    executor.submit(self._verify_file_with_progress, i + 1, len(files), files[i], metadata,
+                                    json_file_path, estimates[i]['preflight'], cancel_event): i
+                    for i in tier
+                }
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        file_result = future.result()
+                    except Exception as e:
+                        self.logger.error(f"[验证文件 {i + 1}/{len(files)}] 验证失败: {e}", exc_info=True)
+                        file_result = self._new_file_result(files[i])
+                        file_result.errors.append(f"验证过程出错: {str(e)}")
+                    file_results[i] = file_result
+                    
+                    # 记录匹配结果
+                    matches = file_result.matches
+                    self.logger.info(f"[验证文件 {i + 1}/{len(files)}] 匹配结果 - 作者: {matches.author}, 日期: {matches.date}, 标题: {matches.title}")
+                    
+                    # 更新整体匹配结果（只要有一个文件匹配就认为匹配成功）
+                    overall.update(matches)
+                    
+                    # 三项都已匹配后结论不会再变
+                    if self.match_policy == 'first_sufficient' and overall.all():
+                        self.logger.info("[验证] 作者、日期、标题均已匹配，跳过剩余文件")
+                        cancel_event.set()
+                        break
+                    if cancel_event.is_set():
+                        # 整批已取消：不再等待仍在运行的文件
+                        break
+        finally:
+            # 未开始的文件直接取消；正在运行的文件在下一阶段前停止，不等待其结果
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        cancelled = cancel_token is not None and cancel_token.is_set()
+        if cancelled:
+            self.logger.info("[验证] 已取消")
+            result.errors.append('cancelled')
+        for i in order:
+            file_result = file_results[i]
+            if file_result is None:
+                file_result = file_results[i] = self._new_file_result(files[i])
+                file_result.preflight = estimates[i]['preflight'] or {}
+                file_result.errors.append('cancelled' if cancelled else 'skipped')
+            if 'skipped' in file_result.errors or 'cancelled' in file_result.errors:
+                result.skipped_files.append({
+                    'fileName': files[i].get('fileName', ''),
+                    'type': files[i].get('type', ''),
+                    'reason': 'skipped' if 'skipped' in file_result.errors else 'cancelled',
+                    'estimatedCost': estimates[i]['cost']
+                })
+        result.files = file_results
+        
+        # 论文级计时：各文件阶段耗时累加，另记整条记录的墙钟时间；指标中的阶段耗时按文件计
+        observe_timings(paper_timings.stages)
+        for file_result in file_results:
+            observe_timings(file_result.timings)
+            paper_timings.merge(file_result.timings)
+        paper_ms = (time.perf_counter() - paper_start) * 1000
+        paper_timings.add('verify_paper', paper_ms)
+        STAGE_LATENCY.observe(paper_ms, stage='verify_paper')
+        PAPERS.inc(status='cancelled' if cancelled else 'verified')
+        if not cancelled:
+            observe_matches(overall.to_dict())
+        
+        self.logger.info(f"[验证完成] 整体匹配结果 - 作者: {overall.author}, 日期: {overall.date}, 标题: {overall.title}")
+        self.logger.info(f"="*60)
+        return result.to_dict()
+    
+    def _verify_file_with_progress(self, idx: int, total: int, file_info: Dict, metadata: Dict,
+                                   json_file_path: str = None, preflight: Dict = None,
+                                   cancel_event: threading.Event = None) -> FileResult:
+        """线程池任务：输出进度后验证单个文件"""
+        file_name = file_info.get('fileName', '未知文件')
+        file_type = file_info.get('type', '未知类型')
+        self.logger.info(f"[验证文件 {idx}/{total}] {file_type}: {file_name}")
+        
+        # 在验证前输出进度信息，确保用户知道程序正在运行
+        print(f"[{idx}/{total}] 正在验证: {file_type} - {file_name}", flush=True)
+        return self.verify_file(file_info, metadata, json_file_path, preflight, cancel_event)
+    
+    def get_paper_files(self, metadata: Dict) -> List[Dict]:
+        """论文记录中的文件列表（兼容只有 pdfFilePath 的旧格式）"""
+        files = metadata.get('files', [])
         if not files:
             pdf_path = metadata.get('pdfFilePath', '')
             if pdf_path:
@@ -1837,124 +2532,396 @@ class PDFVerifier:
                     'fileName': metadata.get('pdfFileName', ''),
                     'filePath': pdf_path
                 }]
+        return files
+    
+    def estimate_paper_cost(self, metadata: Dict, json_file_path: str = None) -> Dict:
+        """预估整条论文记录的验证成本（供批量调度路由）"""
+        estimates = [self.estimate_file_cost(file_info, json_file_path)
+                     for file_info in self.get_paper_files(metadata)]
+        return {
+            'files': len(estimates),
+            'pages': sum(e['page_count'] for e in estimates),
+            'size': sum(e['size'] for e in estimates),
+            'needs_ocr': any(e['needs_ocr'] for e in estimates),
+            'cost': sum(e['cost'] for e in estimates)
+        }
+    
+    def estimate_file_cost(self, file_info: Dict, json_file_path: str = None) -> Dict:
+        """预估单个文件的验证成本（只做预检，不提取文本）"""
+        estimate = {'path': '', 'size': 0, 'page_count': 0, 'preflight': None,
+                    'needs_ocr': False, 'cost': 0.0}
+        pdf_path = self._resolve_pdf_path(file_info.get('filePath', ''), json_file_path)
+        if not pdf_path or not os.path.exists(pdf_path):
+            # 文件不存在，验证会立即失败
+            return estimate
+        
+        stat = os.stat(pdf_path)
+        cache_key = (pdf_path, stat.st_mtime_ns, stat.st_size, self.isolate_files)
+        with self._estimate_lock:
+            cached = self._estimate_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        estimate['path'] = pdf_path
+        estimate['size'] = stat.st_size
+        self._compute_file_cost(estimate)
+        
+        with self._estimate_lock:
+            if len(self._estimate_cache) >= ESTIMATE_CACHE_SIZE:
+                self._estimate_cache.clear()
+            self._estimate_cache[cache_key] = estimate
+        return estimate
+    
+    def _compute_file_cost(self, estimate: Dict):
+        """根据预检结果和文件大小计算成本"""
+        pdf_path = estimate['path']
+        if self.isolate_files:
+            # 隔离模式下不在主进程解析PDF，只按文件大小估计
+            estimate['cost'] = FILE_COST_UNKNOWN + estimate['size'] / (1024 * 1024) * FILE_COST_PER_MB
+            return
         
-        if not files:
-            result['errors'].append("JSON中未找到文件信息")
-            return result
+        preflight = self.preflight_classify(pdf_path)
+        estimate['page_count'] = preflight['page_count']
+        estimate['preflight'] = preflight
+        estimate['needs_ocr'] = preflight['kind'] in ('scanned', 'garbage')
+        if estimate['needs_ocr']:
+            base_cost = FILE_COST_OCR
+        elif preflight['kind'] == 'text':
+            base_cost = FILE_COST_TEXT
+        else:
+            base_cost = FILE_COST_UNKNOWN
+        estimate['cost'] = base_cost + estimate['size'] / (1024 * 1024) * FILE_COST_PER_MB
+    
+    def verify_file(self, file_info: Dict, metadata: Dict, json_file_path: str = None,
+                    preflight: Dict = None, cancel_event: threading.Event = None) -> FileResult:
+        """验证单个文件（开启隔离模式时在子进程中执行）"""
+        if self.isolate_files:
+            return self._verify_single_file_isolated(file_info, metadata, json_file_path, preflight, cancel_event)
+        return self._verify_single_file(file_info, metadata, json_file_path, preflight, cancel_event)
+    
+    def _verify_single_file_isolated(self, file_info: Dict, metadata: Dict, json_file_path: str = None,
+                                     preflight: Dict = None, cancel_event: threading.Event = None) -> FileResult:
+        """在spawn子进程中验证单个文件，超过时限则终止子进程并返回 errors=['timeout']
+
+        子进程要做OCR时通过管道向父进程申请OCR闸门，由父进程持有，子进程被终止时也能归还；
+        等待闸门的时间不计入时限。
+        """
+        file_name = file_info.get('fileName', '未知文件')
+        ctx = multiprocessing.get_context('spawn')
+        parent_conn, child_conn = ctx.Pipe()
+        process = ctx.Process(
+            target=_isolated_verify_worker,
+            args=(child_conn, file_info, metadata, json_file_path, preflight, self.memory_limit_mb, _log_config),
+            daemon=True
+        )
+        start = time.perf_counter()
+        process.start()
+        child_conn.close()
+        
+        file_result = None
+        error = None
+        slots = None  # 子进程当前占用（或正在申请）的OCR闸门
+        holding = False
+        waited = 0.0
+        try:
+            # 分段等待，以便在取消时及时终止子进程
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    error = 'cancelled'
+                    break
+                if time.perf_counter() - start - waited > self.file_timeout:
+                    error = 'timeout'
+                    break
+                if slots is not None and not holding:
+                    wait_start = time.perf_counter()
+                    holding = slots.acquire(timeout=0.2)
+                    waited += time.perf_counter() - wait_start
+                    if holding:
+                        parent_conn.send(_OCR_SLOT_GRANTED)
+                    continue
+                if not parent_conn.poll(0.2):
+                    continue
+                message = parent_conn.recv()
+                if message == _OCR_SLOT_ACQUIRE:
+                    slots = ocr_slot()
+                elif message == _OCR_SLOT_RELEASE:
+                    if holding:
+                        slots.release()
+                    slots, holding = None, False
+                else:
+                    file_dict, backend_stats = message
+                    file_result = FileResult.from_dict(file_dict)
+                    self._merge_backend_stats(backend_stats)
+                    break
+        except (EOFError, OSError):
+            # 子进程未发送结果就退出（如超出内存上限被系统终止）
+            error = 'worker_crashed'
+        finally:
+            if holding:
+                slots.release()
+            parent_conn.close()
+            process.join(timeout=0 if error in ('timeout', 'cancelled') else 5)
+            if process.is_alive():
+                process.kill()
+                process.join()
+        
+        elapsed = time.perf_counter() - start
+        if error:
+            self.logger.warning(f"[隔离验证] {file_name}: {error}（{elapsed:.1f}s，退出码 {process.exitcode}）")
+            file_result = self._new_file_result(file_info)
+            file_result.errors.append(error)
+        else:
+            self.logger.info(f"[隔离验证] {file_name}: 完成（{elapsed:.1f}s）")
+        return file_result
+    
+    def _merge_backend_stats(self, backend_stats: Dict):
+        """合并子进程返回的后端统计"""
+        with self._stats_lock:
+            for name, stats in backend_stats.items():
+                target = self.backend_stats.setdefault(name, {'attempts': 0, 'hits': 0, 'total_ms': 0.0})
+                for key in ('attempts', 'hits', 'total_ms'):
+                    target[key] += stats.get(key, 0)
+    
+    def _new_file_result(self, file_info: Dict) -> FileResult:
+        """单个文件的空结果"""
+        return FileResult(file_info)
+    
+    def _resolve_pdf_path(self, pdf_path: str, json_file_path: str = None) -> str:
+        """把JSON中的文件路径解析为本地路径（找不到时返回标准化后的原路径），查找走共享的目录索引"""
+        return PATH_INDEX.resolve(pdf_path, json_file_path)
+    
+    def _cancel_requested(self, cancel_event: Optional[threading.Event], file_result: FileResult, stage: str) -> bool:
+        """阶段之间检查取消标志"""
+        if cancel_event is not None and cancel_event.is_set():
+            self.logger.info(f"[文件验证] 已取消，跳过{stage}")
+            file_result.errors.append('cancelled')
+            return True
+        return False
+    
+    def extract_candidates(self, file_result: FileResult) -> Dict:
+        """从已提取的文本/元数据/OCR结构化结果中得到候选作者和标题（PDF文本一组、OCR一组）"""
+        candidates = {'pdf_author': '', 'ocr_author': '', 'pdf_title': '', 'ocr_title': ''}
+        pdf_text = file_result.pdf_text
+        ocr_text = file_result.ocr_text
+        structured = file_result.ocr_structured or {}
+        
+        # 作者
+        self.logger.info("[文件验证] ========== 开始提取候选作者 ==========")
+        pdf_author = file_result.pdf_metadata.get('firstAuthor', '')
+        self.logger.info(f"[文件验证] PDF元数据中的作者: '{pdf_author}'")
+        
+        if not pdf_author and pdf_text:
+            self.logger.info(f"[文件验证] 作者为空，从PDF文本提取（文本长度: {len(pdf_text)})")
+            pdf_author = self.cached_author(pdf_text)
+            self.logger.info(f"[文件验证] PDF文本提取的作者: '{pdf_author}'")
+        
+        # 优先使用OCR结构化结果中的作者（与扩展逻辑一致）
+        ocr_author = ''
+        if structured.get('first_author'):
+            ocr_author = structured['first_author'].strip()
+            if ocr_author and ocr_author != 'Not mentioned':
+                self.logger.info(f"[文件验证] 从OCR结构化结果提取作者: '{ocr_author}'")
+        
+        # 如果OCR结构化结果中没有作者，从OCR文本中提取（降级方案）
+        if not ocr_author and ocr_text:
+            self.logger.info(f"[文件验证] OCR结构化结果中无作者，从OCR文本提取（OCR文本长度: {len(ocr_text)})")
+            ocr_author = self.cached_author(ocr_text)
+            self.logger.info(f"[文件验证] OCR文本提取的作者: '{ocr_author}'")
+        
+        if not ocr_author:
+            self.logger.warning("[文件验证] OCR作者为空，无法从OCR提取作者")
+        candidates['pdf_author'] = pdf_author or ''
+        candidates['ocr_author'] = ocr_author or ''
+        
+        # 标题
+        self.logger.info("[文件验证] ========== 开始提取候选标题 ==========")
+        pdf_title = file_result.pdf_metadata.get('title', '')
+        self.logger.info(f"[文件验证] PDF元数据中的标题: '{pdf_title[:100] if pdf_title else '(空)'}'")
+        
+        if not pdf_title and pdf_text:
+            self.logger.info(f"[文件验证] 标题为空，从PDF文本提取（文本长度: {len(pdf_text)})")
+            pdf_title = self.cached_title(pdf_text)
+            self.logger.info(f"[文件验证] PDF文本提取的标题: '{pdf_title[:100] if pdf_title else '(空)'}'")
+        
+        # 优先使用OCR结构化结果中的标题（与扩展逻辑一致）
+        ocr_title = ''
+        if structured.get('title'):
+            ocr_title = structured['title'].strip()
+            if ocr_title and ocr_title != 'Not mentioned':
+                self.logger.info(f"[文件验证] 从OCR结构化结果提取标题: '{ocr_title[:100]}'")
+        
+        # 如果OCR结构化结果中没有标题，从OCR文本中提取（降级方案）
+        if not ocr_title and ocr_text:
+            self.logger.info(f"[文件验证] OCR结构化结果中无标题，从OCR文本提取（OCR文本长度: {len(ocr_text)})")
+            self.logger.debug("[文件验证] OCR文本预览（前1000字符）: %s", ocr_text[:1000])
+            ocr_title = self.cached_title(ocr_text)
+            self.logger.info(f"[文件验证] OCR文本提取的标题: '{ocr_title[:100] if ocr_title else '(空)'}'")
+        
+        if not ocr_title:
+            self.logger.warning("[文件验证] OCR标题为空，无法从OCR提取标题")
+        candidates['pdf_title'] = pdf_title or ''
+        candidates['ocr_title'] = ocr_title or ''
+        return candidates
+    
+    def match_file(self, file_result: FileResult, metadata: Dict) -> Matches:
+        """用网页元数据匹配单个文件的提取结果（只读 extracted_dates / pdf_metadata / candidates，不做提取）"""
+        matches = Matches()
+        candidates = file_result.candidates or {}
+        web_title = metadata.get('title', '')
+        web_author = metadata.get('firstAuthor', '')
+        web_date = metadata.get('date', '')
+        web_dates = metadata.get('dates', {})
+        self.logger.debug(f"[文件验证] 网页数据 - 标题: {web_title[:50]}, 作者: {web_author}, 日期: {web_date}")
         
-        # 验证每个文件
-        for idx, file_info in enumerate(files, 1):
-            file_name = file_info.get('fileName', '未知文件')
-            file_type = file_info.get('type', '未知类型')
-            self.logger.info(f"[验证文件 {idx}/{len(files)}] {file_type}: {file_name}")
-            
-            # 在验证前输出进度信息，确保用户知道程序正在运行
-            import sys
-            print(f"[{idx}/{len(files)}] 正在验证: {file_type} - {file_name}", flush=True)
-            sys.stdout.flush()
-            
-            file_result = self._verify_single_file(file_info, metadata, json_file_path)
-            result['files'].append(file_result)
-            
-            # 记录匹配结果
-            matches = file_result['matches']
-            self.logger.info(f"[验证文件 {idx}/{len(files)}] 匹配结果 - 作者: {matches['author']}, 日期: {matches['date']}, 标题: {matches['title']}")
-            
-            # 更新整体匹配结果（只要有一个文件匹配就认为匹配成功）
-            if file_result['matches']['author']:
-                result['overall_matches']['author'] = True
-            if file_result['matches']['date']:
-                result['overall_matches']['date'] = True
-            if file_result['matches']['title']:
-                result['overall_matches']['title'] = True
-        
-        overall = result['overall_matches']
-        self.logger.info(f"[验证完成] 整体匹配结果 - 作者: {overall['author']}, 日期: {overall['date']}, 标题: {overall['title']}")
-        self.logger.info(f"="*60)
-        return result
+        # 日期匹配（优先使用received日期）
+        web_date_to_match = web_date
+        if web_dates and web_dates.get('received'):
+            web_date_to_match = web_dates['received']
+        elif web_dates and web_dates.get('published'):
+            web_date_to_match = web_dates['published']
+        
+        all_pdf_dates = file_result.extracted_dates.to_dict() if file_result.extracted_dates is not None else {}
+        all_pdf_dates['general'] = file_result.pdf_metadata.get('date', '')
+        matches.date = self.check_date_match(web_date_to_match, all_pdf_dates)
+        
+        # 作者匹配：优先使用OCR作者（与扩展逻辑一致）
+        final_pdf_author = candidates.get('ocr_author') or candidates.get('pdf_author', '')
+        self.logger.info(f"[文件验证] 最终使用的PDF作者: '{final_pdf_author}'，网页作者: '{web_author}'")
+        matches.author = self.check_author_match(web_author, final_pdf_author)
+        self.logger.info(f"[文件验证] 作者匹配结果: {matches.author}")
+        
+        # 标题匹配：优先使用OCR标题（与扩展逻辑一致）
+        # 如果PDF标题看起来像文件名，跳过
+        ocr_title = candidates.get('ocr_title', '')
+        pdf_title = candidates.get('pdf_title', '')
+        filename_patterns = [
+            r'^view\s*(letter|pdf|file)$',
+            r'^accept',
+            r'^download',
+            r'^file',
+            r'^document'
+        ]
+        is_likely_filename = any(re.match(pattern, pdf_title, re.IGNORECASE) for pattern in filename_patterns)
+        
+        if ocr_title and len(ocr_title.strip()) > 10:
+            # 优先检查OCR标题
+            matches.title = self.check_title_match(web_title, ocr_title)
+        elif not is_likely_filename and pdf_title and len(pdf_title.strip()) > 5:
+            # 再检查PDF标题
+            matches.title = self.check_title_match(web_title, pdf_title)
+        return matches
+    
+    def rematch_paper(self, result: Dict, metadata: Dict) -> Dict:
+        """只重新运行匹配：用当前网页元数据和已保存的提取结果重新计算各文件及整体匹配结果
+        
+        没有提取结果的文件（跳过、取消、出错）保持不匹配；不读取PDF，也不调用OCR。
+        """
+        start = time.perf_counter()
+        rematched = dict(result)
+        rematched['metadata'] = metadata
+        rematched['files'] = []
+        overall = Matches()
+        for file_result in result.get('files', []):
+            record = FileResult.from_dict(file_result)
+            if record.candidates is not None:
+                record.matches = self.match_file(record, metadata)
+            overall.update(record.matches)
+            rematched['files'].append(record.to_dict())
+        rematched['overall_matches'] = overall.to_dict()
+        rematched['rematched'] = True
+        rematched['timings'] = {'rematch': {'ms': round((time.perf_counter() - start) * 1000, 3), 'count': 1}}
+        return rematched
+    
+    def can_rematch(self, result: Dict) -> bool:
+        """结果中每个文件都完成了提取（或因文件本身问题失败）时才能只重新匹配"""
+        files = result.get('files') or []
+        if not files:
+            return False
+        for file_result in files:
+            errors = file_result.get('errors') or []
+            if any(error in INCOMPLETE_FILE_ERRORS for error in errors):
+                return False
+            if 'candidates' not in file_result and not errors:
+                return False
+        return True
     
-    def _verify_single_file(self, file_info: Dict, metadata: Dict, json_file_path: str = None) -> Dict:
+    def _verify_single_file(self, file_info: Dict, metadata: Dict, json_file_path: str = None,
+                            preflight: Dict = None, cancel_event: threading.Event = None) -> FileResult:
         """验证单个文件（与扩展逻辑一致）"""
         file_name = file_info.get('fileName', '未知文件')
         file_type = file_info.get('type', '未知类型')
         self.logger.info(f"[文件验证] 开始验证: {file_type} - {file_name}")
         
-        file_result = {
-            'file_info': file_info,
-            'pdf_text': '',
-            'pdf_metadata': {},
-            'ocr_text': '',
-            'extracted_dates': {},
-            'matches': {
-                'author': False,
-                'date': False,
-                'title': False
-            },
-            'errors': []
-        }
+        file_result = self._new_file_result(file_info)
+        timings = Timings()
+        file_result.timings = timings.stages
         
         pdf_path = file_info.get('filePath', '')
         if not pdf_path:
             self.logger.error(f"[文件验证] 文件路径为空: {file_name}")
-            file_result['errors'].append("文件路径为空")
+            file_result.errors.append("文件路径为空")
             return file_result
         
-        # 标准化路径
-        pdf_path = os.path.normpath(pdf_path)
-        
-        # 如果路径不是绝对路径，尝试多种方式查找文件
-        if not os.path.isabs(pdf_path):
-            # 1. 尝试在JSON文件所在目录查找
-            json_dir = os.path.dirname(json_file_path) if json_file_path else os.getcwd()
-            abs_pdf_path = os.path.normpath(os.path.join(json_dir, pdf_path))
-            if os.path.exists(abs_pdf_path):
-                pdf_path = abs_pdf_path
-            else:
-                # 2. 尝试在当前工作目录查找
-                abs_pdf_path = os.path.normpath(os.path.join(os.getcwd(), pdf_path))
-                if os.path.exists(abs_pdf_path):
-                    pdf_path = abs_pdf_path
-                else:
-                    # 3. 尝试在用户下载目录查找（Windows: Downloads, Linux/Mac: ~/Downloads）
-                    downloads_dir = os.path.join(os.path.expanduser('~'), 'Downloads')
-                    if os.path.exists(downloads_dir):
-                        abs_pdf_path = os.path.normpath(os.path.join(downloads_dir, pdf_path))
-                        if os.path.exists(abs_pdf_path):
-                            pdf_path = abs_pdf_path
-                    # 4. 如果还是找不到，尝试只使用文件名在JSON目录查找
-                    if not os.path.exists(pdf_path):
-                        file_name_only = os.path.basename(pdf_path)
-                        abs_pdf_path = os.path.normpath(os.path.join(json_dir, file_name_only))
-                        if os.path.exists(abs_pdf_path):
-                            pdf_path = abs_pdf_path
+        with timings.span('resolve_path'):
+            pdf_path = self._resolve_pdf_path(pdf_path, json_file_path)
+        json_dir = os.path.dirname(json_file_path) if json_file_path else os.getcwd()
         
         if not os.path.exists(pdf_path):
-            file_result['errors'].append(f"PDF文件不存在: {pdf_path}")
-            file_result['errors'].append(f"尝试查找的位置: {json_dir if json_file_path else os.getcwd()}")
+            file_result.errors.append(f"PDF文件不存在: {pdf_path}")
+            file_result.errors.append(f"尝试查找的位置: {json_dir}")
             return file_result
         
         try:
+            # 0. 预检：扫描件/乱码文本层直接走OCR，跳过版面分析（可复用成本预估时的结果）
+            if self._cancel_requested(cancel_event, file_result, '文本提取'):
+                return file_result
+            with timings.span('preflight') as extra:
+                extra['cache_hit'] = bool(preflight)
+                file_result.preflight = dict(preflight) if preflight else self.preflight_classify(pdf_path)
+            skip_text = file_result.preflight['kind'] in ('scanned', 'garbage')
+            
             # 1. 提取PDF文本
-            self.logger.info(f"[文件验证] 步骤1: 开始提取PDF文本...")
-            file_result['pdf_text'] = self.extract_pdf_text(pdf_path, max_pages=5)
-            self.logger.info(f"[文件验证] PDF文本提取完成，文本长度: {len(file_result['pdf_text'])}字符")
-            if file_result['pdf_text']:
-                self.logger.debug(f"[文件验证] PDF文本预览（前200字符）: {file_result['pdf_text'][:200]}")
+            if skip_text:
+                self.logger.info(f"[文件验证] 步骤1: 预检判定为{file_result.preflight['kind']}，跳过PDF文本提取")
             else:
-                self.logger.warning(f"[文件验证] PDF文本为空，可能是扫描件或加密PDF")
+                self.logger.info(f"[文件验证] 步骤1: 开始提取PDF文本...")
+                file_result.pdf_text, file_result.pages_parsed, file_result.text_quality = \
+                    self.extract_text_cascade(pdf_path, max_pages=5, timings=timings)
+                self.logger.info(f"[文件验证] PDF文本提取完成（后端: {file_result.text_quality['backend']}），"
+                                 f"文本长度: {len(file_result.pdf_text)}字符，解析页数: {file_result.pages_parsed}")
+                if is_garbage_text(file_result.pdf_text):
+                    self.logger.warning("[文件验证] PDF文本层是乱码（CID字形等），丢弃并改用OCR")
+                    file_result.preflight['kind'] = 'garbage'
+                    file_result.text_quality['passed'] = False
+                    file_result.pdf_text = ''
+                if file_result.pdf_text:
+                    self.logger.debug("[文件验证] PDF文本预览（前200字符）: %s", file_result.pdf_text[:200])
+                else:
+                    self.logger.warning(f"[文件验证] PDF文本为空，可能是扫描件或加密PDF")
             
             # 2. 提取PDF元数据
+            if self._cancel_requested(cancel_event, file_result, '元数据提取'):
+                return file_result
             self.logger.info(f"[文件验证] 步骤2: 开始提取PDF元数据...")
-            file_result['pdf_metadata'] = self.extract_pdf_metadata(pdf_path)
-            self.logger.info(f"[文件验证] PDF元数据提取完成 - 标题: {file_result['pdf_metadata'].get('title', '(空)')[:50]}, 第一作者: {file_result['pdf_metadata'].get('firstAuthor', '(空)')[:50]}")
+            with timings.span('metadata'):
+                file_result.pdf_metadata = self.extract_pdf_metadata(pdf_path)
+            self.logger.info(f"[文件验证] PDF元数据提取完成 - 标题: {file_result.pdf_metadata.get('title', '(空)')[:50]}, 第一作者: {file_result.pdf_metadata.get('firstAuthor', '(空)')[:50]}")
+            
+            # 3. OCR识别（如果文本太少、文本质量不达标或元数据缺失）
+            should_ocr = len(file_result.pdf_text) < 100 or \
+                        not file_result.text_quality.get('passed') or \
+                        (not file_result.pdf_metadata.get('title') and not file_result.pdf_metadata.get('firstAuthor'))
             
-            # 3. OCR识别（如果文本太少或元数据缺失）
-            should_ocr = len(file_result['pdf_text']) < 100 or \
-                        (not file_result['pdf_metadata'].get('title') and not file_result['pdf_metadata'].get('firstAuthor'))
+            if should_ocr and self._cancel_requested(cancel_event, file_result, 'OCR识别'):
+                return file_result
             
             if should_ocr:
-                if len(file_result['pdf_text']) < 100:
-                    self.logger.info(f"[文件验证] PDF文本太少({len(file_result['pdf_text'])}字符)，尝试OCR识别")
+                if file_result.preflight['kind'] in ('scanned', 'garbage'):
+                    self.logger.info(f"[文件验证] 预检结果: {file_result.preflight['reason']}，直接OCR识别")
+                elif len(file_result.pdf_text) < 100:
+                    self.logger.info(f"[文件验证] PDF文本太少({len(file_result.pdf_text)}字符)，尝试OCR识别")
+                elif not file_result.text_quality.get('passed'):
+                    self.logger.info(f"[文件验证] 所有文本后端都未通过质量门槛（{file_result.text_quality}），尝试OCR识别")
                 else:
                     self.logger.info(f"[文件验证] PDF元数据缺失（标题或作者为空），尝试OCR识别")
                 self.logger.info("[文件验证] 步骤3: 开始二段式OCR识别（可能需要一些时间）...")
@@ -1962,17 +2929,33 @@ class PDFVerifier:
                 sys.stdout.flush()  # 确保输出立即显示
                 
                 # 使用二段式OCR API（与插件一致）
-                ocr_result = self.ocr_image_with_api(pdf_path, page_num=0)
-                file_result['ocr_text'] = ocr_result.get('text', '')
-                file_result['ocr_structured'] = ocr_result.get('structured')
-                file_result['ocr_is_structured'] = ocr_result.get('isStructured', False)
+                # 文件级线程和两个通道的OCR调用共用进程级闸门，总并发不超过OCR通道大小
+                slots = ocr_slot()
+                with timings.span('ocr.wait'):
+                    slots.acquire()
+                ocr_start = time.perf_counter()
+                try:
+                    with timings.span('ocr') as extra:
+                        ocr_result = self.ocr_image_with_api(pdf_path, page_num=0, timings=timings)
+                        file_result.ocr_text = ocr_result.get('text', '')
+                        extra['bytes_out'] = len(file_result.ocr_text.encode('utf-8'))
+                finally:
+                    slots.release()
+                self.record_backend_result('ocr', bool(file_result.ocr_text), (time.perf_counter() - ocr_start) * 1000)
+                if ocr_result.get('error'):
+                    # OCR调用失败：结果不保存，下次重新验证；OCR在本机不可用：结果照常保存并标记，
+                    # 配置好后用 results_store.py retry-ocr 清除标记重新验证
+                    file_result.errors.append('ocr_unavailable' if ocr_result.get('unavailable') else 'ocr_failed')
+                    file_result.errors.append(ocr_result['error'])
+                file_result.ocr_structured = ocr_result.get('structured')
+                file_result.ocr_is_structured = bool(ocr_result.get('isStructured', False))
                 
-                self.logger.info(f"[文件验证] OCR识别完成，文本长度: {len(file_result['ocr_text'])}, 是否结构化: {file_result['ocr_is_structured']}")
+                self.logger.info(f"[文件验证] OCR识别完成，文本长度: {len(file_result.ocr_text)}, 是否结构化: {file_result.ocr_is_structured}")
                 sys.stdout.flush()  # 确保输出立即显示
                 
                 # 关键：优先使用OCR结构化结果（与插件逻辑一致）
-                if file_result['ocr_structured']:
-                    structured = file_result['ocr_structured']
+                if file_result.ocr_structured:
+                    structured = file_result.ocr_structured
                     self.logger.info(f"[文件验证] ✓ 使用OCR结构化结果")
                     
                     # 从结构化结果中提取标题
@@ -1980,15 +2963,15 @@ class PDFVerifier:
                         title = structured.get('title', '').strip()
                         if title and len(title) >= 5:
                             self.logger.info(f"[文件验证] ✓ 从OCR结构化结果提取标题: {title[:100]}")
-                            file_result['pdf_metadata']['title'] = title
+                            file_result.pdf_metadata['title'] = title
                     
                     # 从结构化结果中提取第一作者
                     if structured.get('first_author') and structured.get('first_author') != 'Not mentioned':
                         first_author = structured.get('first_author', '').strip()
                         if first_author:
                             self.logger.info(f"[文件验证] ✓ 从OCR结构化结果提取第一作者: {first_author}")
-                            file_result['pdf_metadata']['firstAuthor'] = first_author
-                            file_result['pdf_metadata']['author'] = first_author
+                            file_result.pdf_metadata['firstAuthor'] = first_author
+                            file_result.pdf_metadata['author'] = first_author
                     
                     # 从结构化结果中提取所有作者
                     if structured.get('authors') and structured.get('authors') != 'Not mentioned':
@@ -1997,44 +2980,32 @@ class PDFVerifier:
                             # 解析作者列表（可能是逗号或分号分隔）
                             authors = [a.strip() for a in re.split(r'[,;]', authors_str) if a.strip()]
                             if authors:
-                                file_result['pdf_metadata']['allAuthors'] = authors
+                                file_result.pdf_metadata['allAuthors'] = authors
                                 self.logger.info(f"[文件验证] ✓ 从OCR结构化结果提取所有作者: {', '.join(authors)}")
-                    
-                    # 从结构化结果中提取日期
-                    if structured.get('dates'):
-                        dates = structured.get('dates', {})
-                        if dates.get('received') and dates.get('received') != 'Not mentioned':
-                            file_result['extracted_dates']['received'] = dates.get('received')
-                        if dates.get('received_in_revised') and dates.get('received_in_revised') != 'Not mentioned':
-                            file_result['extracted_dates']['revised'] = dates.get('received_in_revised')
-                        elif dates.get('revised') and dates.get('revised') != 'Not mentioned':
-                            file_result['extracted_dates']['revised'] = dates.get('revised')
-                        if dates.get('accepted') and dates.get('accepted') != 'Not mentioned':
-                            file_result['extracted_dates']['accepted'] = dates.get('accepted')
-                        if dates.get('available_online') and dates.get('available_online') != 'Not mentioned':
-                            file_result['extracted_dates']['availableOnline'] = dates.get('available_online')
+                    # 结构化结果中的日期在步骤4统一处理
                 
                 # 如果结构化失败或元数据仍缺失，从OCR文本中补全（降级方案）
-                if file_result['ocr_text']:
-                    ocr_text = file_result['ocr_text']
-                    self.logger.info(f"[文件验证] OCR文本长度: {len(ocr_text)}, 预览（前500字符）: {ocr_text[:500]}")
+                if file_result.ocr_text:
+                    ocr_text = file_result.ocr_text
+                    self.logger.info(f"[文件验证] OCR文本长度: {len(ocr_text)}")
+                    self.logger.debug("[文件验证] OCR文本预览（前500字符）: %s", ocr_text[:500])
                     
-                    if not file_result['pdf_metadata'].get('title') or len(file_result['pdf_metadata'].get('title', '')) < 5:
+                    if not file_result.pdf_metadata.get('title') or len(file_result.pdf_metadata.get('title', '')) < 5:
                         self.logger.info("[文件验证] 标题为空或太短，尝试从OCR文本提取标题...")
-                        extracted_title = self.extract_title_from_text(ocr_text)
+                        extracted_title = self.cached_title(ocr_text)
                         if extracted_title:
                             self.logger.info(f"[文件验证] ✓ 从OCR文本补全标题: {extracted_title[:100]}")
-                            file_result['pdf_metadata']['title'] = extracted_title
+                            file_result.pdf_metadata['title'] = extracted_title
                         else:
                             self.logger.warning("[文件验证] ✗ 从OCR文本提取标题失败")
                     
-                    if not file_result['pdf_metadata'].get('firstAuthor'):
+                    if not file_result.pdf_metadata.get('firstAuthor'):
                         self.logger.info("[文件验证] 作者为空，尝试从OCR文本提取作者...")
-                        extracted_author = self.extract_author_from_text(ocr_text)
+                        extracted_author = self.cached_author(ocr_text)
                         if extracted_author:
                             self.logger.info(f"[文件验证] ✓ 从OCR文本补全作者: {extracted_author}")
-                            file_result['pdf_metadata']['firstAuthor'] = extracted_author
-                            file_result['pdf_metadata']['author'] = extracted_author
+                            file_result.pdf_metadata['firstAuthor'] = extracted_author
+                            file_result.pdf_metadata['author'] = extracted_author
                         else:
                             self.logger.warning("[文件验证] ✗ 从OCR文本提取作者失败")
                 else:
@@ -2044,152 +3015,85 @@ class PDFVerifier:
             
             # 4. 提取日期（优先使用OCR结构化结果中的日期）
             self.logger.debug("[文件验证] 步骤4: 提取日期")
-            file_result['extracted_dates'] = {
-                'received': None,
-                'accepted': None,
-                'published': None,
-                'revised': None,
-                'availableOnline': None,
-                'other': []
-            }
+            timings.begin('dates')
+            dates = file_result.extracted_dates = ExtractedDates()
             
             # 优先使用OCR结构化结果中的日期（与插件逻辑一致）
-            if file_result.get('ocr_structured') and file_result['ocr_structured'].get('dates'):
-                dates = file_result['ocr_structured']['dates']
-                if dates.get('received') and dates.get('received') != 'Not mentioned':
-                    file_result['extracted_dates']['received'] = dates.get('received')
-                if dates.get('received_in_revised') and dates.get('received_in_revised') != 'Not mentioned':
-                    file_result['extracted_dates']['revised'] = dates.get('received_in_revised')
-                elif dates.get('revised') and dates.get('revised') != 'Not mentioned':
-                    file_result['extracted_dates']['revised'] = dates.get('revised')
-                if dates.get('accepted') and dates.get('accepted') != 'Not mentioned':
-                    file_result['extracted_dates']['accepted'] = dates.get('accepted')
-                if dates.get('available_online') and dates.get('available_online') != 'Not mentioned':
-                    file_result['extracted_dates']['availableOnline'] = dates.get('available_online')
-                self.logger.info(f"[文件验证] 从OCR结构化结果提取的日期: {file_result['extracted_dates']}")
+            if file_result.ocr_structured and file_result.ocr_structured.get('dates'):
+                dates.fill_from_structured(file_result.ocr_structured['dates'])
+                self.logger.info(f"[文件验证] 从OCR结构化结果提取的日期: {dates.to_dict()}")
             
             # 如果OCR结构化结果中缺少某些日期，从文本中补充（降级方案）
             # 检查是否所有日期都为空，或者某些关键日期缺失
-            has_any_date = any(file_result['extracted_dates'].values())
-            missing_key_dates = not file_result['extracted_dates'].get('received') and not file_result['extracted_dates'].get('availableOnline')
-            
-            if not has_any_date or missing_key_dates:
-                full_text = file_result['pdf_text'] + file_result['ocr_text']
-                extracted_dates = self.extract_dates_from_text(full_text)
+            if not dates.any() or (not dates.received and not dates.available_online):
+                full_text = file_result.pdf_text + file_result.ocr_text
                 # 合并提取的日期（只填充空值，优先使用OCR结构化结果）
-                for key in file_result['extracted_dates']:
-                    if not file_result['extracted_dates'][key] and extracted_dates.get(key):
-                        file_result['extracted_dates'][key] = extracted_dates[key]
-                        self.logger.info(f"[文件验证] 从文本补充日期 {key}: {extracted_dates[key]}")
-                self.logger.info(f"[文件验证] 最终提取的日期: {file_result['extracted_dates']}")
-            
-            # 5. 匹配验证（与扩展逻辑一致）
-            self.logger.debug("[文件验证] 步骤5: 开始匹配验证")
-            web_title = metadata.get('title', '')
-            web_author = metadata.get('firstAuthor', '')
-            web_date = metadata.get('date', '')
-            web_dates = metadata.get('dates', {})
-            self.logger.debug(f"[文件验证] 网页数据 - 标题: {web_title[:50]}, 作者: {web_author}, 日期: {web_date}")
-            
-            # 日期匹配（优先使用received日期）
-            web_date_to_match = web_date
-            if web_dates and web_dates.get('received'):
-                web_date_to_match = web_dates['received']
-            elif web_dates and web_dates.get('published'):
-                web_date_to_match = web_dates['published']
+                for key, value in dates.merge_missing(self.cached_dates(full_text)):
+                    self.logger.info(f"[文件验证] 从文本补充日期 {key}: {value}")
+                self.logger.info(f"[文件验证] 最终提取的日期: {dates.to_dict()}")
             
-            all_pdf_dates = {
-                **file_result['extracted_dates'],
-                'general': file_result['pdf_metadata'].get('date', '')
-            }
-            file_result['matches']['date'] = self.check_date_match(web_date_to_match, all_pdf_dates)
+            timings.end('dates')
             
-            # 作者匹配
-            self.logger.info("[文件验证] ========== 开始作者匹配 ==========")
-            pdf_author = file_result['pdf_metadata'].get('firstAuthor', '')
-            self.logger.info(f"[文件验证] PDF元数据中的作者: '{pdf_author}'")
+            # 5. 候选作者/标题（提取结果的一部分，与匹配规则无关，重新匹配时直接复用）
+            with timings.span('candidates'):
+                file_result.candidates = self.extract_candidates(file_result)
             
-            if not pdf_author and file_result['pdf_text']:
-                self.logger.info(f"[文件验证] 作者为空，从PDF文本提取（文本长度: {len(file_result['pdf_text'])})")
-                pdf_author = self.extract_author_from_text(file_result['pdf_text'])
-                self.logger.info(f"[文件验证] PDF文本提取的作者: '{pdf_author}'")
-            
-            # 优先使用OCR结构化结果中的作者（与扩展逻辑一致）
-            ocr_author = ''
-            if file_result.get('ocr_structured') and file_result['ocr_structured'].get('first_author'):
-                ocr_author = file_result['ocr_structured']['first_author'].strip()
-                if ocr_author and ocr_author != 'Not mentioned':
-                    self.logger.info(f"[文件验证] 从OCR结构化结果提取作者: '{ocr_author}'")
-            
-            # 如果OCR结构化结果中没有作者，从OCR文本中提取（降级方案）
-            if not ocr_author and file_result['ocr_text']:
-                self.logger.info(f"[文件验证] OCR结构化结果中无作者，从OCR文本提取（OCR文本长度: {len(file_result['ocr_text'])})")
-                ocr_author = self.extract_author_from_text(file_result['ocr_text'])
-                self.logger.info(f"[文件验证] OCR文本提取的作者: '{ocr_author}'")
-            
-            if not ocr_author:
-                self.logger.warning("[文件验证] OCR作者为空，无法从OCR提取作者")
-            
-            # 优先使用OCR作者（与扩展逻辑一致）
-            final_pdf_author = ocr_author if ocr_author else pdf_author
-            self.logger.info(f"[文件验证] 最终使用的PDF作者: '{final_pdf_author}'")
-            self.logger.info(f"[文件验证] 网页作者: '{web_author}'")
-            file_result['matches']['author'] = self.check_author_match(web_author, final_pdf_author)
-            self.logger.info(f"[文件验证] 作者匹配结果: {file_result['matches']['author']}")
-            self.logger.info("[文件验证] ========== 作者匹配完成 ==========")
-            
-            # 标题匹配
-            self.logger.info("[文件验证] ========== 开始标题匹配 ==========")
-            pdf_title = file_result['pdf_metadata'].get('title', '')
-            self.logger.info(f"[文件验证] PDF元数据中的标题: '{pdf_title[:100] if pdf_title else '(空)'}'")
-            
-            if not pdf_title and file_result['pdf_text']:
-                self.logger.info(f"[文件验证] 标题为空，从PDF文本提取（文本长度: {len(file_result['pdf_text'])})")
-                pdf_title = self.extract_title_from_text(file_result['pdf_text'])
-                self.logger.info(f"[文件验证] PDF文本提取的标题: '{pdf_title[:100] if pdf_title else '(空)'}'")
-            
-            # 优先使用OCR结构化结果中的标题（与扩展逻辑一致）
-            ocr_title = ''
-            if file_result.get('ocr_structured') and file_result['ocr_structured'].get('title'):
-                ocr_title = file_result['ocr_structured']['title'].strip()
-                if ocr_title and ocr_title != 'Not mentioned':
-                    self.logger.info(f"[文件验证] 从OCR结构化结果提取标题: '{ocr_title[:100]}'")
-            
-            # 如果OCR结构化结果中没有标题，从OCR文本中提取（降级方案）
-            if not ocr_title and file_result['ocr_text']:
-                self.logger.info(f"[文件验证] OCR结构化结果中无标题，从OCR文本提取（OCR文本长度: {len(file_result['ocr_text'])})")
-                self.logger.debug(f"[文件验证] OCR文本预览（前1000字符）: {file_result['ocr_text'][:1000]}")
-                ocr_title = self.extract_title_from_text(file_result['ocr_text'])
-                self.logger.info(f"[文件验证] OCR文本提取的标题: '{ocr_title[:100] if ocr_title else '(空)'}'")
-            
-            if not ocr_title:
-                self.logger.warning("[文件验证] OCR标题为空，无法从OCR提取标题")
-            
-            # 优先使用OCR标题（与扩展逻辑一致）
-            # 如果PDF标题看起来像文件名，跳过
-            filename_patterns = [
-                r'^view\s*(letter|pdf|file)$',
-                r'^accept',
-                r'^download',
-                r'^file',
-                r'^document'
-            ]
-            is_likely_filename = any(re.match(pattern, pdf_title, re.IGNORECASE) for pattern in filename_patterns)
-            
-            if ocr_title and len(ocr_title.strip()) > 10:
-                # 优先检查OCR标题
-                file_result['matches']['title'] = self.check_title_match(web_title, ocr_title)
-            elif not is_likely_filename and pdf_title and len(pdf_title.strip()) > 5:
-                # 再检查PDF标题
-                file_result['matches']['title'] = self.check_title_match(web_title, pdf_title)
+            # 6. 匹配验证（与扩展逻辑一致）
+            self.logger.debug("[文件验证] 步骤6: 开始匹配验证")
+            with timings.span('matching'):
+                file_result.matches = self.match_file(file_result, metadata)
             
         except Exception as e:
             import traceback
-            file_result['errors'].append(f"验证过程出错: {str(e)}\n{traceback.format_exc()}")
+            file_result.errors.append(f"验证过程出错: {str(e)}\n{traceback.format_exc()}")
         
         return file_result
 
 
+_OCR_SLOT_ACQUIRE = 'ocr_slot_acquire'
+_OCR_SLOT_GRANTED = 'ocr_slot_granted'
+_OCR_SLOT_RELEASE = 'ocr_slot_release'
+
+
+class _ParentOCRSlot:
+    """隔离验证子进程中的OCR闸门：向父进程申请和归还，与父进程内的OCR调用共用同一个上限"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        self.conn.send(_OCR_SLOT_ACQUIRE)
+        if self.conn.recv() != _OCR_SLOT_GRANTED:
+            raise RuntimeError('父进程未授予OCR闸门')
+        return True
+
+    def release(self):
+        self.conn.send(_OCR_SLOT_RELEASE)
+
+
+def _isolated_verify_worker(conn, file_info: Dict, metadata: Dict, json_file_path: str,
+                            preflight: Optional[Dict], memory_limit_mb: int, log_config: Optional[Tuple] = None):
+    """隔离验证子进程入口：设置内存上限后验证单个文件，把结果和后端统计发回父进程"""
+    if log_config:
+        setup_logging(*log_config)  # 父进程配置了日志时，子进程写入同一个日志文件
+    install_ocr_slot(_ParentOCRSlot(conn))
+    if HAS_RESOURCE and memory_limit_mb:
+        limit = memory_limit_mb * 1024 * 1024
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError) as e:
+            logger.warning(f"[隔离验证] 设置内存上限失败: {e}")
+    
+    verifier = PDFVerifier()
+    try:
+        file_result = verifier._verify_single_file(file_info, metadata, json_file_path, preflight)
+    except MemoryError:
+        file_result = verifier._new_file_result(file_info)
+        file_result.errors.append('memory_limit')
+    conn.send((file_result.to_dict(), verifier.backend_stats))
+    conn.close()
+
+
 class PaperVerifierGUI:
     """论文验证GUI"""
     
@@ -2199,9 +3103,20 @@ class PaperVerifierGUI:
         self.root.geometry("1000x700")
         
         self.verifier = PDFVerifier()
-        self.current_results = []
+        self.current_results = []  # 本次验证的精简结果（不含全文），用于验证后导出
+        self.export_path = None  # 验证时流式导出的文件
+        
+        # 验证结果库：JSON和PDF都未变化的论文直接复用上次结果
+        try:
+            self.store = ResultsStore()
+        except Exception as e:
+            logger.error(f"[结果库] 打开失败，本次不做增量验证: {e}", exc_info=True)
+            self.store = None
         
         self.setup_ui()
+        # 工作线程通过队列更新界面，Tk线程按固定间隔合并插入（文本进运行日志，结果进表格）
+        self.ui = UIBridge(self.root, self.log_text)
+        self.ui.start()
     
     def setup_ui(self):
         """设置UI"""
@@ -2241,22 +3156,53 @@ class PaperVerifierGUI:
         ttk.Button(button_frame, text="清空列表", command=self.clear_list).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="导出结果", command=self.export_results).pack(side=tk.LEFT, padx=5)
         
+        # 隔离模式：每个文件在子进程中验证，单个异常PDF超时后被终止，不会卡住整个批次
+        self.isolate_var = tk.BooleanVar(value=self.verifier.isolate_files)
+        ttk.Checkbutton(button_frame, text=f"子进程隔离（单文件超时 {int(self.verifier.file_timeout)}s）",
+                        variable=self.isolate_var).pack(side=tk.LEFT, padx=5)
+        
+        # 三项都匹配后不再验证同一论文的剩余文件（first_sufficient 策略）
+        self.cancel_matched_var = tk.BooleanVar(value=self.verifier.match_policy == 'first_sufficient')
+        ttk.Checkbutton(button_frame, text="全部匹配后跳过剩余文件",
+                        variable=self.cancel_matched_var).pack(side=tk.LEFT, padx=5)
+        
+        # 增量验证：跳过JSON和PDF内容都没有变化的论文
+        self.incremental_var = tk.BooleanVar(value=self.store is not None)
+        ttk.Checkbutton(button_frame, text="跳过未变化的论文",
+                        variable=self.incremental_var).pack(side=tk.LEFT, padx=5)
+        
+        # 流式导出：每条结果验证完成后立即写入JSONL/CSV；勾选"导出全文"时PDF/OCR文本写到旁边的目录
+        self.stream_export_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(button_frame, text="验证时导出",
+                        variable=self.stream_export_var).pack(side=tk.LEFT, padx=5)
+        self.export_full_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(button_frame, text="导出全文",
+                        variable=self.export_full_var).pack(side=tk.LEFT, padx=5)
+        
         # 进度条
         self.progress = ttk.Progressbar(main_frame, mode='indeterminate')
         self.progress.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
         
-        # 结果显示
+        # 结果显示：每篇论文一行，选中后显示详情
         result_frame = ttk.LabelFrame(main_frame, text="验证结果", padding="10")
         result_frame.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
         
-        self.result_text = scrolledtext.ScrolledText(result_frame, height=15, wrap=tk.WORD)
-        self.result_text.pack(fill=tk.BOTH, expand=True)
+        self.result_table = ResultTable(result_frame, self.format_result, reload_result=self._reload_result)
+        self.result_table.frame.pack(fill=tk.BOTH, expand=True)
+        
+        # 运行日志（处理进度、错误、耗时汇总）
+        log_frame = ttk.LabelFrame(main_frame, text="运行日志", padding="10")
+        log_frame.grid(row=5, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
+        
+        self.log_text = scrolledtext.ScrolledText(log_frame, height=5, wrap=tk.WORD)
+        self.log_text.pack(fill=tk.BOTH, expand=True)
         
         # 配置网格权重
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(0, weight=1)
         main_frame.columnconfigure(0, weight=1)
-        main_frame.rowconfigure(4, weight=1)
+        main_frame.rowconfigure(4, weight=3)
+        main_frame.rowconfigure(5, weight=1)
     
     def select_file(self, event=None):
         """选择文件"""
@@ -2276,7 +3222,8 @@ class PaperVerifierGUI:
         """清空列表"""
         self.file_listbox.delete(0, tk.END)
         self.current_results = []
-        self.result_text.delete(1.0, tk.END)
+        self.ui.clear_text()
+        self.result_table.clear()
     
     def start_verification(self):
         """开始验证"""
@@ -2285,63 +3232,216 @@ class PaperVerifierGUI:
             messagebox.showwarning("警告", "请先添加JSON文件")
             return
         
-        # 在新线程中执行验证
-        thread = threading.Thread(target=self.verify_files, args=(files,))
+        self.verifier.isolate_files = self.isolate_var.get()
+        self.verifier.match_policy = 'first_sufficient' if self.cancel_matched_var.get() else 'exhaustive'
+        
+        self.export_path = None
+        if self.stream_export_var.get():
+            self.export_path = filedialog.asksaveasfilename(
+                title="验证结果导出到",
+                defaultextension=".jsonl",
+                filetypes=[("JSON Lines", "*.jsonl"), ("CSV", "*.csv")]
+            )
+            if not self.export_path:
+                return
+        
+        self.progress.start()
+        self.ui.clear_text()
+        self.result_table.clear()
+        
+        # 在新线程中执行验证（Tk变量只能在界面线程读取，选项在这里取值后传入）
+        thread = threading.Thread(target=self.verify_files,
+                                  args=(files, self.incremental_var.get(), self.export_full_var.get()))
         thread.daemon = True
         thread.start()
     
-    def verify_files(self, files: List[str]):
-        """验证文件列表"""
-        self.progress.start()
-        self.result_text.delete(1.0, tk.END)
+    def verify_files(self, files: List[str], incremental: bool = True, export_full: bool = False):
+        """验证文件列表（文本PDF与需要OCR的文件分通道调度，快结果先显示）
+        
+        在工作线程中运行，界面更新一律经由 self.ui 提交；incremental / export_full 由界面线程读取后传入。
+        """
         self.current_results = []
         
         total = len(files)
-        for i, json_file in enumerate(files):
-            try:
-                # 更新进度
-                json_basename = os.path.basename(json_file)
-                self.root.after(0, lambda f=json_basename, idx=i+1, total=total: 
-                               self.result_text.insert(tk.END, f"\n[{idx}/{total}] 处理: {f}\n"))
-                
-                # 读取JSON
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-                
-                # 如果PDF路径是相对路径，尝试相对于JSON文件解析
-                files_list = metadata.get('files', [])
-                if files_list:
-                    json_dir = os.path.dirname(os.path.abspath(json_file))
-                    for file_info in files_list:
-                        pdf_path = file_info.get('filePath', '')
-                        if pdf_path and not os.path.isabs(pdf_path):
-                            abs_pdf_path = os.path.normpath(os.path.join(json_dir, pdf_path))
-                            if os.path.exists(abs_pdf_path):
-                                file_info['filePath'] = abs_pdf_path
-                
-                # 验证（传递JSON文件路径，用于解析相对路径）
-                # 在验证前更新GUI，显示正在处理
-                self.root.after(0, lambda: self.result_text.insert(tk.END, f"正在验证中，请稍候...\n"))
-                self.root.after(0, lambda: self.result_text.see(tk.END))  # 滚动到底部
-                
-                result = self.verifier.verify_paper(metadata, json_file_path=os.path.abspath(json_file))
-                self.current_results.append(result)
-                
-                # 显示结果
-                self.root.after(0, lambda r=result: self.display_result(r))
-                self.root.after(0, lambda: self.result_text.see(tk.END))  # 滚动到底部
-                
-            except Exception as e:
+        results = [None] * total
+        jobs = [{'index': i, 'total': total, 'json_file': json_file, 'metadata': None}
+                for i, json_file in enumerate(files)]
+        store = self.store if incremental else None
+        run_id = self._begin_store_run(total)
+        exporter = self._open_exporter(export_full)
+        
+        # 批量读取全部JSON（线程池）；读取失败的在调度时重新读取并报告错误
+        for job, (_, sidecar, _) in zip(jobs, load_sidecars(files)):
+            if sidecar is not None:
+                job['metadata'], job['pdf_paths'] = sidecar
+        
+        def on_done(job, result, lane):
+            if isinstance(result, Exception):
                 import traceback
-                error_msg = f"处理 {os.path.basename(json_file)} 时出错: {str(e)}\n"
-                error_msg += f"详细错误: {traceback.format_exc()}\n"
-                self.root.after(0, lambda msg=error_msg: self.result_text.insert(tk.END, msg))
+                error_msg = f"处理 {os.path.basename(job['json_file'])} 时出错: {str(result)}\n"
+                error_msg += f"详细错误: {''.join(traceback.format_exception(type(result), result, result.__traceback__))}\n"
+                self.ui.post_text(error_msg)
+                self.ui.post_call(self.result_table.add_error, os.path.basename(job['json_file']), str(result),
+                                  job['json_file'])
+                self._store_call('record_failed', run_id, job['json_file'])
+                return
+            if not job.get('cached'):
+                self._store_call('save_result', run_id, job['json_file'], self._job_pdf_paths(job), result)
+            if exporter is not None:
+                try:
+                    exporter.write(result, job['json_file'])
+                except Exception as e:
+                    logger.error(f"[导出] 写入失败: {job['json_file']}: {e}", exc_info=True)
+            # 只保留精简结果（全文在结果库和导出文件中），长时间批量验证内存不随文本增长
+            results[job['index']] = slim_result(result, job['json_file'])
+            self.current_results.append(results[job['index']])
+            
+            # 表格中追加一行（详情在选中时才格式化）
+            self.display_result(result, job['json_file'])
+        
+        # 未变化的论文直接复用结果库中的结果，不进入调度器
+        cached = rematched = 0
+        if store is not None:
+            for job in jobs:
+                try:
+                    result = store.lookup_unchanged(job['json_file'])
+                except Exception as e:
+                    logger.warning(f"[结果库] 查询失败，重新验证: {job['json_file']}: {e}")
+                    result = None
+                if result is not None:
+                    result['cached'] = True
+                    job['cached'] = True
+                    cached += 1
+                    self._store_call('record_cached', run_id, job['json_file'], result)
+                    on_done(job, result, 'cache')
+                    continue
+                # JSON修改过但PDF没变：复用提取结果，只重新匹配
+                result = self._rematch_job(job, store)
+                if result is not None:
+                    job['cached'] = True
+                    rematched += 1
+                    self._store_call('save_result', run_id, job['json_file'], self._job_pdf_paths(job), result,
+                                     'rematched')
+                    on_done(job, result, 'rematch')
+            logger.info(f"[结果库] {cached}/{total} 篇论文未变化，复用上次结果；{rematched} 篇只重新匹配")
+        
+        scheduler = VerifyScheduler(route=self._route_json_file, work=self._verify_json_file, on_done=on_done)
+        with scheduler:
+            for job in jobs:
+                if not job.get('cached'):
+                    scheduler.submit(job)
+        if run_id is not None:
+            self._store_call('finish_run', run_id)
+        if exporter is not None:
+            exporter.close()
+            self.ui.post_text(f"\n已导出 {exporter.rows} 条结果: {exporter.path}\n")
+        
+        # 按输入顺序保存结果，便于导出
+        self.current_results = [r for r in results if r is not None]
+        lane_stats = scheduler.get_stats()
+        logger.info(f"[批量验证] 通道统计: {lane_stats}")
+        dump_metrics(source='gui', run_id=run_id, total=total, cached=cached, rematched=rematched)
+        
+        # 批量阶段耗时汇总（复用的结果不计入）
+        verified_results = [r for r in self.current_results if r['status'] == 'verified']
+        if verified_results:
+            timing_table = format_rollup(rollup(r.get('timings') for r in verified_results))
+            logger.info(f"[批量验证] 阶段耗时汇总:\n{timing_table}")
+            self.ui.post_text(f"\n阶段耗时汇总:\n{timing_table}\n")
+        
+        self.ui.post_call(self.progress.stop)
+        self.ui.post_call(messagebox.showinfo,
+                          "完成", f"验证完成！共处理 {total} 个文件"
+                                  f"（未变化复用 {cached} 个，只重新匹配 {rematched} 个，文本通道 {lane_stats[LANE_CPU]['submitted']} 个，"
+                                  f"OCR通道 {lane_stats[LANE_OCR]['submitted']} 个）")
+    
+    def _open_exporter(self, full: bool = False) -> Optional[ResultExporter]:
+        """打开本次验证的流式导出文件（未勾选或打开失败时返回 None）"""
+        if not self.export_path:
+            return None
+        profile = PROFILE_FULL if full else PROFILE_SLIM
+        try:
+            return ResultExporter(self.export_path, profile=profile, store=self.store).open()
+        except Exception as e:
+            logger.error(f"[导出] 无法创建导出文件: {self.export_path}: {e}", exc_info=True)
+            self.ui.post_text(f"无法创建导出文件: {self.export_path}: {e}\n")
+            return None
+    
+    def _begin_store_run(self, total: int) -> Optional[int]:
+        """在结果库中登记一次批量运行（结果库不可用时返回 None）"""
+        if self.store is None:
+            return None
+        return self._store_call('begin_run', 'gui', total)
+    
+    def _store_call(self, method: str, *args):
+        """调用结果库；出错只记录日志，不影响验证"""
+        if self.store is None:
+            return None
+        try:
+            return getattr(self.store, method)(*args)
+        except Exception as e:
+            logger.error(f"[结果库] {method} 失败: {e}", exc_info=True)
+            return None
+    
+    def _rematch_job(self, job: Dict, store: ResultsStore) -> Optional[Dict]:
+        """PDF都未变化且上次结果包含完整提取结果时，用当前网页元数据只重新匹配"""
+        try:
+            metadata = self._load_json_job(job)
+            prior = store.lookup_facts(job['json_file'], self._job_pdf_paths(job))
+            if prior is None or not self.verifier.can_rematch(prior):
+                return None
+            return self.verifier.rematch_paper(prior, metadata)
+        except Exception as e:
+            logger.warning(f"[结果库] 重新匹配失败，完整验证: {job['json_file']}: {e}")
+            return None
+    
+    def _job_pdf_paths(self, job: Dict) -> List[str]:
+        """论文记录引用的PDF绝对路径（用于计算内容哈希）"""
+        if job.get('pdf_paths') is None:
+            self._load_json_job(job)
+        return job['pdf_paths']
+    
+    def _load_json_job(self, job: Dict) -> Dict:
+        """读取并规范化侧车JSON（PDF路径解析为绝对路径）；不是论文记录时抛出 ValueError"""
+        if job['metadata'] is not None:
+            return job['metadata']
+        
+        sidecar = load_sidecar(job['json_file'])
+        if sidecar is None:
+            raise ValueError("JSON中未找到论文记录（没有文件信息）")
+        job['metadata'], job['pdf_paths'] = sidecar
+        return job['metadata']
+    
+    def _route_json_file(self, job: Dict) -> str:
+        """按预检成本选择通道：含扫描件/乱码文本层的论文走OCR通道"""
+        metadata = self._load_json_job(job)
+        job['estimate'] = self.verifier.estimate_paper_cost(metadata, os.path.abspath(job['json_file']))
+        return LANE_OCR if job['estimate']['needs_ocr'] else LANE_CPU
+    
+    def _verify_json_file(self, job: Dict) -> Dict:
+        """调度器任务：验证一条论文记录"""
+        json_file = job['json_file']
+        json_basename = os.path.basename(json_file)
+        self.ui.post_text(f"\n[{job['index'] + 1}/{job['total']}] 处理: {json_basename}\n")
+        
+        metadata = self._load_json_job(job)
         
-        self.progress.stop()
-        self.root.after(0, lambda: messagebox.showinfo("完成", f"验证完成！共处理 {total} 个文件"))
+        # 验证（传递JSON文件路径，用于解析相对路径）
+        return self.verifier.verify_paper(metadata, json_file_path=os.path.abspath(json_file))
+    
+    def display_result(self, result: Dict, json_file: str = ''):
+        """在结果表格中追加一行（可在任意线程调用）"""
+        name = os.path.basename(json_file) if json_file else result.get('metadata', {}).get('title', '')
+        self.ui.post_call(self.result_table.add_result, result, name, json_file)
+    
+    def _reload_result(self, row: Dict) -> Optional[Dict]:
+        """表格中已释放完整结果的行：从结果库读取最近一次结果"""
+        if self.store is None or not row.get('path'):
+            return None
+        return self.store.latest_result(row['path'])
     
-    def display_result(self, result: Dict):
-        """显示单个结果（支持多文件）- 三个板块格式"""
+    def format_result(self, result: Dict) -> str:
+        """单个结果的显示文本（支持多文件）- 三个板块格式"""
         metadata = result['metadata']
         files = result.get('files', [])
         overall_matches = result.get('overall_matches', result.get('matches', {}))
@@ -2352,6 +3452,9 @@ class PaperVerifierGUI:
         output += f"日期: {metadata.get('date', 'N/A')}\n"
         output += f"下载时间: {metadata.get('downloadTimeFormatted', metadata.get('downloadTime', 'N/A'))}\n"
         output += f"文件数量: {len(files)}\n"
+        skipped_files = result.get('skipped_files', [])
+        if skipped_files:
+            output += f"已跳过: {', '.join(f['fileName'] for f in skipped_files)}（结论已确定）\n"
         
         # 收集匹配信息（按类型分组）
         date_matches = [] 
@@ -2407,11 +3510,7 @@ class PaperVerifierGUI:
             
             # 验证PDF元数据中的作者是否有效
             if pdf_author:
-                author_lower = pdf_author.lower()
-                invalid_names = ['direct journals', 'expert systems', 'fields', 'open access',
-                               'international journal', 'elsevier', 'science direct']
-                is_invalid = any(inv in author_lower for inv in invalid_names)
-                if is_invalid or len(pdf_author) < 5:
+                if DISPLAY_AUTHOR_BLACKLIST_RE.search(pdf_author.lower()) or len(pdf_author) < 5:
                     pdf_author = ''
             
             if not pdf_author and file_result.get('pdf_text'):
@@ -2512,8 +3611,7 @@ class PaperVerifierGUI:
             for error in result['errors']:
                 output += f"  - {error}\n"
         
-        self.result_text.insert(tk.END, output)
-        self.result_text.see(tk.END)
+        return output
     
     def export_results(self):
         """导出结果"""
@@ -2523,21 +3621,108 @@ class PaperVerifierGUI:
         
         file_path = filedialog.asksaveasfilename(
             title="保存结果",
-            defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+            defaultextension=".jsonl",
+            filetypes=[("JSON Lines", "*.jsonl"), ("CSV", "*.csv"), ("JSON files", "*.json"), ("All files", "*.*")]
         )
         
         if file_path:
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(self.current_results, f, ensure_ascii=False, indent=2)
-                messagebox.showinfo("成功", "结果已导出")
+                if file_path.lower().endswith('.json'):
+                    with open(file_path, 'w', encoding='utf-8') as f:
+                        json.dump(self.current_results, f, ensure_ascii=False, indent=2)
+                    count = len(self.current_results)
+                else:
+                    count = self._export_retained(file_path)
+                messagebox.showinfo("成功", f"已导出 {count} 条结果")
             except Exception as e:
                 messagebox.showerror("错误", f"导出失败: {str(e)}")
+    
+    def _export_retained(self, file_path: str) -> int:
+        """把本次验证的结果导出为JSONL/CSV；导出全文时从结果库读取完整结果"""
+        full = self.export_full_var.get() and self.store is not None
+        with ResultExporter(file_path, profile=PROFILE_FULL if full else PROFILE_SLIM, store=self.store) as exporter:
+            for record in self.current_results:
+                result = self.store.latest_result(record['json_path']) if full else None
+                if result is not None:
+                    result['cached'] = record['status'] == 'cached'
+                    result['rematched'] = record['status'] == 'rematched'
+                    exporter.write(result, record['json_path'])
+                else:
+                    exporter.write(record)
+            return exporter.rows
+
+
+def rematch_library(json_paths: List[str] = None, db_path: str = DEFAULT_DB_PATH) -> Dict:
+    """用当前JSON中的网页元数据重新匹配结果库中的论文（不重新提取），返回统计
+    
+    PDF已变化或提取规则版本不同的记录标记为需要重新验证，JSON已删除或结果不完整的记录跳过。
+    """
+    store = ResultsStore(db_path)
+    verifier = PDFVerifier()
+    run_id = store.begin_run('rematch', 0)
+    stats = {'total': 0, 'rematched': 0, 'changed': [], 'stale': [], 'skipped': [], 'ms': 0.0}
+    start = time.perf_counter()
+    try:
+        for json_path, pdf_paths, files_key, result, version in store.iter_papers(json_paths):
+            stats['total'] += 1
+            if not os.path.exists(json_path) or not verifier.can_rematch(result):
+                stats['skipped'].append(json_path)
+                continue
+            if version != RESULT_VERSION or store.files_key(pdf_paths) != files_key:
+                stats['stale'].append(json_path)
+                continue
+            sidecar = load_sidecar(json_path)
+            if sidecar is None:
+                stats['skipped'].append(json_path)
+                continue
+            rematched = verifier.rematch_paper(result, sidecar[0])
+            if rematched['overall_matches'] != result.get('overall_matches'):
+                stats['changed'].append((json_path, result.get('overall_matches'), rematched['overall_matches']))
+            store.save_result(run_id, json_path, pdf_paths, rematched, status='rematched')
+            stats['rematched'] += 1
+    finally:
+        stats['ms'] = (time.perf_counter() - start) * 1000
+        store.finish_run(run_id, stats['total'])
+        store.close()
+    return stats
+
+
+def rematch_main(argv: List[str]):
+    """命令行: python python_verifier.py rematch [JSON文件...] [--db 路径] [--verbose]"""
+    import argparse
+    arg_parser = argparse.ArgumentParser(prog='python_verifier.py rematch',
+                                         description='匹配规则修改后，用已保存的提取结果重新匹配结果库中的论文')
+    arg_parser.add_argument('json_paths', nargs='*', help='只重新匹配这些JSON文件（默认全部）')
+    arg_parser.add_argument('--db', default=DEFAULT_DB_PATH, help='结果库路径')
+    arg_parser.add_argument('--verbose', action='store_true', help='输出匹配过程日志')
+    args = arg_parser.parse_args(argv)
+    if not args.verbose:
+        logging.getLogger('PDFVerifier').setLevel(logging.WARNING)
+    
+    stats = rematch_library(args.json_paths or None, args.db)
+    per_paper = stats['ms'] / stats['rematched'] if stats['rematched'] else 0.0
+    print(f"重新匹配 {stats['rematched']}/{stats['total']} 篇论文，耗时 {stats['ms']:.0f}ms（{per_paper:.2f}ms/篇）")
+    for json_path, before, after in stats['changed']:
+        print(f"  结果变化: {json_path}")
+        print(f"    {before} -> {after}")
+    if stats['stale']:
+        print(f"  PDF已变化或提取规则已更新，需要重新验证: {len(stats['stale'])} 篇")
+        for json_path in stats['stale'][:20]:
+            print(f"    {json_path}")
+    if stats['skipped']:
+        print(f"  跳过（JSON不存在或提取结果不完整）: {len(stats['skipped'])} 篇")
 
 
 def main():
     """主函数"""
+    setup_logging()
+    if len(sys.argv) > 1 and sys.argv[1] == 'rematch':
+        rematch_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        from verify_service import serve_main
+        serve_main(sys.argv[2:])
+        return
     root = tk.Tk()
     app = PaperVerifierGUI(root)
     root.mainloop()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+验证结果流式导出模块
+每条论文验证完成后立即写入一行（JSONL 或 CSV）并刷新，不在内存中保留全部结果，导出过程中断也不会丢失已写入的行。
+
+两种内容：
+  slim  匹配结果、网页/PDF提取字段、日期、候选作者标题、阶段耗时、文本长度与哈希（默认，不含全文）
+  full  在 slim 的基础上导出 pdf_text / ocr_text：全文按内容哈希写到导出文件旁的 <导出文件名>.texts/ 目录，
+        行内只记录相对路径（同一文本只写一次）
+
+用法:
+  python result_export.py 导出文件.jsonl|.csv [JSON路径...] [--full] [--db 路径]   # 从结果库导出
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+logger = logging.getLogger('ResultExport')
+
+EXPORT_FORMATS = ('jsonl', 'csv')
+PROFILE_SLIM = 'slim'
+PROFILE_FULL = 'full'
+TEXT_FIELDS = ('pdf_text', 'ocr_text')
+TEXT_DIR_SUFFIX = '.texts'
+
+CSV_COLUMNS = (
+    'json_path', 'status', 'title', 'first_author', 'date',
+    'match_author', 'match_date', 'match_title', 'files', 'file_names',
+    'pdf_titles', 'pdf_authors', 'pdf_dates', 'skipped', 'errors', 'verify_ms', 'json_sha256', 'pdf_sha256',
+    'text_refs',
+)
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def result_status(result: Dict) -> str:
+    if result.get('cached'):
+        return 'cached'
+    if result.get('rematched'):
+        return 'rematched'
+    if 'cancelled' in result.get('errors', []):
+        return 'cancelled'
+    return 'verified'
+
+
+def slim_file_result(file_result: Dict) -> Dict:
+    """单个文件结果去掉全文后的内容（全文只保留长度和哈希）"""
+    file_info = file_result.get('file_info') or {}
+    slim = {
+        'fileName': file_info.get('fileName', ''),
+        'type': file_info.get('type', ''),
+        'filePath': file_info.get('filePath', ''),
+        'matches': file_result.get('matches', {}),
+        'pdf_metadata': file_result.get('pdf_metadata', {}),
+        'extracted_dates': file_result.get('extracted_dates', {}),
+        'pages_parsed': file_result.get('pages_parsed', 0),
+        'preflight': (file_result.get('preflight') or {}).get('kind'),
+        'text_backend': (file_result.get('text_quality') or {}).get('backend'),
+        'timings': file_result.get('timings', {}),
+        'errors': file_result.get('errors', []),
+    }
+    for key in ('candidates', 'ocr_structured'):
+        if file_result.get(key) is not None:
+            slim[key] = file_result[key]
+    for field in TEXT_FIELDS:
+        text = file_result.get(field) or ''
+        slim[f'{field}_chars'] = len(text)
+        slim[f'{field}_sha1'] = text_digest(text) if text else None
+    return slim
+
+
+def slim_result(result: Dict, json_path: str = '') -> Dict:
+    """论文结果的精简记录（不含全文，用于导出和界面保留）"""
+    metadata = result.get('metadata', {})
+    return {
+        'json_path': json_path,
+        'status': result_status(result),
+        'metadata': {key: metadata.get(key) for key in ('title', 'firstAuthor', 'allAuthors', 'date', 'dates')
+                     if metadata.get(key) is not None},
+        'overall_matches': result.get('overall_matches', result.get('matches', {})),
+        'match_policy': result.get('match_policy'),
+        'skipped_files': result.get('skipped_files', []),
+        'timings': result.get('timings', {}),
+        'errors': result.get('errors', []),
+        'files': [slim_file_result(file_result) for file_result in result.get('files', [])],
+    }
+
+
+class ResultExporter:
+    """流式导出器：write() 可在多个工作线程中调用，每行写完即刷新
+
+    store 为 ResultsStore 时导出JSON和PDF的内容哈希（按 (mtime, size) 缓存，刚保存过的结果不会重新读文件）。
+    """
+
+    def __init__(self, path: str, fmt: str = None, profile: str = PROFILE_SLIM, store=None):
+        self.path = os.path.abspath(path)
+        self.fmt = fmt or ('csv' if self.path.lower().endswith('.csv') else 'jsonl')
+        if self.fmt not in EXPORT_FORMATS:
+            raise ValueError(f"不支持的导出格式: {self.fmt}")
+        if profile not in (PROFILE_SLIM, PROFILE_FULL):
+            raise ValueError(f"不支持的导出内容: {profile}")
+        self.profile = profile
+        self.store = store
+        self.text_dir = os.path.splitext(self.path)[0] + TEXT_DIR_SUFFIX if profile == PROFILE_FULL else None
+        self.rows = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._writer = None
+        self._texts_written = set()
+
+    def open(self):
+        self._file = open(self.path, 'w', encoding='utf-8-sig' if self.fmt == 'csv' else 'utf-8', newline='')
+        if self.fmt == 'csv':
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(CSV_COLUMNS)
+        if self.text_dir:
+            os.makedirs(self.text_dir, exist_ok=True)
+        return self
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        logger.info(f"[导出] 已写入 {self.rows} 条: {self.path}")
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    # ------------------------------------------------------------------
+
+    def write(self, result: Dict, json_path: str = ''):
+        """写入一条验证结果（完整结果或 slim_result 的输出）"""
+        record = result if 'status' in result and 'json_path' in result else slim_result(result, json_path)
+        if self.profile == PROFILE_FULL:
+            self._attach_texts(record, result)
+        if self.store is not None:
+            self._attach_hashes(record)
+
+        if self.fmt == 'jsonl':
+            line = json.dumps(record, ensure_ascii=False, default=str) + '\n'
+        with self._lock:
+            if self._file is None:
+                raise ValueError("导出文件未打开")
+            if self.fmt == 'jsonl':
+                self._file.write(line)
+            else:
+                self._writer.writerow(self._csv_row(record))
+            self._file.flush()
+            self.rows += 1
+
+    def _attach_texts(self, record: Dict, result: Dict):
+        """全文写到 texts 目录（按内容哈希命名），记录中保存相对导出文件的路径"""
+        for slim_file, file_result in zip(record['files'], result.get('files', [])):
+            for field in TEXT_FIELDS:
+                text = file_result.get(field) or ''
+                if not text:
+                    continue
+                digest = slim_file.get(f'{field}_sha1') or text_digest(text)
+                name = f"{digest}.txt"
+                slim_file[f'{field}_ref'] = f"{os.path.basename(self.text_dir)}/{name}"
+                with self._lock:
+                    if digest in self._texts_written:
+                        continue
+                    self._texts_written.add(digest)
+                target = os.path.join(self.text_dir, name)
+                if not os.path.exists(target):
+                    with open(target, 'w', encoding='utf-8') as f:
+                        f.write(text)
+
+    def _attach_hashes(self, record: Dict):
+        try:
+            if record.get('json_path'):
+                record['json_sha256'] = self.store.file_digest(os.path.abspath(record['json_path']))
+            for slim_file in record['files']:
+                if slim_file.get('filePath'):
+                    slim_file['sha256'] = self.store.file_digest(slim_file['filePath'])
+        except Exception as e:
+            logger.warning(f"[导出] 计算哈希失败: {record.get('json_path')}: {e}")
+
+    def _csv_row(self, record: Dict) -> List:
+        metadata = record.get('metadata', {})
+        matches = record.get('overall_matches', {})
+        files = record.get('files', [])
+        errors = list(record.get('errors', []))
+        for slim_file in files:
+            errors.extend(f"{slim_file.get('fileName')}: {error}" for error in slim_file.get('errors', []))
+        return [
+            record.get('json_path', ''),
+            record.get('status', ''),
+            metadata.get('title', ''),
+            metadata.get('firstAuthor', ''),
+            metadata.get('date', ''),
+            int(bool(matches.get('author'))),
+            int(bool(matches.get('date'))),
+            int(bool(matches.get('title'))),
+            len(files),
+            '; '.join(slim_file.get('fileName', '') for slim_file in files),
+            '; '.join((slim_file.get('pdf_metadata') or {}).get('title', '') for slim_file in files),
+            '; '.join((slim_file.get('pdf_metadata') or {}).get('firstAuthor', '') for slim_file in files),
+            '; '.join((slim_file.get('pdf_metadata') or {}).get('date', '') for slim_file in files),
+            '; '.join(skipped.get('fileName', '') for skipped in record.get('skipped_files', [])),
+            '; '.join(str(error) for error in errors),
+            (record.get('timings') or {}).get('verify_paper', {}).get('ms', ''),
+            record.get('json_sha256') or '',
+            '; '.join(slim_file.get('sha256') or '' for slim_file in files),
+            '; '.join(slim_file[f'{field}_ref'] for slim_file in files for field in TEXT_FIELDS
+                      if slim_file.get(f'{field}_ref')),
+        ]
+
+
+def export_store(path: str, json_paths: List[str] = None, profile: str = PROFILE_SLIM, db_path: str = None) -> int:
+    """把结果库中的论文（默认全部）流式导出，返回写入的条数"""
+    from results_store import ResultsStore, DEFAULT_DB_PATH
+
+    store = ResultsStore(db_path or DEFAULT_DB_PATH)
+    try:
+        with ResultExporter(path, profile=profile, store=store) as exporter:
+            for json_path, _, _, result, _ in store.iter_papers(json_paths):
+                exporter.write(result, json_path)
+            return exporter.rows
+    finally:
+        store.close()
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='从结果库流式导出验证结果')
+    arg_parser.add_argument('output', help='导出文件（.jsonl 或 .csv）')
+    arg_parser.add_argument('json_paths', nargs='*', help='只导出这些JSON文件的结果')
+    arg_parser.add_argument('--full', action='store_true', help='同时导出PDF文本和OCR文本（写到 .texts 目录）')
+    arg_parser.add_argument('--db', default=None, help='结果库路径')
+    args = arg_parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(name)s: %(message)s')
+    count = export_store(args.output, args.json_paths or None, PROFILE_FULL if args.full else PROFILE_SLIM, args.db)
+    print(f"已导出 {count} 条: {args.output}")
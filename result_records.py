@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+验证结果记录
+单个文件和整条论文的验证结果在验证过程中用带 __slots__ 的数据类保存（字段固定，不再临时往字典里加键），
+对外（GUI、结果库、导出、隔离子进程的管道）仍然使用原来的字典格式：to_dict() / from_dict() 在两者之间转换，
+to_dict() 输出的键和顺序与原先的字典完全一致。
+
+  FileResult      单个文件：提取的文本、元数据、日期、候选作者/标题、匹配结果、计时和错误
+  PaperResult     整条论文记录：各文件结果、整体匹配结果、跳过的文件
+  ExtractedDates  从PDF/OCR中提取的日期（字典中的键为 received / accepted / published / revised / availableOnline / other）
+  Matches         作者、日期、标题三项匹配结果
+
+from_dict() 不认识的键保存在 extra 中，to_dict() 原样写回（例如 cached / rematched 标记）。
+"""
+
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Python 3.10 起 dataclass 才支持 slots=True；更早的版本退化为普通数据类（行为相同，只是不省内存）
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+NOT_MENTIONED = 'Not mentioned'  # OCR结构化结果中表示缺失的值
+
+
+@dataclass(**_SLOTS)
+class Matches:
+    """作者、日期、标题三项匹配结果"""
+    author: bool = False
+    date: bool = False
+    title: bool = False
+
+    def all(self) -> bool:
+        return self.author and self.date and self.title
+
+    def update(self, other: 'Matches'):
+        """合并另一组结果（任一方匹配即匹配）"""
+        self.author = self.author or other.author
+        self.date = self.date or other.date
+        self.title = self.title or other.title
+
+    def to_dict(self) -> Dict:
+        return {'author': self.author, 'date': self.date, 'title': self.title}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> 'Matches':
+        data = data or {}
+        return cls(bool(data.get('author')), bool(data.get('date')), bool(data.get('title')))
+
+
+@dataclass(**_SLOTS)
+class ExtractedDates:
+    """提取的日期；available_online 在字典中为 availableOnline"""
+    received: Optional[str] = None
+    accepted: Optional[str] = None
+    published: Optional[str] = None
+    revised: Optional[str] = None
+    available_online: Optional[str] = None
+    other: List[str] = field(default_factory=list)
+
+    def any(self) -> bool:
+        return bool(self.received or self.accepted or self.published or self.revised
+                    or self.available_online or self.other)
+
+    def fill_from_structured(self, dates: Dict):
+        """用OCR结构化结果中的日期填充（'Not mentioned' 视为缺失；received_in_revised 优先于 revised）"""
+        def value(key):
+            found = dates.get(key)
+            return found if found and found != NOT_MENTIONED else None
+
+        if value('received'):
+            self.received = value('received')
+        revised = value('received_in_revised') or value('revised')
+        if revised:
+            self.revised = revised
+        if value('accepted'):
+            self.accepted = value('accepted')
+        if value('available_online'):
+            self.available_online = value('available_online')
+
+    def merge_missing(self, extracted: Dict) -> List[Tuple[str, object]]:
+        """只填充空值（extracted 为 extract_dates_from_text 的字典），返回填充的 (键, 值)"""
+        filled = []
+        for key, current in self.to_dict().items():
+            if not current and extracted.get(key):
+                setattr(self, 'available_online' if key == 'availableOnline' else key, extracted[key])
+                filled.append((key, extracted[key]))
+        return filled
+
+    def to_dict(self) -> Dict:
+        return {
+            'received': self.received,
+            'accepted': self.accepted,
+            'published': self.published,
+            'revised': self.revised,
+            'availableOnline': self.available_online,
+            'other': self.other,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ExtractedDates':
+        return cls(data.get('received'), data.get('accepted'), data.get('published'), data.get('revised'),
+                   data.get('availableOnline'), list(data.get('other') or []))
+
+
+@dataclass(**_SLOTS)
+class FileResult:
+    """单个文件的验证结果
+
+    extracted_dates 为 None 表示还没有提取日期（字典中为 {}）；ocr_is_structured 为 None 表示没有做OCR，
+    此时字典中没有 ocr_structured / ocr_is_structured 两个键；candidates 为 None 表示没有完成提取，
+    字典中没有 candidates 键（can_rematch 以此判断能否只重新匹配）。
+    """
+    file_info: Dict
+    pdf_text: str = ''
+    pdf_metadata: Dict = field(default_factory=dict)
+    ocr_text: str = ''
+    pages_parsed: int = 0
+    preflight: Dict = field(default_factory=dict)
+    text_quality: Dict = field(default_factory=dict)
+    extracted_dates: Optional[ExtractedDates] = None
+    matches: Matches = field(default_factory=Matches)
+    timings: Dict = field(default_factory=dict)
+    errors: List = field(default_factory=list)
+    ocr_structured: Optional[Dict] = None
+    ocr_is_structured: Optional[bool] = None
+    candidates: Optional[Dict] = None
+    extra: Optional[Dict] = None
+
+    def to_dict(self) -> Dict:
+        data = {
+            'file_info': self.file_info,
+            'pdf_text': self.pdf_text,
+            'pdf_metadata': self.pdf_metadata,
+            'ocr_text': self.ocr_text,
+            'pages_parsed': self.pages_parsed,
+            'preflight': self.preflight,
+            'text_quality': self.text_quality,
+            'extracted_dates': self.extracted_dates.to_dict() if self.extracted_dates is not None else {},
+            'matches': self.matches.to_dict(),
+            'timings': self.timings,
+            'errors': self.errors,
+        }
+        if self.ocr_is_structured is not None:
+            data['ocr_structured'] = self.ocr_structured
+            data['ocr_is_structured'] = self.ocr_is_structured
+        if self.candidates is not None:
+            data['candidates'] = self.candidates
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'FileResult':
+        data = dict(data)
+        dates = data.pop('extracted_dates', None)
+        record = cls(
+            file_info=data.pop('file_info', {}),
+            pdf_text=data.pop('pdf_text', ''),
+            pdf_metadata=data.pop('pdf_metadata', {}),
+            ocr_text=data.pop('ocr_text', ''),
+            pages_parsed=data.pop('pages_parsed', 0),
+            preflight=data.pop('preflight', {}),
+            text_quality=data.pop('text_quality', {}),
+            extracted_dates=ExtractedDates.from_dict(dates) if dates else None,
+            matches=Matches.from_dict(data.pop('matches', None)),
+            timings=data.pop('timings', {}),
+            errors=data.pop('errors', []),
+            candidates=data.pop('candidates', None),
+        )
+        if 'ocr_is_structured' in data or 'ocr_structured' in data:
+            record.ocr_structured = data.pop('ocr_structured', None)
+            record.ocr_is_structured = bool(data.pop('ocr_is_structured', False))
+        record.extra = data or None
+        return record
+
+
+@dataclass(**_SLOTS)
+class PaperResult:
+    """整条论文记录的验证结果（overall_matches 为 None 表示旧格式结果中没有该键）"""
+    metadata: Dict
+    files: List[FileResult] = field(default_factory=list)
+    overall_matches: Optional[Matches] = field(default_factory=Matches)
+    skipped_files: List[Dict] = field(default_factory=list)
+    match_policy: Optional[str] = None
+    timings: Dict = field(default_factory=dict)
+    errors: List = field(default_factory=list)
+    extra: Optional[Dict] = None
+
+    def to_dict(self) -> Dict:
+        data = {
+            'metadata': self.metadata,
+            'files': [file_result.to_dict() for file_result in self.files],
+        }
+        if self.overall_matches is not None:
+            data['overall_matches'] = self.overall_matches.to_dict()
+        data['skipped_files'] = self.skipped_files
+        if self.match_policy is not None:
+            data['match_policy'] = self.match_policy
+        data['timings'] = self.timings
+        data['errors'] = self.errors
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'PaperResult':
+        data = dict(data)
+        overall = data.pop('overall_matches', None)
+        record = cls(
+            metadata=data.pop('metadata', {}),
+            files=[FileResult.from_dict(file_result) for file_result in data.pop('files', None) or []],
+            overall_matches=Matches.from_dict(overall) if overall is not None else None,
+            skipped_files=data.pop('skipped_files', []),
+            match_policy=data.pop('match_policy', None),
+            timings=data.pop('timings', {}),
+            errors=data.pop('errors', []),
+        )
+        record.extra = data or None
+        return record
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+验证结果表格
+每条论文一行（ttk.Treeview），代替不断追加格式化文本的 ScrolledText：
+- 点击列标题排序，再次点击反向；按匹配状态筛选，按名称/标题/作者搜索
+- 详情在选中某行时才格式化显示（详情区只保存当前一条）
+- 只保留最近 MAX_DETAIL_ROWS 条完整结果（以 PaperResult 保存，比嵌套字典省内存），更早的行选中时通过 reload_result 重新读取（例如从结果库）
+
+所有方法都必须在Tk线程调用；工作线程经由 UIBridge.post_call 提交。
+"""
+
+import bisect
+import logging
+import tkinter as tk
+from collections import OrderedDict
+from tkinter import ttk, scrolledtext
+from typing import Callable, Dict, List, Optional
+
+from result_records import PaperResult
+
+logger = logging.getLogger('ResultTable')
+
+MAX_DETAIL_ROWS = 500  # 保留完整结果（用于详情）的行数
+SEARCH_DELAY_MS = 250  # 搜索框停止输入后多久刷新
+
+# (列名, 标题, 宽度, 对齐)
+COLUMNS = (
+    ('index', '#', 50, tk.E),
+    ('name', '名称', 200, tk.W),
+    ('title', '网页标题', 300, tk.W),
+    ('author', '第一作者', 120, tk.W),
+    ('m_author', '作者', 50, tk.CENTER),
+    ('m_date', '日期', 50, tk.CENTER),
+    ('m_title', '标题', 50, tk.CENTER),
+    ('files', '文件数', 60, tk.E),
+    ('status', '状态', 80, tk.W),
+)
+STRETCH_COLUMNS = ('name', 'title')
+
+STATUS_VERIFIED = '已验证'
+STATUS_CACHED = '未变化'
+STATUS_REMATCHED = '重新匹配'
+STATUS_FAILED = '出错'
+
+FILTERS = OrderedDict([
+    ('全部', None),
+    ('全部匹配', lambda row: row['m_author'] and row['m_date'] and row['m_title']),
+    ('有未匹配', lambda row: not (row['m_author'] and row['m_date'] and row['m_title'])),
+    ('作者未匹配', lambda row: not row['m_author']),
+    ('日期未匹配', lambda row: not row['m_date']),
+    ('标题未匹配', lambda row: not row['m_title']),
+    ('出错', lambda row: row['status'] == STATUS_FAILED or row['errors'] > 0),
+])
+
+
+def summarize_result(result: Dict, index: int, name: str, path: str = '') -> Dict:
+    """表格中一行的数据（只含显示、排序和筛选需要的字段）"""
+    metadata = result.get('metadata', {})
+    matches = result.get('overall_matches', result.get('matches', {}))
+    files = result.get('files', [])
+    if result.get('cached'):
+        status = STATUS_CACHED
+    elif result.get('rematched'):
+        status = STATUS_REMATCHED
+    else:
+        status = STATUS_VERIFIED
+    return {
+        'index': index,
+        'name': name,
+        'path': path,
+        'title': metadata.get('title') or '',
+        'author': metadata.get('firstAuthor') or '',
+        'm_author': bool(matches.get('author')),
+        'm_date': bool(matches.get('date')),
+        'm_title': bool(matches.get('title')),
+        'files': len(files),
+        'status': status,
+        'errors': len(result.get('errors', [])) + sum(1 for f in files if f.get('errors')),
+    }
+
+
+def _sort_value(row: Dict, column: str):
+    value = row[column]
+    if isinstance(value, str):
+        return value.lower()
+    return value
+
+
+class ResultTable:
+    """结果表格组件：self.frame 由调用方布局
+
+    format_detail(result) 返回选中行的详情文本；reload_result(row) 在完整结果已释放时重新读取，
+    返回 None 表示无法读取。
+    """
+
+    def __init__(self, parent, format_detail: Callable[[Dict], str],
+                 reload_result: Optional[Callable[[Dict], Optional[Dict]]] = None,
+                 max_detail_rows: int = MAX_DETAIL_ROWS, tree_height: int = 12, detail_height: int = 10):
+        self.format_detail = format_detail
+        self.reload_result = reload_result
+        self.max_detail_rows = max_detail_rows
+
+        self.rows: List[Dict] = []
+        self.results: 'OrderedDict[int, PaperResult]' = OrderedDict()  # 行号 -> 完整结果（最近 max_detail_rows 条）
+        self.sort_column = 'index'
+        self.sort_reverse = False
+        self._visible_keys: List = []  # 当前显示行的排序键（升序）
+        self._matched = 0  # 三项都匹配的行数
+        self._search_after = None
+
+        self.frame = ttk.Frame(parent)
+
+        # 筛选栏
+        bar = ttk.Frame(self.frame)
+        bar.pack(fill=tk.X, pady=(0, 5))
+        ttk.Label(bar, text="显示:").pack(side=tk.LEFT)
+        self.filter_var = tk.StringVar(value='全部')
+        filter_box = ttk.Combobox(bar, textvariable=self.filter_var, values=list(FILTERS),
+                                  state='readonly', width=10)
+        filter_box.pack(side=tk.LEFT, padx=5)
+        filter_box.bind('<<ComboboxSelected>>', lambda event: self.refresh())
+        ttk.Label(bar, text="搜索:").pack(side=tk.LEFT, padx=(10, 0))
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add('write', self._on_search_changed)
+        ttk.Entry(bar, textvariable=self.search_var, width=30).pack(side=tk.LEFT, padx=5)
+        self.count_label = ttk.Label(bar, text="")
+        self.count_label.pack(side=tk.RIGHT)
+
+        paned = ttk.PanedWindow(self.frame, orient=tk.VERTICAL)
+        paned.pack(fill=tk.BOTH, expand=True)
+
+        # 表格
+        tree_frame = ttk.Frame(paned)
+        self.tree = ttk.Treeview(tree_frame, columns=[column[0] for column in COLUMNS], show='headings',
+                                 selectmode='browse', height=tree_height)
+        for key, label, width, anchor in COLUMNS:
+            self.tree.heading(key, text=label, command=lambda k=key: self.sort_by(k))
+            self.tree.column(key, width=width, anchor=anchor, stretch=key in STRETCH_COLUMNS)
+        self.tree.tag_configure('mismatch', foreground='#b00020')
+        self.tree.tag_configure('failed', foreground='#b00020', background='#fde8e8')
+        tree_scroll = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=tree_scroll.set)
+        tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        paned.add(tree_frame, weight=3)
+
+        # 详情
+        self.detail = scrolledtext.ScrolledText(paned, height=detail_height, wrap=tk.WORD)
+        paned.add(self.detail, weight=2)
+
+    # ------------------------------------------------------------------
+    # 数据
+    # ------------------------------------------------------------------
+
+    def add_result(self, result: Dict, name: str, path: str = ''):
+        """追加一条验证结果"""
+        row = summarize_result(result, len(self.rows) + 1, name, path)
+        self.results[row['index']] = PaperResult.from_dict(result)
+        while len(self.results) > self.max_detail_rows:
+            self.results.popitem(last=False)
+        self._add_row(row)
+
+    def add_error(self, name: str, message: str, path: str = ''):
+        """追加一条验证失败的记录"""
+        row = {'index': len(self.rows) + 1, 'name': name, 'path': path, 'title': message, 'author': '',
+               'm_author': False, 'm_date': False, 'm_title': False, 'files': 0,
+               'status': STATUS_FAILED, 'errors': 1}
+        self._add_row(row)
+
+    def clear(self):
+        self.rows = []
+        self._matched = 0
+        self.results.clear()
+        self._visible_keys = []
+        self.tree.delete(*self.tree.get_children())
+        self.detail.delete('1.0', tk.END)
+        self._update_count()
+
+    def _add_row(self, row: Dict):
+        self.rows.append(row)
+        if row['m_author'] and row['m_date'] and row['m_title']:
+            self._matched += 1
+        if self._matches_filter(row):
+            key = self._sort_key(row)
+            position = bisect.bisect(self._visible_keys, key)
+            self._visible_keys.insert(position, key)
+            index = len(self._visible_keys) - 1 - position if self.sort_reverse else position
+            self._insert_item(row, index)
+        self._update_count()
+
+    # ------------------------------------------------------------------
+    # 显示
+    # ------------------------------------------------------------------
+
+    def _insert_item(self, row: Dict, index):
+        values = [row[key] for key, _, _, _ in COLUMNS]
+        for position, (key, _, _, _) in enumerate(COLUMNS):
+            if key.startswith('m_'):
+                values[position] = '✓' if row[key] else '✗'
+        if row['status'] == STATUS_FAILED:
+            tags = ('failed',)
+        elif not (row['m_author'] and row['m_date'] and row['m_title']):
+            tags = ('mismatch',)
+        else:
+            tags = ()
+        self.tree.insert('', index, iid=str(row['index']), values=values, tags=tags)
+
+    def _sort_key(self, row: Dict):
+        return _sort_value(row, self.sort_column), row['index']
+
+    def _matches_filter(self, row: Dict) -> bool:
+        predicate = FILTERS.get(self.filter_var.get())
+        if predicate is not None and not predicate(row):
+            return False
+        search = self.search_var.get().strip().lower()
+        if search:
+            return search in row['name'].lower() or search in row['title'].lower() or search in row['author'].lower()
+        return True
+
+    def refresh(self):
+        """按当前筛选和排序重建显示的行"""
+        self.tree.delete(*self.tree.get_children())
+        visible = sorted((row for row in self.rows if self._matches_filter(row)), key=self._sort_key)
+        self._visible_keys = [self._sort_key(row) for row in visible]
+        if self.sort_reverse:
+            visible.reverse()
+        for row in visible:
+            self._insert_item(row, tk.END)
+        self._update_count()
+
+    def sort_by(self, column: str):
+        if column == self.sort_column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column = column
+            self.sort_reverse = False
+        for key, label, _, _ in COLUMNS:
+            arrow = (' ▼' if self.sort_reverse else ' ▲') if key == column else ''
+            self.tree.heading(key, text=label + arrow)
+        self.refresh()
+
+    def _on_search_changed(self, *args):
+        if self._search_after is not None:
+            self.frame.after_cancel(self._search_after)
+        self._search_after = self.frame.after(SEARCH_DELAY_MS, self._apply_search)
+
+    def _apply_search(self):
+        self._search_after = None
+        self.refresh()
+
+    def _update_count(self):
+        self.count_label.config(
+            text=f"共 {len(self.rows)} 条，显示 {len(self._visible_keys)} 条，全部匹配 {self._matched} 条")
+
+    def _on_select(self, event=None):
+        selection = self.tree.selection()
+        if not selection:
+            return
+        row = self.rows[int(selection[0]) - 1]
+        record = self.results.get(row['index'])
+        result = record.to_dict() if record is not None else None
+        if result is None and row['status'] != STATUS_FAILED and self.reload_result is not None:
+            try:
+                result = self.reload_result(row)
+            except Exception as e:
+                logger.warning(f"[结果表格] 重新读取结果失败: {row['path'] or row['name']}: {e}")
+        if result is not None:
+            try:
+                text = self.format_detail(result)
+            except Exception as e:
+                logger.error(f"[结果表格] 格式化详情出错: {e}", exc_info=True)
+                text = f"显示结果时出错: {e}\n"
+        elif row['status'] == STATUS_FAILED:
+            text = f"{row['name']}\n{row['title']}\n"
+        else:
+            text = f"{row['name']}\n（详情已释放，只保留最近 {self.max_detail_rows} 条的完整结果）\n"
+        self.detail.delete('1.0', tk.END)
+        self.detail.insert(tk.END, text)
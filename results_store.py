@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+验证结果存储模块（SQLite）
+按JSON路径保存最近一次验证结果，并记录JSON和所引用PDF的内容哈希；
+再次验证同一目录时，JSON和PDF都未变化的论文直接复用已有结果，只重新验证新增或修改的记录。
+
+文件哈希先比较 (mtime_ns, size)，未变化时不读取文件内容，大库重复运行只需 stat。
+没有完成提取的结果（取消、超时、OCR调用失败等）不保存；提取规则版本（RESULT_VERSION）不同的记录不复用。
+OCR不可用（未安装poppler、缺少OCR配置等）的结果照常保存并标记，配置好OCR后用 retry-ocr 清除标记重新验证。
+每次批量运行及其中每条记录的结果写入 runs / history 表，可按路径或运行查询。
+
+用法:
+  python results_store.py runs [--limit 20]
+  python results_store.py history [JSON路径] [--limit 50]
+  python results_store.py show JSON路径
+  python results_store.py retry-ocr [JSON路径...]
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from verify_metrics import observe_cache
+
+logger = logging.getLogger('ResultsStore')
+
+DEFAULT_DB_PATH = os.environ.get(
+    'VERIFIER_RESULTS_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'verify_results.db'))
+HASH_CHUNK_SIZE = 1024 * 1024
+# 提取/匹配规则版本：修改后旧结果不能直接复用时递增，版本不同的记录按未命中处理（重新验证）
+RESULT_VERSION = 2
+# 这些文件错误表示本次没有完成、重试可能成功，结果不保存，下次运行重新验证
+RETRY_FILE_ERRORS = ('cancelled', 'timeout', 'worker_crashed', 'memory_limit', 'ocr_failed')
+# 只重新匹配需要每个文件的完整提取结果：另外排除短路策略跳过的文件和OCR不可用的文件
+INCOMPLETE_FILE_ERRORS = RETRY_FILE_ERRORS + ('skipped', 'ocr_unavailable')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_hashes (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS papers (
+    json_path TEXT PRIMARY KEY,
+    json_hash TEXT NOT NULL,
+    pdf_paths TEXT NOT NULL,
+    files_key TEXT NOT NULL,
+    title TEXT,
+    first_author TEXT,
+    match_author INTEGER,
+    match_date INTEGER,
+    match_title INTEGER,
+    result_json TEXT NOT NULL,
+    verified_at TEXT NOT NULL,
+    run_id INTEGER,
+    result_version INTEGER DEFAULT 0,
+    ocr_unavailable INTEGER DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    total INTEGER DEFAULT 0,
+    verified INTEGER DEFAULT 0,
+    cached INTEGER DEFAULT 0,
+    rematched INTEGER DEFAULT 0,
+    failed INTEGER DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL,
+    json_path TEXT NOT NULL,
+    status TEXT NOT NULL,
+    match_author INTEGER,
+    match_date INTEGER,
+    match_title INTEGER,
+    files_key TEXT,
+    recorded_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_history_path ON history(json_path);
+CREATE INDEX IF NOT EXISTS idx_history_run ON history(run_id);
+"""
+
+
+def _now() -> str:
+    return time.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _file_errors(result: Dict, codes) -> List[str]:
+    """结果（论文级和各文件）中属于 codes 的错误"""
+    errors = [error for error in result.get('errors') or [] if error in codes]
+    for file_result in result.get('files') or []:
+        errors.extend(error for error in file_result.get('errors') or [] if error in codes)
+    return errors
+
+
+def incomplete_errors(result: Dict) -> List[str]:
+    """结果中需要重试的错误（见 RETRY_FILE_ERRORS）"""
+    return _file_errors(result, RETRY_FILE_ERRORS)
+
+
+def is_result_complete(result: Dict) -> bool:
+    """没有需要重试的文件时结果才能保存到结果库并复用（短路跳过的文件和OCR不可用不影响）"""
+    return not incomplete_errors(result)
+
+
+class ResultsStore:
+    """验证结果库；同一连接在多个工作线程间共享，操作由锁串行化"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.executescript(SCHEMA)
+            # 旧库的 runs 表没有 rematched 列，papers 表没有 result_version 列（旧记录按版本0处理，不再复用）
+            columns = {row['name'] for row in self._conn.execute('PRAGMA table_info(runs)')}
+            if 'rematched' not in columns:
+                self._conn.execute('ALTER TABLE runs ADD COLUMN rematched INTEGER DEFAULT 0')
+            columns = {row['name'] for row in self._conn.execute('PRAGMA table_info(papers)')}
+            if 'result_version' not in columns:
+                self._conn.execute('ALTER TABLE papers ADD COLUMN result_version INTEGER DEFAULT 0')
+            if 'ocr_unavailable' not in columns:
+                self._conn.execute('ALTER TABLE papers ADD COLUMN ocr_unavailable INTEGER DEFAULT 0')
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # 内容哈希
+    # ------------------------------------------------------------------
+
+    def file_digest(self, path: str) -> Optional[str]:
+        """文件内容的sha256；(mtime_ns, size) 与上次相同时直接返回缓存值，文件不存在返回 None"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        with self._lock:
+            row = self._conn.execute('SELECT mtime_ns, size, sha256 FROM file_hashes WHERE path = ?',
+                                     (path,)).fetchone()
+        if row is not None and row['mtime_ns'] == stat.st_mtime_ns and row['size'] == stat.st_size:
+            observe_cache('file_hash', True)
+            return row['sha256']
+        observe_cache('file_hash', False)
+
+        digest = hashlib.sha256()
+        try:
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+        except OSError as e:
+            logger.warning(f"[结果库] 读取文件失败: {path}: {e}")
+            return None
+        sha256 = digest.hexdigest()
+        with self._lock, self._conn:
+            self._conn.execute('INSERT OR REPLACE INTO file_hashes (path, mtime_ns, size, sha256) VALUES (?, ?, ?, ?)',
+                               (path, stat.st_mtime_ns, stat.st_size, sha256))
+        return sha256
+
+    def files_key(self, pdf_paths: List[str]) -> str:
+        """所引用PDF的组合哈希（路径顺序有关，缺失的文件记为空）"""
+        combined = hashlib.sha256()
+        for path in pdf_paths:
+            combined.update(f"{path}\0{self.file_digest(path) or ''}\n".encode('utf-8'))
+        return combined.hexdigest()
+
+    # ------------------------------------------------------------------
+    # 增量验证
+    # ------------------------------------------------------------------
+
+    def lookup_unchanged(self, json_path: str) -> Optional[Dict]:
+        """JSON和其引用的PDF都未变化、规则版本相同且结果完整时返回上次的验证结果，否则返回 None"""
+        json_path = os.path.abspath(json_path)
+        with self._lock:
+            row = self._conn.execute('SELECT json_hash, pdf_paths, files_key, result_json, result_version '
+                                     'FROM papers WHERE json_path = ?', (json_path,)).fetchone()
+        hit = (row is not None and row['result_version'] == RESULT_VERSION
+               and self.file_digest(json_path) == row['json_hash']
+               and self.files_key(json.loads(row['pdf_paths'])) == row['files_key'])
+        result = json.loads(row['result_json']) if hit else None
+        if result is not None and not is_result_complete(result):
+            result = None
+        observe_cache('results', result is not None)
+        return result
+
+    def lookup_facts(self, json_path: str, pdf_paths: List[str]) -> Optional[Dict]:
+        """所引用的PDF（路径和内容）都未变化时返回上次的结果（含各文件的提取结果），JSON本身可以已修改"""
+        json_path = os.path.abspath(json_path)
+        with self._lock:
+            row = self._conn.execute('SELECT files_key, result_json, result_version FROM papers WHERE json_path = ?',
+                                     (json_path,)).fetchone()
+        hit = (row is not None and row['result_version'] == RESULT_VERSION
+               and self.files_key(pdf_paths) == row['files_key'])
+        observe_cache('facts', hit)
+        return json.loads(row['result_json']) if hit else None
+
+    def iter_papers(self, json_paths: List[str] = None):
+        """遍历库中的论文记录，产出 (json_path, pdf_paths, files_key, result, result_version)"""
+        with self._lock:
+            if json_paths:
+                paths = [os.path.abspath(path) for path in json_paths]
+                rows = self._conn.execute(
+                    f"SELECT json_path FROM papers WHERE json_path IN ({','.join('?' * len(paths))})", paths).fetchall()
+            else:
+                rows = self._conn.execute('SELECT json_path FROM papers ORDER BY json_path').fetchall()
+        for path_row in rows:
+            with self._lock:
+                row = self._conn.execute('SELECT pdf_paths, files_key, result_json, result_version FROM papers '
+                                         'WHERE json_path = ?', (path_row['json_path'],)).fetchone()
+            if row is not None:
+                yield (path_row['json_path'], json.loads(row['pdf_paths']), row['files_key'],
+                       json.loads(row['result_json']), row['result_version'])
+
+    def save_result(self, run_id: Optional[int], json_path: str, pdf_paths: List[str], result: Dict,
+                    status: str = 'verified') -> bool:
+        """保存一条论文的最新验证结果，并写入运行历史（status 为 'verified' 或 'rematched'）
+        
+        有需要重试的文件（见 RETRY_FILE_ERRORS）时不保存，返回 False，下次运行重新验证；
+        OCR不可用的结果照常保存，并标记 ocr_unavailable（clear_ocr_unavailable 清除后重新验证）
+        """
+        json_path = os.path.abspath(json_path)
+        incomplete = incomplete_errors(result)
+        if incomplete:
+            logger.info(f"[结果库] 结果不完整（{', '.join(sorted(set(incomplete)))}），不保存: {json_path}")
+            return False
+        json_hash = self.file_digest(json_path) or ''
+        files_key = self.files_key(pdf_paths)
+        metadata = result.get('metadata', {})
+        matches = result.get('overall_matches', {})
+        flags = (int(bool(matches.get('author'))), int(bool(matches.get('date'))), int(bool(matches.get('title'))))
+        result_json = json.dumps(result, ensure_ascii=False, default=str)
+        ocr_unavailable = int(bool(_file_errors(result, ('ocr_unavailable',))))
+        now = _now()
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO papers (json_path, json_hash, pdf_paths, files_key, title, first_author, '
+                'match_author, match_date, match_title, result_json, verified_at, run_id, result_version, '
+                'ocr_unavailable) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (json_path, json_hash, json.dumps(pdf_paths, ensure_ascii=False), files_key,
+                 metadata.get('title', ''), metadata.get('firstAuthor', ''), *flags, result_json, now, run_id,
+                 RESULT_VERSION, ocr_unavailable))
+            if run_id is not None:
+                self._insert_history(run_id, json_path, status, flags, files_key, now)
+        return True
+
+    def clear_ocr_unavailable(self, json_paths: List[str] = None) -> int:
+        """清除OCR不可用标记：这些记录（默认全部）下次运行时重新验证，返回清除的条数"""
+        query = 'UPDATE papers SET result_version = 0, ocr_unavailable = 0 WHERE ocr_unavailable = 1'
+        params = []
+        if json_paths:
+            params = [os.path.abspath(path) for path in json_paths]
+            query += f" AND json_path IN ({','.join('?' * len(params))})"
+        with self._lock, self._conn:
+            return self._conn.execute(query, params).rowcount
+
+    def record_cached(self, run_id: Optional[int], json_path: str, result: Dict):
+        """记录本次运行中复用了已有结果的论文"""
+        if run_id is None:
+            return
+        matches = result.get('overall_matches', {})
+        flags = (int(bool(matches.get('author'))), int(bool(matches.get('date'))), int(bool(matches.get('title'))))
+        with self._lock, self._conn:
+            self._insert_history(run_id, os.path.abspath(json_path), 'cached', flags, None, _now())
+
+    def record_failed(self, run_id: Optional[int], json_path: str):
+        if run_id is None:
+            return
+        with self._lock, self._conn:
+            self._insert_history(run_id, os.path.abspath(json_path), 'failed', (None, None, None), None, _now())
+
+    def _insert_history(self, run_id: int, json_path: str, status: str, flags, files_key, now: str):
+        self._conn.execute(
+            'INSERT INTO history (run_id, json_path, status, match_author, match_date, match_title, files_key, recorded_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', (run_id, json_path, status, *flags, files_key, now))
+        self._conn.execute(f'UPDATE runs SET {status} = {status} + 1 WHERE id = ?', (run_id,))
+
+    # ------------------------------------------------------------------
+    # 运行记录与查询
+    # ------------------------------------------------------------------
+
+    def begin_run(self, source: str, total: int) -> int:
+        with self._lock, self._conn:
+            cursor = self._conn.execute('INSERT INTO runs (source, started_at, total) VALUES (?, ?, ?)',
+                                        (source, _now(), total))
+            return cursor.lastrowid
+
+    def finish_run(self, run_id: int, total: int = None) -> Dict:
+        with self._lock, self._conn:
+            self._conn.execute('UPDATE runs SET finished_at = ? WHERE id = ?', (_now(), run_id))
+            if total is not None:
+                self._conn.execute('UPDATE runs SET total = ? WHERE id = ?', (total, run_id))
+            return dict(self._conn.execute('SELECT * FROM runs WHERE id = ?', (run_id,)).fetchone())
+
+    def list_runs(self, limit: int = 20) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute('SELECT * FROM runs ORDER BY id DESC LIMIT ?', (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def history(self, json_path: str = None, limit: int = 50) -> List[Dict]:
+        """某条论文（或全部）的历史记录，新的在前"""
+        query = 'SELECT * FROM history'
+        params = []
+        if json_path:
+            query += ' WHERE json_path = ?'
+            params.append(os.path.abspath(json_path))
+        query += ' ORDER BY id DESC LIMIT ?'
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def latest_result(self, json_path: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute('SELECT result_json FROM papers WHERE json_path = ?',
+                                     (os.path.abspath(json_path),)).fetchone()
+        return json.loads(row['result_json']) if row else None
+
+
+def _format_flags(row: Dict) -> str:
+    return ' '.join(f"{name}:{'✓' if row.get(key) else ('✗' if row.get(key) is not None else '-')}"
+                    for name, key in (('作者', 'match_author'), ('日期', 'match_date'), ('标题', 'match_title')))
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='验证结果库查询')
+    arg_parser.add_argument('--db', default=DEFAULT_DB_PATH, help='数据库路径')
+    subparsers = arg_parser.add_subparsers(dest='command', required=True)
+    runs_parser = subparsers.add_parser('runs', help='列出最近的批量运行')
+    runs_parser.add_argument('--limit', type=int, default=20)
+    history_parser = subparsers.add_parser('history', help='查看验证历史')
+    history_parser.add_argument('json_path', nargs='?', help='只看某个JSON文件')
+    history_parser.add_argument('--limit', type=int, default=50)
+    show_parser = subparsers.add_parser('show', help='输出某个JSON文件最近一次的验证结果')
+    show_parser.add_argument('json_path')
+    retry_parser = subparsers.add_parser('retry-ocr', help='清除OCR不可用标记，下次运行时重新验证这些论文')
+    retry_parser.add_argument('json_paths', nargs='*', help='只清除这些JSON文件（默认全部）')
+    args = arg_parser.parse_args()
+
+    store = ResultsStore(args.db)
+    if args.command == 'runs':
+        for run in store.list_runs(args.limit):
+            print(f"#{run['id']:<5} {run['started_at']} -> {run['finished_at'] or '(未完成)'}  {run['source']:<8} "
+                  f"共 {run['total']}，验证 {run['verified']}，复用 {run['cached']}，重新匹配 {run['rematched']}，"
+                  f"失败 {run['failed']}")
+    elif args.command == 'history':
+        for row in store.history(args.json_path, args.limit):
+            print(f"{row['recorded_at']}  运行#{row['run_id']:<5} {row['status']:<8} {_format_flags(row)}  {row['json_path']}")
+    elif args.command == 'retry-ocr':
+        print(f"已清除 {store.clear_ocr_unavailable(args.json_paths)} 条记录的OCR不可用标记，下次运行时重新验证")
+    else:
+        result = store.latest_result(args.json_path)
+        print(json.dumps(result, ensure_ascii=False, indent=2) if result else f"没有记录: {args.json_path}")
+    store.close()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+侧车JSON读取模块
+浏览器扩展为每篇论文写一个侧车JSON（网页元数据 + 下载的文件），各处统一用这里的函数读取：
+一次读出文件字节、一次解码、一次遍历文件列表，得到 verify_paper 的输入（规范化的论文记录）。
+
+兼容的格式：
+  {"webData": {...}, "files": {"mainPdf": 路径, "file1": 路径, ...}}    当前扩展写出的格式
+  {"webData": {...}, "files": [{"type", "fileName", "filePath"}, ...]}  文件列表（filePath 也可以是 path / url）
+  {"title": ..., "firstAuthor": ..., "pdfFilePath": ..., ...}            元数据在根级别的旧格式
+
+规范化后的论文记录：网页元数据（title / firstAuthor / allAuthors / date / dates）在根级别，
+files 为列表，每项的 filePath 是本地绝对路径（还没下载完的文件为JSON目录下的预期路径）。
+
+安装了 orjson 时用它解码（比标准库快数倍），否则用 json。
+load_sidecars 批量读取（目录验证时成千上万个JSON）：线程池并行读文件，结果按输入顺序返回。
+"""
+
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from path_index import PATH_INDEX
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+logger = logging.getLogger('SidecarLoader')
+
+SIDECAR_FILE_KEYS = ('mainPdf', 'file1', 'file2', 'file3')
+WEB_DATA_FIELDS = ('title', 'firstAuthor', 'allAuthors', 'date', 'dates')
+LEGACY_FILE_TYPE = '论文全文'
+# 批量读取时读文件的线程数（单核时读文件与解码无法重叠，直接在调用线程读取）
+LOAD_WORKERS = int(os.environ.get('VERIFIER_SIDECAR_WORKERS', min(8, os.cpu_count() or 1)))
+LOAD_SERIAL_BELOW = 16  # 少于这么多个文件时直接在当前线程读取
+_UTF8_BOM = b'\xef\xbb\xbf'
+
+Sidecar = Tuple[Dict, List[str]]  # (verify_paper 的输入, 引用的PDF绝对路径)
+
+
+def decode_json(raw: bytes):
+    """解码JSON字节（允许UTF-8 BOM）；格式错误时抛出 ValueError（json.JSONDecodeError）"""
+    if raw.startswith(_UTF8_BOM):
+        raw = raw[len(_UTF8_BOM):]
+    if HAS_ORJSON:
+        return orjson.loads(raw)
+    return json.loads(raw.decode('utf-8'))
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def read_json(path: str):
+    return decode_json(_read_bytes(path))
+
+
+def _normalize_sidecar_path(file_path: str, json_path: Optional[str]) -> str:
+    """侧车JSON中的文件路径 -> 本地绝对路径；还没下载完的文件返回JSON目录（没有JSON路径时为当前目录）下的预期路径"""
+    resolved = PATH_INDEX.resolve(file_path, json_path)
+    if os.path.isabs(resolved):
+        return resolved
+    base_dir = os.path.dirname(os.path.abspath(json_path)) if json_path else os.getcwd()
+    return os.path.normpath(os.path.join(base_dir, resolved))
+
+
+def _file_entries(data: Dict, json_path: Optional[str]) -> Iterator[Tuple[Dict, str]]:
+    """files 字段（列表、mainPdf/file1..file3 字典或旧格式的 pdfFilePath）中的 (文件信息, 原始路径)"""
+    files = data.get('files')
+    if isinstance(files, dict):
+        for key in SIDECAR_FILE_KEYS:
+            if files.get(key) and isinstance(files[key], str):
+                yield {'type': key}, files[key]
+    elif isinstance(files, list) and files:
+        for file_info in files:
+            if isinstance(file_info, dict):
+                raw_path = file_info.get('filePath') or file_info.get('path') or file_info.get('url')
+                if raw_path and isinstance(raw_path, str):
+                    yield file_info, raw_path
+    elif data.get('pdfFilePath'):
+        yield {'type': LEGACY_FILE_TYPE, 'fileName': data.get('pdfFileName', '')}, data['pdfFilePath']
+    elif files:
+        logger.warning(f"[侧车] files 字段格式未知（{type(files).__name__}）: {json_path}")
+
+
+def normalize_sidecar(data, json_path: Optional[str]) -> Optional[Sidecar]:
+    """把解码后的侧车JSON规范化为论文记录；不是论文记录（不是对象或没有文件）时返回 None
+
+    json_path 为 None（例如内容由扩展直接发送）时，相对路径按当前目录和用户下载目录查找。
+    """
+    if not isinstance(data, dict):
+        return None
+
+    web_data = data.get('webData')
+    if not isinstance(web_data, dict) or not web_data.get('title'):
+        # webData 为空时元数据在根级别（旧格式）
+        web_data = {
+            'title': data.get('title', ''),
+            'firstAuthor': data.get('firstAuthor', '') or data.get('author', ''),
+            'allAuthors': data.get('allAuthors', []),
+            'date': data.get('date', '') or data.get('extractedDate', ''),
+            'dates': data.get('dates'),
+        }
+
+    files = []
+    pdf_paths = []
+    for file_info, raw_path in _file_entries(data, json_path):
+        pdf_path = _normalize_sidecar_path(raw_path, json_path)
+        files.append(dict(file_info, filePath=pdf_path,
+                          fileName=file_info.get('fileName') or os.path.basename(pdf_path)))
+        pdf_paths.append(pdf_path)
+    if not files:
+        return None
+
+    metadata = dict(data)
+    for key in WEB_DATA_FIELDS:
+        if web_data.get(key) is not None:
+            metadata[key] = web_data[key]
+    metadata['files'] = files
+    return metadata, pdf_paths
+
+
+def load_sidecar(json_path: str) -> Optional[Sidecar]:
+    """读取侧车JSON，返回 (verify_paper 的输入, 引用的PDF绝对路径)；不是论文记录时返回 None
+
+    JSON 不完整或格式错误时抛出 ValueError，文件无法读取时抛出 OSError。
+    """
+    return normalize_sidecar(read_json(json_path), json_path)
+
+
+def _read_or_error(path: str):
+    try:
+        return _read_bytes(path)
+    except OSError as e:
+        return e
+
+
+def load_sidecars(json_paths: Iterable[str], max_workers: int = LOAD_WORKERS
+                  ) -> Iterator[Tuple[str, Optional[Sidecar], Optional[Exception]]]:
+    """批量读取侧车JSON，按输入顺序逐个返回 (路径, 论文记录或 None, 读取错误或 None)
+
+    线程池只负责读文件（I/O 期间释放GIL，冷缓存或网络盘上可并行等待），
+    解码和规范化在调用线程中进行（纯Python计算，多线程反而要争GIL）。
+    """
+    json_paths = list(json_paths)
+    if max_workers <= 1 or len(json_paths) < LOAD_SERIAL_BELOW:
+        contents = map(_read_or_error, json_paths)
+        executor = None
+    else:
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='sidecar-load')
+        contents = executor.map(_read_or_error, json_paths)
+    try:
+        for json_path, raw in zip(json_paths, contents):
+            if isinstance(raw, OSError):
+                yield json_path, None, raw
+                continue
+            try:
+                yield json_path, normalize_sidecar(decode_json(raw), json_path), None
+            except ValueError as e:
+                yield json_path, None, e
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tk界面更新通道
+工作线程不直接操作Tk控件，也不为每条消息调用 root.after，而是把事件放入队列；
+Tk线程按固定间隔取出，把相邻的文本合并成一次 insert（每个间隔最多一次插入和一次滚动），
+控件操作（进度条、弹窗、表格等）按提交顺序在文本之间执行。大批量验证时事件循环不会被回调淹没。
+"""
+
+import logging
+import queue
+import time
+import tkinter as tk
+from typing import Callable, Optional
+
+logger = logging.getLogger('UIBridge')
+
+UI_TICK_MS = 100  # 取队列的间隔
+UI_TICK_BUDGET_MS = 40  # 每个间隔最多处理的时长，剩余事件留到下一个间隔
+UI_MAX_TEXT_CHARS = 2_000_000  # 文本框超过该长度时删除最早的内容，避免长时间运行后越来越慢
+
+_TEXT = 0
+_CALL = 1
+
+
+class UIBridge:
+    """线程安全的界面更新队列；start() 必须在Tk线程调用"""
+
+    def __init__(self, root, text_widget=None, tick_ms: int = UI_TICK_MS,
+                 budget_ms: float = UI_TICK_BUDGET_MS, max_text_chars: int = UI_MAX_TEXT_CHARS):
+        self.root = root
+        self.text_widget = text_widget
+        self.tick_ms = tick_ms
+        self.budget = budget_ms / 1000
+        self.max_text_chars = max_text_chars
+        self.stats = {'events': 0, 'ticks': 0, 'inserts': 0, 'calls': 0, 'max_tick_ms': 0.0}
+        self._queue = queue.SimpleQueue()
+        self._after_id = None
+        self._text_chars = 0
+
+    # ------------------------------------------------------------------
+    # 任意线程调用
+    # ------------------------------------------------------------------
+
+    def post_text(self, text: str):
+        """追加文本到结果区域"""
+        if text:
+            self._queue.put((_TEXT, text))
+
+    def post_call(self, fn: Callable, *args):
+        """在Tk线程执行 fn(*args)（在此之前提交的文本先插入）"""
+        self._queue.put((_CALL, fn, args))
+
+    def clear_text(self):
+        """清空结果区域"""
+        self.post_call(self._clear_text)
+
+    # ------------------------------------------------------------------
+    # Tk线程
+    # ------------------------------------------------------------------
+
+    def start(self):
+        if self._after_id is None:
+            self._after_id = self.root.after(self.tick_ms, self._tick)
+
+    def stop(self):
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def flush(self):
+        """立即处理队列中的全部事件（不受单次时长限制）"""
+        self._drain(deadline=None)
+
+    def _tick(self):
+        start = time.perf_counter()
+        try:
+            self._drain(deadline=start + self.budget)
+        except Exception as e:
+            logger.error(f"[界面更新] 处理事件出错: {e}", exc_info=True)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.stats['ticks'] += 1
+            if elapsed_ms > self.stats['max_tick_ms']:
+                self.stats['max_tick_ms'] = elapsed_ms
+            self._after_id = self.root.after(self.tick_ms, self._tick)
+
+    def _drain(self, deadline: Optional[float]):
+        texts = []
+        while deadline is None or time.perf_counter() < deadline:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self.stats['events'] += 1
+            if event[0] == _TEXT:
+                texts.append(event[1])
+                continue
+            self._insert(texts)
+            texts = []
+            self.stats['calls'] += 1
+            try:
+                event[1](*event[2])
+            except Exception as e:
+                logger.error(f"[界面更新] 回调出错: {e}", exc_info=True)
+        self._insert(texts)
+
+    def _insert(self, texts):
+        if not texts or self.text_widget is None:
+            return
+        text = ''.join(texts)
+        self.text_widget.insert(tk.END, text)
+        self._text_chars += len(text)
+        if self._text_chars > self.max_text_chars:
+            # 删除最早的一半内容
+            keep = self.max_text_chars // 2
+            self.text_widget.delete('1.0', f'end-{keep}c')
+            self._text_chars = keep
+        self.text_widget.see(tk.END)
+        self.stats['inserts'] += 1
+
+    def _clear_text(self):
+        if self.text_widget is not None:
+            self.text_widget.delete('1.0', tk.END)
+        self._text_chars = 0
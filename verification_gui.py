@@ -20,13 +20,25 @@ from datetime import datetime
 # 导入验证器
 try:
     from python_verifier import PDFVerifier, setup_logging
+    from verify_timing import rollup, format_rollup, ProgressMeter, format_progress, format_duration
+    from verify_metrics import dump_metrics
+    from verify_scheduler import VerifyScheduler, CancelToken, LANE_CPU, LANE_OCR
+    from results_store import ResultsStore
+    from folder_watcher import AutoVerifier, format_result_line, find_sidecar_files
+    from sidecar_loader import load_sidecar, load_sidecars
+    from path_index import PATH_INDEX
     HAS_VERIFIER = True
 except ImportError:
     HAS_VERIFIER = False
     print("警告: 无法导入 python_verifier，请确保 python_verifier.py 在同一目录")
 
-# 配置日志
-logger = setup_logging() if HAS_VERIFIER else logging.getLogger('VerificationGUI')
+from ui_bridge import UIBridge
+from result_table import ResultTable
+
+# 日志（由 main 配置）
+logger = logging.getLogger('VerificationGUI')
+
+PROGRESS_REFRESH_MS = 500  # 目录验证时进度条和剩余时间的刷新间隔
 
 class SimpleVerificationGUI:
     """简化的验证GUI - 自动读取默认路径的JSON文件"""
@@ -39,6 +51,12 @@ class SimpleVerificationGUI:
         self.verifier = PDFVerifier() if HAS_VERIFIER else None
         self.json_file_path = None
         self.default_download_dir = None
+        self.auto_verifier = None  # 监视模式下的下载目录监视器
+        self.scheduler = None  # 目录验证共用的调度器（首次使用时创建，之后各次验证复用）
+        self.store = None  # 目录验证使用的结果库（首次使用时打开）
+        self.cancel_token = None  # 当前验证的取消标志
+        self.batch = None  # 进行中的目录验证
+        self._progress_after = None
         
         # 尝试获取默认下载目录（Windows）
         self.detect_default_download_dir()
@@ -47,6 +65,10 @@ class SimpleVerificationGUI:
         self.load_saved_download_dir()
         
         self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        # 工作线程通过队列更新界面，Tk线程按固定间隔合并插入（文本进运行日志，结果进表格）
+        self.ui = UIBridge(self.root, self.log_text)
+        self.ui.start()
     
     def detect_default_download_dir(self):
         """检测默认下载目录"""
@@ -120,6 +142,12 @@ class SimpleVerificationGUI:
         auto_find_btn = ttk.Button(json_frame, text="自动查找最新JSON", command=self.auto_find_json)
         auto_find_btn.grid(row=2, column=0, columnspan=3, pady=5)
         
+        # 监视模式：新下载的论文写完后自动验证
+        self.watch_var = tk.BooleanVar(value=False)
+        watch_check = ttk.Checkbutton(json_frame, text="监视下载目录，自动验证新下载的论文",
+                                      variable=self.watch_var, command=self.toggle_watch)
+        watch_check.grid(row=3, column=0, columnspan=3, pady=5)
+        
         # 验证按钮
         verify_frame = ttk.Frame(main_frame)
         verify_frame.grid(row=3, column=0, columnspan=2, pady=10)
@@ -129,23 +157,42 @@ class SimpleVerificationGUI:
                                     style="Accent.TButton")
         self.verify_btn.pack(side=tk.LEFT, padx=5)
         
-        # 进度条
-        self.progress = ttk.Progressbar(main_frame, mode='indeterminate')
-        self.progress.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+        # 目录验证：下载目录中的全部论文记录并发验证
+        self.verify_dir_btn = ttk.Button(verify_frame, text="验证整个目录",
+                                         command=self.start_directory_verification)
+        self.verify_dir_btn.pack(side=tk.LEFT, padx=5)
         
-        # 结果显示区域
+        self.cancel_btn = ttk.Button(verify_frame, text="取消", command=self.cancel_verification, state='disabled')
+        self.cancel_btn.pack(side=tk.LEFT, padx=5)
+        
+        # 进度条（目录验证时显示完成数、吞吐量和剩余时间）
+        progress_frame = ttk.Frame(main_frame)
+        progress_frame.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+        self.progress = ttk.Progressbar(progress_frame, mode='indeterminate')
+        self.progress.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.progress_label = ttk.Label(progress_frame, text="")
+        self.progress_label.pack(side=tk.LEFT, padx=(10, 0))
+        
+        # 结果显示区域：每个文件（监视模式下每篇论文）一行，选中后显示详情
         result_frame = ttk.LabelFrame(main_frame, text="验证结果", padding="10")
         result_frame.grid(row=5, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
         
-        self.result_text = scrolledtext.ScrolledText(result_frame, height=20, wrap=tk.WORD,
-                                                     font=("Consolas", 10))
-        self.result_text.pack(fill=tk.BOTH, expand=True)
+        self.result_table = ResultTable(result_frame, self.format_result, reload_result=self._reload_result)
+        self.result_table.frame.pack(fill=tk.BOTH, expand=True)
+        
+        # 运行日志（文件检查、进度、汇总）
+        log_frame = ttk.LabelFrame(main_frame, text="运行日志", padding="10")
+        log_frame.grid(row=6, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
+        
+        self.log_text = scrolledtext.ScrolledText(log_frame, height=6, wrap=tk.WORD, font=("Consolas", 10))
+        self.log_text.pack(fill=tk.BOTH, expand=True)
         
         # 配置网格权重
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(0, weight=1)
         main_frame.columnconfigure(1, weight=1)
-        main_frame.rowconfigure(5, weight=1)
+        main_frame.rowconfigure(5, weight=3)
+        main_frame.rowconfigure(6, weight=1)
         json_frame.columnconfigure(1, weight=1)
         dir_frame.columnconfigure(1, weight=1)
     
@@ -217,6 +264,17 @@ class SimpleVerificationGUI:
     
     def auto_find_json(self):
         """自动查找最新的JSON文件"""
+        # 监视模式下直接使用目录索引，不重新扫描目录
+        if self.auto_verifier is not None and self.auto_verifier.watcher.running:
+            latest_json = self.auto_verifier.watcher.latest_json()
+            if not latest_json:
+                messagebox.showinfo("提示", "在下载目录中未找到JSON文件")
+                return
+            self.json_path_var.set(latest_json)
+            self.json_file_path = latest_json
+            messagebox.showinfo("成功", f"已找到最新JSON文件:\n{os.path.basename(latest_json)}")
+            return
+        
         # 使用用户设置的下载目录
         download_dir = self.download_dir_var.get().strip() or self.default_download_dir
         
@@ -250,6 +308,83 @@ class SimpleVerificationGUI:
         self.json_file_path = latest_json
         messagebox.showinfo("成功", f"已找到最新JSON文件:\n{os.path.basename(latest_json)}")
     
+    def toggle_watch(self):
+        """开启/关闭下载目录监视"""
+        if not self.watch_var.get():
+            self.stop_watch()
+            return
+        
+        if not HAS_VERIFIER:
+            messagebox.showerror("错误", "验证器未加载，请检查 python_verifier.py 是否存在")
+            self.watch_var.set(False)
+            return
+        
+        download_dir = self.download_dir_var.get().strip() or self.default_download_dir
+        if not download_dir or not os.path.isdir(download_dir):
+            messagebox.showwarning("警告", "未找到下载目录，请先设置下载目录")
+            self.watch_var.set(False)
+            return
+        
+        try:
+            self.auto_verifier = AutoVerifier(download_dir, self.on_watch_result, verifier=self.verifier)
+            self.auto_verifier.start()
+        except Exception as e:
+            logger.error(f"[监视] 启动失败: {e}", exc_info=True)
+            self.auto_verifier = None
+            self.watch_var.set(False)
+            messagebox.showerror("错误", f"启动监视失败: {str(e)}")
+            return
+        
+        mode = '内核通知' if self.auto_verifier.watcher.mode == 'inotify' else '定时轮询'
+        self.ui.post_text(f"[监视] 正在监视 {download_dir}（{mode}），新下载的论文写完后自动验证\n")
+    
+    def stop_watch(self):
+        """停止下载目录监视（等待进行中的验证完成）"""
+        auto_verifier, self.auto_verifier = self.auto_verifier, None
+        if auto_verifier is None:
+            return
+        
+        def stop():
+            auto_verifier.stop()
+            counts = auto_verifier.counts
+            self.ui.post_text(
+                f"[监视] 已停止：验证 {counts['verified']} 篇，复用 {counts['cached']} 篇，失败 {counts['failed']} 篇\n")
+        
+        threading.Thread(target=stop, daemon=True).start()
+    
+    def on_watch_result(self, json_path: str, result, cached: bool):
+        """监视模式的验证结果（工作线程回调）"""
+        line = f"\n[监视 {datetime.now().strftime('%H:%M:%S')}] {format_result_line(json_path, result, cached)}\n"
+        self.ui.post_text(line)
+        name = os.path.basename(json_path)
+        if isinstance(result, Exception):
+            self.ui.post_call(self.result_table.add_error, name, str(result), json_path)
+        else:
+            self.display_result(result, name, json_path, cached)
+    
+    def on_close(self):
+        """关闭窗口时停止监视和进行中的验证"""
+        if self.auto_verifier is not None:
+            self.auto_verifier.watcher.stop()
+        if self.cancel_token is not None:
+            self.cancel_token.set()
+        if self.scheduler is not None:
+            self.scheduler.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
+    
+    def set_running(self, running: bool):
+        """切换验证按钮和取消按钮的状态（Tk线程）"""
+        self.verify_btn.config(state='disabled' if running else 'normal')
+        self.verify_dir_btn.config(state='disabled' if running else 'normal')
+        self.cancel_btn.config(state='normal' if running else 'disabled')
+    
+    def cancel_verification(self):
+        """取消当前验证：未开始的论文不再验证，进行中的在下一阶段开始前停止"""
+        if self.cancel_token is not None and not self.cancel_token.is_set():
+            self.cancel_token.set()
+            self.cancel_btn.config(state='disabled')
+            self.ui.post_text("\n正在取消，等待进行中的阶段结束...\n")
+    
     def start_verification(self):
         """开始验证"""
         if not HAS_VERIFIER:
@@ -266,40 +401,41 @@ class SimpleVerificationGUI:
             return
         
         # 在新线程中执行验证
-        self.verify_btn.config(state='disabled')
+        self.cancel_token = CancelToken()
+        self.set_running(True)
+        self.progress.config(mode='indeterminate')
+        self.progress_label.config(text="")
         self.progress.start()
-        self.result_text.delete(1.0, tk.END)
+        self.ui.clear_text()
+        self.result_table.clear()
         
         thread = threading.Thread(target=self.verify_json_file, args=(json_path,))
         thread.daemon = True
         thread.start()
     
+    def finish_verification(self, text: str, dialog, *dialog_args):
+        """验证结束（工作线程调用）：输出最后的文本，恢复按钮和进度条，弹出提示"""
+        self.ui.post_text(text)
+        self.ui.post_call(self.progress.stop)
+        self.ui.post_call(self.set_running, False)
+        self.ui.post_call(dialog, *dialog_args)
+    
     def verify_json_file(self, json_path: str):
-        """验证JSON文件"""
+        """验证JSON文件（在工作线程中运行，界面更新一律经由 self.ui 提交）"""
         try:
             # 更新UI显示开始验证
-            self.root.after(0, lambda: self.result_text.insert(tk.END, 
+            self.ui.post_text(
                 f"开始验证: {os.path.basename(json_path)}\n"
                 f"文件路径: {json_path}\n"
-                f"{'='*60}\n\n"))
-            
-            # 读取JSON文件
-            with open(json_path, 'r', encoding='utf-8') as f:
-                json_data = json.load(f)
-            
-            # 提取文件路径
-            files = json_data.get('files', {})
-            web_data = json_data.get('webData') or {}
-            
-            # 如果webData为空，尝试从JSON根级别获取元数据（兼容旧格式）
-            if not web_data or not web_data.get('title'):
-                web_data = {
-                    'title': json_data.get('title', ''),
-                    'firstAuthor': json_data.get('firstAuthor', '') or json_data.get('author', ''),
-                    'allAuthors': json_data.get('allAuthors', []),
-                    'date': json_data.get('date', '') or json_data.get('extractedDate', ''),
-                    'dates': json_data.get('dates', None)
-                }
+                f"{'='*60}\n\n")
+            
+            # 读取JSON文件（webData 或根级别的元数据，files 为列表或 mainPdf/file1..file3 字典）
+            sidecar = load_sidecar(json_path)
+            if sidecar is None:
+                self.finish_verification("错误: JSON中没有论文记录（未找到文件信息）\n",
+                                         messagebox.showerror, "错误", "未找到任何有效的PDF文件")
+                return
+            web_data, _ = sidecar
             
             # 显示JSON内容摘要
             web_title = (web_data.get('title', '')[:80] if web_data.get('title') else '') or '(空)'
@@ -307,84 +443,43 @@ class SimpleVerificationGUI:
             web_date = web_data.get('date', '') or '(空)'
             web_authors = ', '.join(web_data.get('allAuthors', [])) if web_data.get('allAuthors') else ''
             
-            self.root.after(0, lambda wt=web_title, wa=web_author, wd=web_date, was=web_authors: 
-                self.result_text.insert(tk.END,
-                    f"网页元数据:\n"
-                    f"  标题: {wt}\n"
-                    f"  第一作者: {wa}\n"
-                    f"  日期: {wd}\n"
-                    f"  所有作者: {was}\n"
-                    f"\n文件列表:\n"))
+            self.ui.post_text(
+                f"网页元数据:\n"
+                f"  标题: {web_title}\n"
+                f"  第一作者: {web_author}\n"
+                f"  日期: {web_date}\n"
+                f"  所有作者: {web_authors}\n"
+                f"\n文件列表:\n")
             
-            # 收集所有文件路径
+            # 收集存在的文件（路径已由 load_sidecar 解析为绝对路径）
             file_paths = []
-            
-            # 处理files可能是dict或list的情况
-            if isinstance(files, list):
-                # 旧格式：files是列表
-                for file_info in files:
-                    if isinstance(file_info, dict):
-                        file_path = file_info.get('filePath') or file_info.get('path') or file_info.get('url')
-                        if file_path:
-                            normalized_path = file_path.replace('/', os.sep).replace('\\', os.sep)
-                            if not os.path.isabs(normalized_path):
-                                json_dir = os.path.dirname(os.path.abspath(json_path))
-                                normalized_path = os.path.normpath(os.path.join(json_dir, normalized_path))
-                            
-                            if os.path.exists(normalized_path):
-                                file_paths.append(normalized_path)
-                                self.root.after(0, lambda p=normalized_path: self.result_text.insert(tk.END,
-                                    f"  ✓ {os.path.basename(p)}\n"))
-                            else:
-                                self.root.after(0, lambda p=normalized_path: self.result_text.insert(tk.END,
-                                    f"  ✗ {os.path.basename(p)} (文件不存在)\n"))
-            elif isinstance(files, dict):
-                # 新格式：files是字典，包含mainPdf, file1, file2, file3
-                for key in ['mainPdf', 'file1', 'file2', 'file3']:
-                    file_path = files.get(key)
-                    if file_path:
-                        # 处理路径（可能是正斜杠，需要转换为系统路径）
-                        normalized_path = file_path.replace('/', os.sep).replace('\\', os.sep)
-                        if not os.path.isabs(normalized_path):
-                            # 如果是相对路径，尝试相对于JSON文件目录
-                            json_dir = os.path.dirname(os.path.abspath(json_path))
-                            normalized_path = os.path.normpath(os.path.join(json_dir, normalized_path))
-                        
-                        if os.path.exists(normalized_path):
-                            file_paths.append(normalized_path)
-                            self.root.after(0, lambda p=normalized_path: self.result_text.insert(tk.END,
-                                f"  ✓ {os.path.basename(p)}\n"))
-                        else:
-                            self.root.after(0, lambda p=normalized_path: self.result_text.insert(tk.END,
-                                f"  ✗ {os.path.basename(p)} (文件不存在)\n"))
-            else:
-                # files格式未知
-                self.root.after(0, lambda: self.result_text.insert(tk.END,
-                    f"  警告: files字段格式未知: {type(files)}\n"))
+            for file_info in web_data['files']:
+                pdf_path = file_info['filePath']
+                if PATH_INDEX.exists(pdf_path):
+                    file_paths.append(pdf_path)
+                    self.ui.post_text(f"  ✓ {os.path.basename(pdf_path)}\n")
+                else:
+                    self.ui.post_text(f"  ✗ {os.path.basename(pdf_path)} (文件不存在)\n")
             
             if not file_paths:
-                self.root.after(0, lambda: (
-                    self.result_text.insert(tk.END, "\n错误: 未找到任何有效的PDF文件\n"),
-                    self.progress.stop(),
-                    self.verify_btn.config(state='normal'),
-                    messagebox.showerror("错误", "未找到任何有效的PDF文件")
-                ))
+                self.finish_verification("\n错误: 未找到任何有效的PDF文件\n",
+                                         messagebox.showerror, "错误", "未找到任何有效的PDF文件")
                 return
             
             # 执行验证
-            self.root.after(0, lambda: self.result_text.insert(tk.END, 
-                f"\n开始验证 {len(file_paths)} 个文件...\n{'='*60}\n\n"))
+            self.ui.post_text(f"\n开始验证 {len(file_paths)} 个文件...\n{'='*60}\n\n")
             
             # 收集所有验证结果，用于生成汇总
             all_results = []
             
             # 对每个文件执行验证
+            cancel_token = self.cancel_token
             for i, pdf_path in enumerate(file_paths, 1):
+                if cancel_token is not None and cancel_token.is_set():
+                    self.ui.post_text(f"已取消，剩余 {len(file_paths) - i + 1} 个文件未验证\n")
+                    break
                 file_name = os.path.basename(pdf_path)
-                # 使用默认参数避免闭包问题
-                self.root.after(0, lambda idx=i, total=len(file_paths), path=pdf_path, name=file_name:
-                    self.result_text.insert(tk.END, 
-                        f"[{idx}/{total}] 验证文件: {name}\n"))
+                self.ui.post_text(f"[{i}/{len(file_paths)}] 验证文件: {file_name}\n")
                 
                 # 构建验证用的元数据（需要符合python_verifier的格式）
                 # python_verifier期望的格式：metadata包含title, firstAuthor, date等字段
@@ -402,7 +497,7 @@ class SimpleVerificationGUI:
                 }
                 
                 # 执行验证
-                result = self.verifier.verify_paper(metadata, json_file_path=json_path)
+                result = self.verifier.verify_paper(metadata, json_file_path=json_path, cancel_token=cancel_token)
                 
                 # 保存结果（包含文件名）
                 result_with_filename = {
@@ -412,40 +507,244 @@ class SimpleVerificationGUI:
                 }
                 all_results.append(result_with_filename)
                 
-                # 显示验证结果（使用默认参数避免闭包问题）
-                self.root.after(0, lambda r=result, idx=i: self.display_result(r, idx))
+                # 显示验证结果
+                self.display_result(result, file_name, pdf_path)
             
             # 生成并显示汇总结果
-            self.root.after(0, lambda results=all_results: self.display_summary(results))
+            self.display_summary(all_results)
             
             # 完成
-            self.root.after(0, lambda: (
-                self.result_text.insert(tk.END, f"\n{'='*60}\n验证完成！\n"),
-                self.progress.stop(),
-                self.verify_btn.config(state='normal'),
-                messagebox.showinfo("完成", "验证完成！请查看结果区域")
-            ))
+            if cancel_token is not None and cancel_token.is_set():
+                self.finish_verification(f"\n{'='*60}\n验证已取消\n", messagebox.showinfo, "已取消", "验证已取消")
+            else:
+                self.finish_verification(f"\n{'='*60}\n验证完成！\n", messagebox.showinfo, "完成", "验证完成！请查看结果区域")
             
         except json.JSONDecodeError as e:
             error_msg = f"JSON文件格式错误: {str(e)}\n"
-            self.root.after(0, lambda: (
-                self.result_text.insert(tk.END, error_msg),
-                self.progress.stop(),
-                self.verify_btn.config(state='normal'),
-                messagebox.showerror("错误", error_msg)
-            ))
+            self.finish_verification(error_msg, messagebox.showerror, "错误", error_msg)
         except Exception as e:
             import traceback
             error_msg = f"验证过程出错: {str(e)}\n详细错误:\n{traceback.format_exc()}\n"
-            self.root.after(0, lambda: (
-                self.result_text.insert(tk.END, error_msg),
-                self.progress.stop(),
-                self.verify_btn.config(state='normal'),
-                messagebox.showerror("错误", f"验证失败: {str(e)}")
-            ))
-    
-    def display_result(self, result: Dict, file_index: int = 1):
-        """显示验证结果"""
+            self.finish_verification(error_msg, messagebox.showerror, "错误", f"验证失败: {str(e)}")
+    
+    # ------------------------------------------------------------------
+    # 目录验证
+    # ------------------------------------------------------------------
+    
+    def start_directory_verification(self):
+        """验证下载目录中的全部论文记录（共用调度器并发验证，可取消）"""
+        if not HAS_VERIFIER:
+            messagebox.showerror("错误", "验证器未加载，请检查 python_verifier.py 是否存在")
+            return
+        
+        directory = self.download_dir_var.get().strip()
+        if not directory or not os.path.isdir(directory):
+            messagebox.showwarning("警告", "请先设置有效的下载目录")
+            return
+        
+        self.cancel_token = CancelToken()
+        self.set_running(True)
+        self.progress.stop()
+        self.progress.config(mode='determinate', value=0, maximum=1)
+        self.progress_label.config(text="正在查找论文记录...")
+        self.ui.clear_text()
+        self.result_table.clear()
+        
+        thread = threading.Thread(target=self.verify_directory, args=(directory, self.cancel_token))
+        thread.daemon = True
+        thread.start()
+    
+    def get_scheduler(self) -> 'VerifyScheduler':
+        """目录验证共用的调度器：线程池在多次验证之间复用，不为每次验证新建"""
+        if self.scheduler is None:
+            self.scheduler = VerifyScheduler(route=self._route_job, work=self._verify_job, on_done=self._on_job_done)
+        return self.scheduler
+    
+    def get_store(self) -> Optional['ResultsStore']:
+        """目录验证使用的结果库（打开失败时返回 None，不影响验证）"""
+        if self.store is None:
+            try:
+                self.store = ResultsStore()
+            except Exception as e:
+                logger.error(f"[结果库] 打开失败，目录验证不复用结果: {e}", exc_info=True)
+        return self.store
+    
+    def _store_call(self, method: str, *args):
+        """调用结果库；出错只记录日志，不影响验证"""
+        store = self.get_store()
+        if store is None:
+            return None
+        try:
+            return getattr(store, method)(*args)
+        except Exception as e:
+            logger.error(f"[结果库] {method} 失败: {e}", exc_info=True)
+            return None
+    
+    def verify_directory(self, directory: str, cancel_token: 'CancelToken'):
+        """目录验证（在工作线程中运行）：读取论文记录，未变化的复用结果库，其余提交到共用调度器"""
+        try:
+            jobs = []
+            for json_path, sidecar, error in load_sidecars(find_sidecar_files(directory)):
+                if error is not None:
+                    logger.warning(f"[目录验证] 跳过无法读取的JSON: {json_path}: {error}")
+                    continue
+                if sidecar is not None:
+                    jobs.append({'json_file': json_path, 'metadata': sidecar[0], 'pdf_paths': sidecar[1],
+                                 'cancel': cancel_token})
+            if not jobs:
+                self.ui.post_call(self.progress_label.config, {'text': ""})
+                self.finish_verification(f"目录中没有论文记录: {directory}\n",
+                                         messagebox.showwarning, "警告", "下载目录中没有找到论文记录")
+                return
+            
+            batch = {
+                'meter': ProgressMeter(len(jobs)),
+                'pending': len(jobs),
+                'counts': {'verified': 0, 'cached': 0, 'failed': 0, 'cancelled': 0, 'matched': 0},
+                'timings': [],
+                'run_id': self._store_call('begin_run', 'directory', len(jobs)),
+                'done': threading.Event(),
+                'lock': threading.Lock(),
+            }
+            self.batch = batch
+            self.ui.post_text(f"目录: {directory}\n共 {len(jobs)} 条论文记录\n")
+            self.ui.post_call(self.refresh_progress)
+            
+            scheduler = self.get_scheduler()
+            for job in jobs:
+                job['batch'] = batch
+                if cancel_token.is_set():
+                    self._finish_job(job, None)
+                    continue
+                cached = self._store_call('lookup_unchanged', job['json_file'])
+                if cached is not None:
+                    cached['cached'] = True
+                    self._store_call('record_cached', batch['run_id'], job['json_file'], cached)
+                    self._finish_job(job, cached, cached=True)
+                else:
+                    scheduler.submit(job)
+            batch['done'].wait()
+            
+            counts = batch['counts']
+            if batch['run_id'] is not None:
+                self._store_call('finish_run', batch['run_id'])
+            dump_metrics(source='directory', run_id=batch['run_id'], directory=directory, total=len(jobs),
+                         cancelled=cancel_token.is_set(), counts=counts)
+            snapshot = batch['meter'].snapshot()
+            text = (f"\n{'='*60}\n目录验证{'已取消' if cancel_token.is_set() else '完成'}：共 {len(jobs)} 篇，"
+                    f"验证 {counts['verified']}，复用 {counts['cached']}，失败 {counts['failed']}，"
+                    f"取消 {counts['cancelled']}；三项全部匹配 {counts['matched']} 篇，"
+                    f"用时 {format_duration(snapshot['elapsed'])}\n")
+            if batch['timings']:
+                text += f"\n阶段耗时汇总:\n{format_rollup(rollup(batch['timings']))}\n"
+            self.batch = None
+            self.ui.post_call(self.refresh_progress, snapshot)
+            self.finish_verification(text, messagebox.showinfo, "已取消" if cancel_token.is_set() else "完成",
+                                     f"目录验证{'已取消' if cancel_token.is_set() else '完成'}！"
+                                     f"验证 {counts['verified']} 篇，复用 {counts['cached']} 篇，"
+                                     f"失败 {counts['failed']} 篇，取消 {counts['cancelled']} 篇")
+        except Exception as e:
+            import traceback
+            self.batch = None
+            error_msg = f"目录验证出错: {str(e)}\n详细错误:\n{traceback.format_exc()}\n"
+            self.finish_verification(error_msg, messagebox.showerror, "错误", f"目录验证失败: {str(e)}")
+    
+    def _route_job(self, job: Dict) -> str:
+        """按预检成本选择通道：含扫描件/乱码文本层的论文走OCR通道"""
+        if job['cancel'].is_set():
+            return LANE_CPU
+        estimate = self.verifier.estimate_paper_cost(job['metadata'], job['json_file'])
+        return LANE_OCR if estimate['needs_ocr'] else LANE_CPU
+    
+    def _verify_job(self, job: Dict) -> Optional[Dict]:
+        """调度器任务：取消后未开始的论文直接返回 None"""
+        if job['cancel'].is_set():
+            return None
+        return self.verifier.verify_paper(job['metadata'], json_file_path=job['json_file'], cancel_token=job['cancel'])
+    
+    def _on_job_done(self, job: Dict, result, lane: str):
+        """调度器完成回调（工作线程）"""
+        batch = job['batch']
+        if isinstance(result, Exception):
+            logger.error(f"[目录验证] 验证失败: {job['json_file']}: {result}")
+            self._store_call('record_failed', batch['run_id'], job['json_file'])
+        elif result is not None:
+            # 取消、超时、OCR失败等未完成的结果由结果库拒绝保存
+            self._store_call('save_result', batch['run_id'], job['json_file'], job['pdf_paths'], result)
+        self._finish_job(job, result)
+    
+    def _finish_job(self, job: Dict, result, cached: bool = False):
+        """一条论文记录结束：更新计数和进度，结果进表格"""
+        batch = job['batch']
+        name = os.path.basename(job['json_file'])
+        cancelled = result is None or (isinstance(result, dict) and 'cancelled' in result.get('errors', []))
+        with batch['lock']:
+            counts = batch['counts']
+            if isinstance(result, Exception):
+                counts['failed'] += 1
+            elif cancelled:
+                counts['cancelled'] += 1
+            else:
+                counts['cached' if cached else 'verified'] += 1
+                if all(result.get('overall_matches', {}).values()):
+                    counts['matched'] += 1
+                if not cached:
+                    batch['timings'].append(result.get('timings'))
+        verify_ms = None
+        if isinstance(result, dict) and not cached:
+            verify_ms = result.get('timings', {}).get('verify_paper', {}).get('ms')
+        batch['meter'].record(verify_ms, cached=cached or cancelled)
+        
+        if isinstance(result, Exception):
+            self.ui.post_call(self.result_table.add_error, name, str(result), job['json_file'])
+        elif not cancelled:
+            self.display_result(result, name, job['json_file'], cached)
+        
+        with batch['lock']:
+            batch['pending'] -= 1
+            finished = batch['pending'] == 0
+        if finished:
+            batch['done'].set()
+    
+    def refresh_progress(self, snapshot: Dict = None):
+        """刷新进度条和剩余时间（Tk线程）；目录验证进行中时定时重复"""
+        batch = self.batch
+        if snapshot is None:
+            if batch is None:
+                return
+            snapshot = batch['meter'].snapshot()
+        self.progress.config(maximum=max(1, snapshot['total']), value=snapshot['done'])
+        self.progress_label.config(text=format_progress(snapshot))
+        if self._progress_after is not None:
+            self.root.after_cancel(self._progress_after)
+            self._progress_after = None
+        if batch is not None:
+            self._progress_after = self.root.after(PROGRESS_REFRESH_MS, self._tick_progress)
+    
+    def _tick_progress(self):
+        self._progress_after = None
+        self.refresh_progress()
+    
+    def display_result(self, result: Dict, name: str, path: str = '', cached: bool = False):
+        """在结果表格中追加一行（可在任意线程调用）"""
+        if cached and not result.get('cached'):
+            result = dict(result, cached=True)
+        self.ui.post_call(self.result_table.add_result, result, name, path)
+    
+    def _reload_result(self, row: Dict) -> Optional[Dict]:
+        """表格中已释放完整结果的行：从结果库读取最近一次结果（监视模式的结果库优先，其次是目录验证的结果库）"""
+        if not row['path'].endswith('.json'):
+            return None
+        auto_verifier = self.auto_verifier
+        if auto_verifier is not None and auto_verifier.store is not None:
+            result = auto_verifier.store.latest_result(row['path'])
+            if result is not None:
+                return result
+        return self._store_call('latest_result', row['path'])
+    
+    def format_result(self, result: Dict) -> str:
+        """单个验证结果的详情文本（选中表格行时调用）"""
+        lines = []
         try:
             # python_verifier返回的格式：result包含files列表和overall_matches
             overall_matches = result.get('overall_matches', {})
@@ -463,79 +762,86 @@ class SimpleVerificationGUI:
             metadata = result.get('metadata', {})
             web_dates = metadata.get('dates', {})
             if web_dates:
-                self.result_text.insert(tk.END, f"\n  网页日期信息:\n")
+                lines.append(f"\n  网页日期信息:\n")
                 if web_dates.get('received'):
-                    self.result_text.insert(tk.END, f"    投稿日期 (Received): {web_dates.get('received')}\n")
+                    lines.append(f"    投稿日期 (Received): {web_dates.get('received')}\n")
                 if web_dates.get('received_in_revised'):
-                    self.result_text.insert(tk.END, f"    修改日期 (Received in Revised): {web_dates.get('received_in_revised')}\n")
+                    lines.append(f"    修改日期 (Received in Revised): {web_dates.get('received_in_revised')}\n")
                 if web_dates.get('accepted'):
-                    self.result_text.insert(tk.END, f"    接受日期 (Accepted): {web_dates.get('accepted')}\n")
+                    lines.append(f"    接受日期 (Accepted): {web_dates.get('accepted')}\n")
                 if web_dates.get('available_online'):
-                    self.result_text.insert(tk.END, f"    在线日期 (Available Online): {web_dates.get('available_online')}\n")
+                    lines.append(f"    在线日期 (Available Online): {web_dates.get('available_online')}\n")
+            
+            skipped_files = result.get('skipped_files', [])
+            if skipped_files:
+                lines.append(f"\n  已跳过 {len(skipped_files)} 个文件（作者、日期、标题均已匹配）:\n")
+                for skipped in skipped_files:
+                    lines.append(f"    - {skipped['fileName']}\n")
             
             # 显示每个文件的详细信息
             files = result.get('files', [])
             for idx, file_result in enumerate(files, 1):
-                self.result_text.insert(tk.END, f"\n 文件 {idx} 详细信息:\n")
+                lines.append(f"\n 文件 {idx} 详细信息:\n")
                 
                 # PDF元数据
                 pdf_metadata = file_result.get('pdf_metadata', {})
                 if pdf_metadata:
-                    self.result_text.insert(tk.END, f"  PDF提取数据:\n")
-                    self.result_text.insert(tk.END, f"    标题: {pdf_metadata.get('title', '(空)')[:80]}\n")
-                    self.result_text.insert(tk.END, f"    第一作者: {pdf_metadata.get('firstAuthor', '(空)')}\n")
-                    self.result_text.insert(tk.END, f"    日期: {pdf_metadata.get('date', '(空)')}\n")
+                    lines.append(f"  PDF提取数据:\n")
+                    lines.append(f"    标题: {pdf_metadata.get('title', '(空)')[:80]}\n")
+                    lines.append(f"    第一作者: {pdf_metadata.get('firstAuthor', '(空)')}\n")
+                    lines.append(f"    日期: {pdf_metadata.get('date', '(空)')}\n")
+                
+                if file_result.get('pages_parsed'):
+                    lines.append(f"    解析页数: {file_result['pages_parsed']}\n")
                 
                 # OCR数据
                 ocr_text = file_result.get('ocr_text', '')
                 if ocr_text:
-                    self.result_text.insert(tk.END, f"    OCR文本长度: {len(ocr_text)} 字符\n")
+                    lines.append(f"    OCR文本长度: {len(ocr_text)} 字符\n")
                 
                 # 提取的日期信息
                 extracted_dates = file_result.get('extracted_dates', {})
                 if extracted_dates:
-                    self.result_text.insert(tk.END, f"    提取的日期信息:\n")
+                    lines.append(f"    提取的日期信息:\n")
                     if extracted_dates.get('received'):
-                        self.result_text.insert(tk.END, f"      投稿日期 (Received): {extracted_dates.get('received')}\n")
+                        lines.append(f"      投稿日期 (Received): {extracted_dates.get('received')}\n")
                     if extracted_dates.get('revised'):
-                        self.result_text.insert(tk.END, f"      修改日期 (Revised): {extracted_dates.get('revised')}\n")
+                        lines.append(f"      修改日期 (Revised): {extracted_dates.get('revised')}\n")
                     if extracted_dates.get('accepted'):
-                        self.result_text.insert(tk.END, f"      接受日期 (Accepted): {extracted_dates.get('accepted')}\n")
+                        lines.append(f"      接受日期 (Accepted): {extracted_dates.get('accepted')}\n")
                     if extracted_dates.get('availableOnline'):
-                        self.result_text.insert(tk.END, f"      在线日期 (Available Online): {extracted_dates.get('availableOnline')}\n")
+                        lines.append(f"      在线日期 (Available Online): {extracted_dates.get('availableOnline')}\n")
                     if extracted_dates.get('published'):
-                        self.result_text.insert(tk.END, f"      发表日期 (Published): {extracted_dates.get('published')}\n")
+                        lines.append(f"      发表日期 (Published): {extracted_dates.get('published')}\n")
                     if not any([extracted_dates.get('received'), extracted_dates.get('revised'), 
                                 extracted_dates.get('accepted'), extracted_dates.get('availableOnline'), 
                                 extracted_dates.get('published')]):
-                        self.result_text.insert(tk.END, f"      (未提取到日期信息)\n")
+                        lines.append(f"      (未提取到日期信息)\n")
                 
                 # 匹配结果
                 matches = file_result.get('matches', {})
-                self.result_text.insert(tk.END, f"    匹配结果:\n")
-                self.result_text.insert(tk.END, f"      标题: {'✓' if matches.get('title') else '✗'}\n")
-                self.result_text.insert(tk.END, f"      作者: {'✓' if matches.get('author') else '✗'}\n")
-                self.result_text.insert(tk.END, f"      日期: {'✓' if matches.get('date') else '✗'}\n")
+                lines.append(f"    匹配结果:\n")
+                lines.append(f"      标题: {'✓' if matches.get('title') else '✗'}\n")
+                lines.append(f"      作者: {'✓' if matches.get('author') else '✗'}\n")
+                lines.append(f"      日期: {'✓' if matches.get('date') else '✗'}\n")
                 
                 # 错误信息
                 errors = file_result.get('errors', [])
                 if errors:
-                    self.result_text.insert(tk.END, f"    错误:\n")
+                    lines.append(f"    错误:\n")
                     for error in errors:
-                        self.result_text.insert(tk.END, f"      - {error}\n")
-            
-            self.result_text.insert(tk.END, f"\n{'-'*60}\n")
-            self.result_text.see(tk.END)
+                        lines.append(f"      - {error}\n")
             
         except Exception as e:
-            self.result_text.insert(tk.END, f"显示结果时出错: {str(e)}\n")
+            lines.append(f"显示结果时出错: {str(e)}\n")
             logger.error(f"显示结果时出错: {e}", exc_info=True)
+        return ''.join(lines)
     
     def display_summary(self, all_results: List[Dict]):
-        """显示所有文件的汇总验证结果"""
+        """显示所有文件的汇总验证结果（可在任意线程调用）"""
         try:
-            self.result_text.insert(tk.END, f"\n{'='*60}\n")
-            self.result_text.insert(tk.END, "最终验证结果:\n")
+            self.ui.post_text(f"\n{'='*60}\n")
+            self.ui.post_text("最终验证结果:\n")
             
             # 收集每个匹配项的匹配文件（使用Set去重）
             title_matched_files = set()
@@ -568,28 +874,32 @@ class SimpleVerificationGUI:
             author_status = '✓' if author_matched_list else '✗'
             date_status = '✓' if date_matched_list else '✗'
             
-            self.result_text.insert(tk.END, f"  标题匹配: {title_status}")
+            self.ui.post_text(f"  标题匹配: {title_status}")
             if title_matched_list:
-                self.result_text.insert(tk.END, f" 匹配文件：{', '.join(title_matched_list)}\n")
+                self.ui.post_text(f" 匹配文件：{', '.join(title_matched_list)}\n")
             else:
-                self.result_text.insert(tk.END, "\n")
+                self.ui.post_text("\n")
             
-            self.result_text.insert(tk.END, f"  作者匹配: {author_status}")
+            self.ui.post_text(f"  作者匹配: {author_status}")
             if author_matched_list:
-                self.result_text.insert(tk.END, f" 匹配文件：{', '.join(author_matched_list)}\n")
+                self.ui.post_text(f" 匹配文件：{', '.join(author_matched_list)}\n")
             else:
-                self.result_text.insert(tk.END, "\n")
+                self.ui.post_text("\n")
             
-            self.result_text.insert(tk.END, f"  日期匹配: {date_status}")
+            self.ui.post_text(f"  日期匹配: {date_status}")
             if date_matched_list:
-                self.result_text.insert(tk.END, f" 匹配文件：{', '.join(date_matched_list)}\n")
+                self.ui.post_text(f" 匹配文件：{', '.join(date_matched_list)}\n")
             else:
-                self.result_text.insert(tk.END, "\n")
+                self.ui.post_text("\n")
+            
+            # 各阶段耗时汇总
+            timing_table = format_rollup(rollup(r['result'].get('timings') for r in all_results))
+            logger.info(f"[批量验证] 阶段耗时汇总:\n{timing_table}")
+            self.ui.post_text(f"\n阶段耗时汇总:\n{timing_table}\n")
             
-            self.result_text.see(tk.END)
             
         except Exception as e:
-            self.result_text.insert(tk.END, f"显示汇总结果时出错: {str(e)}\n")
+            self.ui.post_text(f"显示汇总结果时出错: {str(e)}\n")
             logger.error(f"显示汇总结果时出错: {e}", exc_info=True)
 
 
@@ -600,6 +910,7 @@ def main():
         print("请确保 python_verifier.py 文件在同一目录下")
         sys.exit(1)
     
+    setup_logging()
     root = tk.Tk()
     app = SimpleVerificationGUI(root)
     root.mainloop()
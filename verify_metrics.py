@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+运行指标模块
+进程内的指标注册表：计数器、仪表和固定分桶的直方图，各处直接更新模块级的指标对象（线程安全）。
+服务模式下 GET /metrics 以 Prometheus 文本格式输出；批量验证结束时以JSON写到 verifier_metrics.json
+（环境变量 VERIFIER_METRICS_FILE 指定路径）。指标从进程启动起累计，同一进程中的多次批量运行不清零。
+
+  verifier_stage_duration_ms       各阶段耗时（按文件，阶段名与结果中的 timings 一致）
+  verifier_api_calls_total         OCR/LLM API调用次数（按结果）
+  verifier_api_call_duration_ms    OCR/LLM API单次调用耗时
+  verifier_api_retries_total       OCR重试次数（异常输出 / 调用失败）
+  verifier_api_upload_bytes_total  发送给API的请求体字节数
+  verifier_cache_lookups_total     缓存命中/未命中（结果库、提取结果、文件哈希、预检）
+  verifier_queue_depth             各通道排队的任务数；verifier_lane_running 为正在验证的任务数
+  verifier_match_outcomes_total    作者/日期/标题/三项全部的匹配结果（按论文）
+
+隔离子进程（isolate_files）中的API调用计数留在子进程，不计入；阶段耗时由主进程从文件结果中统计，不受影响。
+"""
+
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger('VerifyMetrics')
+
+METRICS_FILE = os.environ.get('VERIFIER_METRICS_FILE') or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'verifier_metrics.json')
+# 毫秒分桶：覆盖本地文本提取（毫秒级）到OCR往返（数十秒）
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 120000)
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """指标基类：按标签值组合保存样本"""
+
+    kind = ''
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        try:
+            if len(labels) == len(self.label_names):
+                return tuple([str(labels[name]) for name in self.label_names])
+        except KeyError:
+            pass
+        raise ValueError(f"{self.name} 的标签应为 {self.label_names}，收到 {tuple(labels)}")
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.label_names, key))
+
+    def samples(self) -> List[Tuple[Dict[str, str], object]]:
+        with self._lock:
+            return [(self._labels(key), self._copy(value)) for key, value in sorted(self._samples.items())]
+
+    def _copy(self, value):
+        return value
+
+
+class Counter(_Metric):
+    """只增的计数器"""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        if amount < 0:
+            raise ValueError(f"计数器 {self.name} 不能减少")
+        key = self._key(labels)
+        with self._lock:
+            self._samples[key] = self._samples.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._samples.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """可增可减的当前值（队列长度等）"""
+
+    kind = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._samples[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._samples[key] = self._samples.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._samples.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    """固定分桶的直方图；每个样本为 [各桶计数（不累计）, 总和, 次数]"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = (),
+                 buckets: Iterable[float] = LATENCY_BUCKETS_MS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)  # 第一个 >= value 的上界；超过全部上界时落在 +Inf
+        with self._lock:
+            sample = self._samples.get(key)
+            if sample is None:
+                sample = self._samples[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            sample[0][index] += 1
+            sample[1] += value
+            sample[2] += 1
+
+    def _copy(self, value):
+        counts, total, count = value
+        cumulative = []
+        running = 0
+        for bucket_count in counts:
+            running += bucket_count
+            cumulative.append(running)
+        return {'buckets': dict(zip(self.buckets + (float('inf'),), cumulative)), 'sum': total, 'count': count}
+
+
+class MetricsRegistry:
+    """指标注册表：按名称创建指标（同名返回已有的），输出 Prometheus 文本或JSON"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, help_text: str, labels: Iterable[str], **options):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, labels, **options)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"指标 {name} 已注册为 {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help_text: str, labels: Iterable[str] = ()) -> Counter:
+        return self._register(Counter, name, help_text, labels)
+
+    def gauge(self, name: str, help_text: str, labels: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge, name, help_text, labels)
+
+    def histogram(self, name: str, help_text: str, labels: Iterable[str] = (),
+                  buckets: Iterable[float] = LATENCY_BUCKETS_MS) -> Histogram:
+        return self._register(Histogram, name, help_text, labels, buckets=buckets)
+
+    def metrics(self) -> List[_Metric]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def render_prometheus(self) -> str:
+        """Prometheus 文本格式（text/plain; version=0.0.4）"""
+        lines = []
+        for metric in self.metrics():
+            help_text = metric.help.replace('\\', '\\\\').replace('\n', '\\n')  # HELP 中引号不转义
+            lines.append(f"# HELP {metric.name} {help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for labels, value in metric.samples():
+                if metric.kind != 'histogram':
+                    lines.append(f"{metric.name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+                for bound, count in value['buckets'].items():
+                    bucket_labels = dict(labels, le=_format_value(bound))
+                    lines.append(f"{metric.name}_bucket{_format_labels(bucket_labels)} {count}")
+                lines.append(f"{metric.name}_sum{_format_labels(labels)} {_format_value(round(value['sum'], 3))}")
+                lines.append(f"{metric.name}_count{_format_labels(labels)} {value['count']}")
+        return '\n'.join(lines) + '\n'
+
+    def to_dict(self) -> Dict:
+        """{指标名: {'type', 'help', 'samples': [{'labels', 'value'} 或 {'labels', 'count', 'sum', 'buckets'}]}}"""
+        snapshot = {}
+        for metric in self.metrics():
+            samples = []
+            for labels, value in metric.samples():
+                if metric.kind == 'histogram':
+                    samples.append({'labels': labels, 'count': value['count'], 'sum': round(value['sum'], 3),
+                                    'buckets': {_format_value(bound): count
+                                                for bound, count in value['buckets'].items()}})
+                else:
+                    samples.append({'labels': labels, 'value': value})
+            snapshot[metric.name] = {'type': metric.kind, 'help': metric.help, 'samples': samples}
+        return snapshot
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_LATENCY = REGISTRY.histogram('verifier_stage_duration_ms', '各验证阶段耗时（毫秒，按文件）', ('stage',))
+API_CALLS = REGISTRY.counter('verifier_api_calls_total', 'OCR/LLM API调用次数', ('kind', 'outcome'))
+API_LATENCY = REGISTRY.histogram('verifier_api_call_duration_ms', 'OCR/LLM API单次调用耗时（毫秒）', ('kind',))
+API_RETRIES = REGISTRY.counter('verifier_api_retries_total', 'OCR/LLM API重试次数', ('kind', 'reason'))
+API_UPLOAD_BYTES = REGISTRY.counter('verifier_api_upload_bytes_total', '发送给OCR/LLM API的请求体字节数', ('kind',))
+CACHE_LOOKUPS = REGISTRY.counter('verifier_cache_lookups_total', '缓存查询次数', ('cache', 'result'))
+QUEUE_DEPTH = REGISTRY.gauge('verifier_queue_depth', '调度通道中排队的任务数', ('lane',))
+LANE_RUNNING = REGISTRY.gauge('verifier_lane_running', '调度通道中正在验证的任务数', ('lane',))
+LANE_JOBS = REGISTRY.counter('verifier_lane_jobs_total', '调度通道完成的任务数', ('lane', 'outcome'))
+PAPERS = REGISTRY.counter('verifier_papers_total', '验证的论文记录数', ('status',))
+MATCH_OUTCOMES = REGISTRY.counter('verifier_match_outcomes_total', '论文匹配结果', ('field', 'outcome'))
+
+
+def observe_timings(stages: Optional[Dict]):
+    """把一份 timings 计入阶段耗时；记录了缓存命中的阶段同时计入缓存命中/未命中"""
+    for stage, record in (stages or {}).items():
+        STAGE_LATENCY.observe(record.get('ms', 0.0), stage=stage)
+        if 'cache_hits' in record:
+            hits = record['cache_hits']
+            CACHE_LOOKUPS.inc(hits, cache=stage, result='hit')
+            CACHE_LOOKUPS.inc(max(0, record.get('count', 0) - hits), cache=stage, result='miss')
+
+
+def observe_cache(cache: str, hit: bool):
+    CACHE_LOOKUPS.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+def observe_matches(matches: Dict):
+    """一篇论文的整体匹配结果（author / date / title 及三项全部）"""
+    for field in ('author', 'date', 'title'):
+        MATCH_OUTCOMES.inc(field=field, outcome='matched' if matches.get(field) else 'unmatched')
+    matched_all = all(matches.get(field) for field in ('author', 'date', 'title'))
+    MATCH_OUTCOMES.inc(field='all', outcome='matched' if matched_all else 'unmatched')
+
+
+def dump_metrics(path: str = None, **info) -> Optional[str]:
+    """把当前指标写成JSON（先写临时文件再替换），info 为附加的运行信息；失败时只记录日志"""
+    path = path or METRICS_FILE
+    payload = {'generated': time.strftime('%Y-%m-%d %H:%M:%S'), **info, 'metrics': REGISTRY.to_dict()}
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.error(f"[指标] 写入失败: {path}: {e}")
+        return None
+    logger.info(f"[指标] 已写入: {path}")
+    return path
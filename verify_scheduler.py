@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+两级验证调度模块
+把批量任务按预估成本分到两个通道：
+  'cpu' - 有文本层的PDF，只做本地文本提取和匹配，结果很快
+  'ocr' - 扫描件/乱码文本层，需要栅格化和OCR API往返
+两个通道各自限流，慢通道排队时快通道的结果仍能立即返回。
+
+通道只限制论文级任务的并发；每篇论文内部还有文件级线程池，文本通道的论文也可能
+回退到OCR，所以OCR API调用另由进程级的 ocr_slot() 限流，大小与OCR通道一致。
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from verify_metrics import LANE_JOBS, LANE_RUNNING, QUEUE_DEPTH
+
+logger = logging.getLogger('VerifyScheduler')
+
+LANE_CPU = 'cpu'
+LANE_OCR = 'ocr'
+LANES = (LANE_CPU, LANE_OCR)
+
+DEFAULT_CPU_WORKERS = max(1, min(4, os.cpu_count() or 1))
+DEFAULT_OCR_WORKERS = int(os.environ.get('VERIFIER_OCR_WORKERS', 2))  # OCR API并发，受服务端限流约束
+
+_ocr_slots = threading.BoundedSemaphore(max(1, DEFAULT_OCR_WORKERS))
+_ocr_slots_lock = threading.Lock()
+
+
+def set_ocr_concurrency(limit: int):
+    """设置进程内同时进行的OCR调用上限（调度器创建时按OCR通道大小设置）
+
+    已持有旧闸门的调用照常完成，之后的调用使用新上限。
+    """
+    install_ocr_slot(threading.BoundedSemaphore(max(1, int(limit))))
+
+
+def install_ocr_slot(slots):
+    """替换OCR闸门（隔离验证子进程装入转发给父进程的闸门）"""
+    global _ocr_slots
+    with _ocr_slots_lock:
+        _ocr_slots = slots
+
+
+def ocr_slot():
+    """返回OCR并发闸门（有 acquire/release），调用方持有到OCR完成"""
+    with _ocr_slots_lock:
+        return _ocr_slots
+
+
+class CancelToken:
+    """协作式取消标志：set() 后，任务在下一个阶段开始前自行停止（不中断正在进行的阶段）
+
+    与 threading.Event 的 is_set()/set() 用法相同；parent 取消时本标志也视为已取消，
+    用于单篇论文内部的提前结束（first_sufficient）不影响整批的取消标志。
+    """
+
+    def __init__(self, parent=None):
+        self.parent = parent
+        self._event = threading.Event()
+
+    def set(self):
+        self._event.set()
+
+    def is_set(self) -> bool:
+        return self._event.is_set() or (self.parent is not None and self.parent.is_set())
+
+
+class VerifyScheduler:
+    """按通道限流的任务调度器
+
+    route(job) 返回通道名（'cpu' 或 'ocr'），work(job) 执行任务并返回结果。
+    on_done(job, result, lane) 在任务完成的工作线程中回调，异常时 result 为异常对象。
+    """
+
+    def __init__(self, route: Callable[[Any], str], work: Callable[[Any], Any],
+                 cpu_workers: int = DEFAULT_CPU_WORKERS, ocr_workers: int = DEFAULT_OCR_WORKERS,
+                 on_done: Optional[Callable[[Any, Any, str], None]] = None):
+        self.route = route
+        self.work = work
+        self.on_done = on_done
+        self.executors = {
+            LANE_CPU: ThreadPoolExecutor(max_workers=cpu_workers, thread_name_prefix='verify-cpu'),
+            LANE_OCR: ThreadPoolExecutor(max_workers=ocr_workers, thread_name_prefix='verify-ocr'),
+        }
+        self.stats = {lane: {'submitted': 0, 'completed': 0, 'failed': 0} for lane in LANES}
+        self._lock = threading.Lock()
+        set_ocr_concurrency(ocr_workers)  # 所有通道、所有文件线程的OCR调用合计不超过OCR通道大小
+
+    def submit(self, job) -> Future:
+        """路由并提交任务；路由失败时按慢通道处理"""
+        try:
+            lane = self.route(job)
+        except Exception as e:
+            logger.warning(f"[调度] 成本预估失败，按OCR通道处理: {e}")
+            lane = LANE_OCR
+        if lane not in self.executors:
+            lane = LANE_OCR
+
+        with self._lock:
+            self.stats[lane]['submitted'] += 1
+        QUEUE_DEPTH.inc(lane=lane)
+        try:
+            future = self.executors[lane].submit(self._run, job, lane)
+        except RuntimeError:
+            QUEUE_DEPTH.dec(lane=lane)  # 线程池已关闭
+            raise
+        future.add_done_callback(lambda f: self._finish(job, lane, f))
+        return future
+
+    def _run(self, job, lane: str):
+        QUEUE_DEPTH.dec(lane=lane)
+        LANE_RUNNING.inc(lane=lane)
+        try:
+            return self.work(job)
+        finally:
+            LANE_RUNNING.dec(lane=lane)
+
+    def _finish(self, job, lane: str, future: Future):
+        if future.cancelled():
+            QUEUE_DEPTH.dec(lane=lane)  # 未开始就被取消，_run 没有执行
+            return
+        error = future.exception()
+        with self._lock:
+            self.stats[lane]['failed' if error else 'completed'] += 1
+        LANE_JOBS.inc(lane=lane, outcome='failed' if error else 'completed')
+        if self.on_done is not None:
+            try:
+                self.on_done(job, error if error else future.result(), lane)
+            except Exception as e:
+                logger.error(f"[调度] 完成回调出错: {e}", exc_info=True)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {lane: dict(stats) for lane, stats in self.stats.items()}
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False):
+        for executor in self.executors.values():
+            executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown(wait=True)
+        return False
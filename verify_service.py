@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地验证服务模块
+长驻进程在 127.0.0.1 上提供HTTP接口，浏览器扩展把耗时的验证（PDF解析、OCR）交给它：
+PDFVerifier、已导入的PDF/OCR模块、OCR API的连接、目录索引和结果库在各次请求之间保持，不用每次冷启动。
+
+接口（请求和响应均为JSON）：
+  GET    /health          服务状态：队列长度、各通道统计、已完成/失败/复用数
+  GET    /metrics         运行指标（Prometheus 文本格式，见 verify_metrics）
+  POST   /verify          提交验证：{"jsonPath": 侧车JSON路径} 或 {"sidecar": 侧车JSON内容, "jsonPath": 可选}
+                          可选参数 "wait"（默认 true，等待结果；超时或为 false 时返回 202 和任务号）、
+                          "full"（默认 false，返回精简结果；true 时返回含全文的完整结果）、
+                          "force"（默认 false，true 时不复用结果库中未变化的结果）
+                          只带 jsonPath 的请求与界面共用结果库，同一路径进行中的任务共享；
+                          带 sidecar 的请求按提交的内容验证，不查询也不写入结果库（jsonPath 只用于解析PDF路径）
+  GET    /jobs/<任务号>    查询任务状态和结果（参数 ?full=1 返回完整结果）
+  DELETE /jobs/<任务号>    取消任务（未开始的不再验证，进行中的在下一阶段开始前停止）
+
+并发由调度器的两个通道限制（文本PDF / 需要OCR），排队和进行中的任务总数超过队列长度时返回 503。
+只监听本机回环地址；Host 必须是 localhost / 127.0.0.1（防止DNS重绑定），带 Origin 的请求只接受浏览器扩展，
+设置了环境变量 VERIFIER_SERVICE_TOKEN 时还要求请求头 X-Verifier-Token 一致。
+
+用法: python python_verifier.py serve [--port 8765] [--cpu-workers N] [--ocr-workers N] [--queue 64]
+"""
+
+import argparse
+import hmac
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from result_export import slim_result
+from sidecar_loader import load_sidecar, normalize_sidecar
+from verify_metrics import REGISTRY, PROMETHEUS_CONTENT_TYPE
+from verify_scheduler import (CancelToken, VerifyScheduler, LANE_CPU, LANE_OCR,
+                              DEFAULT_CPU_WORKERS, DEFAULT_OCR_WORKERS)
+
+logger = logging.getLogger('VerifyService')
+
+SERVICE_HOST = '127.0.0.1'  # 只监听本机
+SERVICE_PORT = int(os.environ.get('VERIFIER_SERVICE_PORT', 8765))
+SERVICE_QUEUE_SIZE = int(os.environ.get('VERIFIER_SERVICE_QUEUE', 64))  # 排队 + 进行中的任务上限
+SERVICE_JOB_HISTORY = 1000  # 保留的已完成任务数（之后按完成顺序丢弃最早的）
+SERVICE_MAX_BODY_BYTES = 8 * 1024 * 1024
+SERVICE_WAIT_TIMEOUT = float(os.environ.get('VERIFIER_SERVICE_WAIT', 600))  # wait=true 时最多等待的秒数
+SERVICE_TOKEN = os.environ.get('VERIFIER_SERVICE_TOKEN', '')
+ALLOWED_HOSTS = ('127.0.0.1', 'localhost')
+ALLOWED_ORIGIN_PREFIXES = ('chrome-extension://', 'moz-extension://')
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+FINISHED_STATES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+SERVICE_ACTIVE = REGISTRY.gauge('verifier_service_active_jobs', '服务中排队和进行中的任务数')
+SERVICE_JOBS = REGISTRY.counter('verifier_service_jobs_total', '服务完成的任务数', ('status',))
+SERVICE_REJECTED = REGISTRY.counter('verifier_service_rejected_total', '队列已满被拒绝的请求数')
+
+
+class ServiceBusy(Exception):
+    """队列已满"""
+
+
+class VerifyService:
+    """验证服务：共享一个 PDFVerifier，按成本通道调度，任务结果保存在内存中供查询
+
+    请求带侧车JSON路径时结果保存到结果库，JSON和PDF都未变化时直接复用上次的结果；
+    同一路径正在验证时返回进行中的任务，不重复验证。
+    """
+
+    def __init__(self, db_path: str = None, use_store: bool = True, verifier=None,
+                 cpu_workers: int = DEFAULT_CPU_WORKERS, ocr_workers: int = DEFAULT_OCR_WORKERS,
+                 queue_size: int = SERVICE_QUEUE_SIZE, history: int = SERVICE_JOB_HISTORY):
+        from python_verifier import PDFVerifier
+        from results_store import ResultsStore, DEFAULT_DB_PATH
+
+        self.verifier = verifier or PDFVerifier()
+        self.store = None
+        if use_store:
+            try:
+                self.store = ResultsStore(db_path or DEFAULT_DB_PATH)
+            except Exception as e:
+                logger.error(f"[结果库] 打开失败，不保存服务结果: {e}")
+        self.run_id = self._store_call('begin_run', 'service', 0)
+        self.scheduler = VerifyScheduler(route=self._route, work=self._verify, cpu_workers=cpu_workers,
+                                         ocr_workers=ocr_workers, on_done=self._on_done)
+        self.queue_size = queue_size
+        self.history = history
+        self.started = time.time()
+        self.counts = {'verified': 0, 'cached': 0, 'failed': 0, 'cancelled': 0, 'rejected': 0}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._active = 0  # 排队 + 进行中
+        self._by_path: Dict[str, Dict] = {}  # 进行中的 jsonPath -> 任务
+
+    def warm_up(self):
+        """预先导入OCR路径上按需导入的模块并读取OCR配置，第一个请求不再承担导入耗时"""
+        start = time.perf_counter()
+        try:
+            import pdf2image  # noqa: F401  OCR前的栅格化
+        except ImportError:
+            pass
+        try:
+            from ocr_api_python import load_config_from_file
+            load_config_from_file()
+        except Exception as e:
+            logger.warning(f"[服务] OCR模块预加载失败（OCR请求时再试）: {e}")
+        logger.info(f"[服务] 预加载完成，耗时 {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    def close(self):
+        """取消排队的任务，等待进行中的任务结束"""
+        with self._lock:
+            for job in self._jobs.values():
+                if job['status'] in (JOB_QUEUED, JOB_RUNNING):
+                    job['cancel'].set()
+        self.scheduler.shutdown(wait=True, cancel_futures=True)
+        if self.run_id is not None:
+            self._store_call('finish_run', self.run_id, self.counts['verified'] + self.counts['cached'])
+        if self.store is not None:
+            self.store.close()
+
+    def _store_call(self, method: str, *args):
+        if self.store is None:
+            return None
+        try:
+            return getattr(self.store, method)(*args)
+        except Exception as e:
+            logger.error(f"[结果库] {method} 失败: {e}", exc_info=True)
+            return None
+
+    # ------------------------------------------------------------------
+    # 任务
+    # ------------------------------------------------------------------
+
+    def submit(self, json_path: str = None, sidecar=None, force: bool = False) -> Dict:
+        """提交验证任务，返回任务字典；请求内容无效时抛出 ValueError，队列已满时抛出 ServiceBusy
+        
+        只有按路径读取磁盘上的JSON时才使用结果库（复用、保存）；提交了 sidecar 内容时，
+        磁盘上的JSON可能与之不同，结果既不按路径复用也不保存
+        """
+        if json_path:
+            json_path = os.path.abspath(json_path)
+        if sidecar is not None:
+            loaded = normalize_sidecar(sidecar, json_path)
+        elif json_path:
+            try:
+                loaded = load_sidecar(json_path)
+            except OSError as e:
+                raise ValueError(f"无法读取JSON文件: {e}")
+        else:
+            raise ValueError("需要 jsonPath 或 sidecar")
+        if loaded is None:
+            raise ValueError("JSON中未找到论文记录（没有文件信息）")
+        metadata, pdf_paths = loaded
+        store_path = json_path if sidecar is None else None
+
+        with self._lock:
+            # 只有内容相同（都读磁盘上的JSON）且不要求重新验证时才共享进行中的任务
+            existing = self._by_path.get(store_path) if store_path and not force else None
+            if existing is not None:
+                return existing
+            if self._active >= self.queue_size:
+                self.counts['rejected'] += 1
+                SERVICE_REJECTED.inc()
+                raise ServiceBusy(f"队列已满（{self._active}/{self.queue_size}）")
+            job = {
+                'id': f"{next(self._ids):06d}",
+                'status': JOB_QUEUED,
+                'json_file': json_path,
+                'store_path': store_path,
+                'metadata': metadata,
+                'pdf_paths': pdf_paths,
+                'cancel': CancelToken(),
+                'done': threading.Event(),
+                'submitted': time.time(),
+                'started': None,
+                'finished': None,
+                'cached': False,
+                'lane': None,
+                'result': None,
+                'error': None,
+            }
+            self._jobs[job['id']] = job
+            self._active += 1
+            SERVICE_ACTIVE.set(self._active)
+            if store_path:
+                self._by_path[store_path] = job
+
+        cached = self._store_call('lookup_unchanged', store_path) if store_path and not force else None
+        if cached is not None:
+            cached['cached'] = True
+            self._store_call('record_cached', self.run_id, store_path, cached)
+            job['cached'] = True
+            self._finish(job, JOB_DONE, result=cached)
+            return job
+        try:
+            self.scheduler.submit(job)
+        except RuntimeError as e:
+            # 服务正在关闭，线程池不再接受任务
+            self._finish(job, JOB_FAILED, error=str(e))
+        return job
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        job = self.get_job(job_id)
+        if job is not None and job['status'] not in FINISHED_STATES:
+            job['cancel'].set()
+        return job
+
+    def status(self) -> Dict:
+        with self._lock:
+            states = {}
+            for job in self._jobs.values():
+                states[job['status']] = states.get(job['status'], 0) + 1
+            return {
+                'status': 'ok',
+                'uptime': round(time.time() - self.started, 1),
+                'queue': {'active': self._active, 'limit': self.queue_size,
+                          'queued': states.get(JOB_QUEUED, 0), 'running': states.get(JOB_RUNNING, 0)},
+                'lanes': self.scheduler.get_stats(),
+                'counts': dict(self.counts),
+                'store': self.store.db_path if self.store is not None else None,
+            }
+
+    def _route(self, job: Dict) -> str:
+        estimate = self.verifier.estimate_paper_cost(job['metadata'], job['json_file'])
+        job['lane'] = LANE_OCR if estimate['needs_ocr'] else LANE_CPU
+        return job['lane']
+
+    def _verify(self, job: Dict) -> Dict:
+        if job['cancel'].is_set():
+            return None
+        job['status'] = JOB_RUNNING
+        job['started'] = time.time()
+        return self.verifier.verify_paper(job['metadata'], json_file_path=job['json_file'],
+                                          cancel_token=job['cancel'])
+
+    def _on_done(self, job: Dict, result, lane: str):
+        if isinstance(result, Exception):
+            logger.error(f"[服务] 验证失败: {job['json_file'] or job['id']}: {result}")
+            if job['store_path']:
+                self._store_call('record_failed', self.run_id, job['store_path'])
+            self._finish(job, JOB_FAILED, error=str(result))
+        elif result is None or job['cancel'].is_set():
+            # 取消的结果不完整，不保存到结果库
+            self._finish(job, JOB_CANCELLED, result=result)
+        else:
+            if job['store_path']:
+                self._store_call('save_result', self.run_id, job['store_path'], job['pdf_paths'], result)
+            self._finish(job, JOB_DONE, result=result)
+
+    def _finish(self, job: Dict, status: str, result: Dict = None, error: str = None):
+        with self._lock:
+            job['status'] = status
+            job['result'] = result
+            job['error'] = error
+            job['finished'] = time.time()
+            job['metadata'] = None  # 结果中已包含元数据
+            self._active -= 1
+            SERVICE_ACTIVE.set(self._active)
+            if job['store_path'] and self._by_path.get(job['store_path']) is job:
+                del self._by_path[job['store_path']]
+            key = {JOB_FAILED: 'failed', JOB_CANCELLED: 'cancelled'}.get(status) or (
+                'cached' if job['cached'] else 'verified')
+            self.counts[key] += 1
+            SERVICE_JOBS.inc(status=key)
+            self._evict()
+        job['done'].set()
+
+    def _evict(self):
+        """已完成的任务超过保留数时丢弃最早的（调用方持有锁）"""
+        finished = [job_id for job_id, job in self._jobs.items() if job['status'] in FINISHED_STATES]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+
+
+def job_view(job: Dict, full: bool = False) -> Dict:
+    """任务的JSON表示；完成时附带结果（默认为不含全文的精简结果）"""
+    view = {
+        'id': job['id'],
+        'status': job['status'],
+        'jsonPath': job['json_file'],
+        'cached': job['cached'],
+        'lane': job['lane'],
+    }
+    if job['started'] is not None:
+        view['queuedMs'] = round((job['started'] - job['submitted']) * 1000, 1)
+    if job['finished'] is not None:
+        view['elapsedMs'] = round((job['finished'] - job['submitted']) * 1000, 1)
+    if job['error']:
+        view['error'] = job['error']
+    if job['result'] is not None:
+        view['result'] = job['result'] if full else slim_result(job['result'], job['json_file'] or '')
+    return view
+
+
+def _flag(value) -> bool:
+    if isinstance(value, str):
+        return value.lower() in ('1', 'true', 'yes')
+    return bool(value)
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """HTTP请求处理（每个连接一个线程）；server.service 为 VerifyService"""
+
+    server_version = 'PaperVerifier'
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        logger.debug(f"[服务] {self.address_string()} {format % args}")
+
+    # ------------------------------------------------------------------
+    # 访问控制
+    # ------------------------------------------------------------------
+
+    def _origin(self) -> Optional[str]:
+        origin = self.headers.get('Origin')
+        if origin and origin.startswith(ALLOWED_ORIGIN_PREFIXES):
+            return origin
+        return None
+
+    def _check_access(self) -> bool:
+        host = (self.headers.get('Host') or '').rsplit(':', 1)[0].strip('[]')
+        if host not in ALLOWED_HOSTS:
+            self._send_json(403, {'error': 'Host 不允许'})
+            return False
+        if self.headers.get('Origin') and self._origin() is None:
+            # 普通网页发起的跨域请求（浏览器总会带 Origin）
+            self._send_json(403, {'error': 'Origin 不允许'})
+            return False
+        if SERVICE_TOKEN and not hmac.compare_digest(self.headers.get('X-Verifier-Token', ''), SERVICE_TOKEN):
+            self._send_json(401, {'error': '缺少或错误的 X-Verifier-Token'})
+            return False
+        return True
+
+    # ------------------------------------------------------------------
+    # 响应
+    # ------------------------------------------------------------------
+
+    def _send_json(self, code: int, payload, headers: Dict = None):
+        body = json.dumps(payload, ensure_ascii=False, default=str)
+        self._send_text(code, body, 'application/json; charset=utf-8', headers)
+
+    def _send_text(self, code: int, text: str, content_type: str, headers: Dict = None):
+        body = text.encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        origin = self._origin()
+        if origin:
+            self.send_header('Access-Control-Allow-Origin', origin)
+            self.send_header('Vary', 'Origin')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _read_json(self):
+        """读取JSON请求体；出错时已发送错误响应并返回 None"""
+        content_type = (self.headers.get('Content-Type') or '').split(';')[0].strip().lower()
+        if content_type != 'application/json':
+            self._send_json(415, {'error': '请求体必须是 application/json'})
+            return None
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or length > SERVICE_MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send_json(413, {'error': f"请求体过大（上限 {SERVICE_MAX_BODY_BYTES // 1024 // 1024}MB）"})
+            return None
+        try:
+            data = json.loads(self.rfile.read(length).decode('utf-8') or 'null')
+        except (ValueError, UnicodeDecodeError) as e:
+            self._send_json(400, {'error': f"JSON格式错误: {e}"})
+            return None
+        if not isinstance(data, dict):
+            self._send_json(400, {'error': '请求体必须是JSON对象'})
+            return None
+        return data
+
+    def _job_id(self, path: str) -> Optional[str]:
+        parts = path.strip('/').split('/')
+        return parts[1] if len(parts) == 2 and parts[0] == 'jobs' else None
+
+    # ------------------------------------------------------------------
+    # 路由
+    # ------------------------------------------------------------------
+
+    def do_OPTIONS(self):
+        """浏览器扩展的CORS预检"""
+        origin = self._origin()
+        if origin is None:
+            self._send_json(403, {'error': 'Origin 不允许'})
+            return
+        self.send_response(204)
+        self.send_header('Access-Control-Allow-Origin', origin)
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, DELETE, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, X-Verifier-Token')
+        self.send_header('Access-Control-Max-Age', '600')
+        self.send_header('Vary', 'Origin')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self):
+        if not self._check_access():
+            return
+        url = urlsplit(self.path)
+        service = self.server.service
+        if url.path == '/health':
+            self._send_json(200, service.status())
+            return
+        if url.path == '/metrics':
+            self._send_text(200, REGISTRY.render_prometheus(), PROMETHEUS_CONTENT_TYPE)
+            return
+        job_id = self._job_id(url.path)
+        if job_id is None:
+            self._send_json(404, {'error': f"未知路径: {url.path}"})
+            return
+        job = service.get_job(job_id)
+        if job is None:
+            self._send_json(404, {'error': f"任务不存在: {job_id}"})
+            return
+        full = _flag(parse_qs(url.query).get('full', ['0'])[0])
+        self._send_json(200, job_view(job, full))
+
+    def do_DELETE(self):
+        if not self._check_access():
+            return
+        job_id = self._job_id(urlsplit(self.path).path)
+        job = self.server.service.cancel(job_id) if job_id else None
+        if job is None:
+            self._send_json(404, {'error': f"任务不存在: {job_id}"})
+            return
+        self._send_json(200, job_view(job))
+
+    def do_POST(self):
+        if not self._check_access():
+            return
+        if urlsplit(self.path).path != '/verify':
+            self._send_json(404, {'error': f"未知路径: {self.path}"})
+            return
+        data = self._read_json()
+        if data is None:
+            return
+        service = self.server.service
+        try:
+            job = service.submit(json_path=data.get('jsonPath'), sidecar=data.get('sidecar'),
+                                 force=_flag(data.get('force', False)))
+        except ServiceBusy as e:
+            self._send_json(503, {'error': str(e)}, headers={'Retry-After': '5'})
+            return
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+            return
+        except Exception as e:
+            logger.error(f"[服务] 提交失败: {e}", exc_info=True)
+            self._send_json(500, {'error': str(e)})
+            return
+
+        full = _flag(data.get('full', False))
+        if _flag(data.get('wait', True)):
+            job['done'].wait(SERVICE_WAIT_TIMEOUT)
+        self._send_json(200 if job['status'] in FINISHED_STATES else 202, job_view(job, full))
+
+
+def create_server(service: VerifyService, port: int = SERVICE_PORT) -> ThreadingHTTPServer:
+    """创建绑定到 127.0.0.1 的服务（port 为 0 时由系统分配端口）"""
+    server = ThreadingHTTPServer((SERVICE_HOST, port), ServiceHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def serve_main(argv: List[str] = None):
+    """命令行: python python_verifier.py serve [--port 8765] ..."""
+    from python_verifier import setup_logging
+
+    arg_parser = argparse.ArgumentParser(prog='python_verifier.py serve',
+                                         description='在本机启动验证服务，供浏览器扩展提交验证请求')
+    arg_parser.add_argument('--port', type=int, default=SERVICE_PORT, help='监听端口（只监听 127.0.0.1）')
+    arg_parser.add_argument('--cpu-workers', type=int, default=DEFAULT_CPU_WORKERS, help='文本PDF通道并发数')
+    arg_parser.add_argument('--ocr-workers', type=int, default=DEFAULT_OCR_WORKERS, help='OCR通道并发数')
+    arg_parser.add_argument('--queue', type=int, default=SERVICE_QUEUE_SIZE, help='排队和进行中的任务上限')
+    arg_parser.add_argument('--db', default=None, help='结果库路径')
+    arg_parser.add_argument('--no-store', action='store_true', help='不使用结果库（不复用、不保存结果）')
+    args = arg_parser.parse_args(argv)
+
+    setup_logging()
+    service = VerifyService(db_path=args.db, use_store=not args.no_store, cpu_workers=args.cpu_workers,
+                            ocr_workers=args.ocr_workers, queue_size=args.queue)
+    service.warm_up()
+    try:
+        server = create_server(service, args.port)
+    except OSError as e:
+        service.close()
+        raise SystemExit(f"无法监听 {SERVICE_HOST}:{args.port}: {e}")
+    print(f"验证服务已启动: http://{SERVICE_HOST}:{server.server_address[1]}"
+          f"（并发 文本{args.cpu_workers}/OCR{args.ocr_workers}，队列 {args.queue}），按 Ctrl+C 停止", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        counts = service.counts
+        print(f"已停止：验证 {counts['verified']} 篇，复用 {counts['cached']} 篇，失败 {counts['failed']} 篇，"
+              f"取消 {counts['cancelled']} 篇，拒绝 {counts['rejected']} 次")
+
+
+if __name__ == '__main__':
+    serve_main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+验证阶段计时模块
+记录每个阶段（预检、文本提取、元数据、栅格化、OCR、LLM、匹配等）的耗时、
+输入/输出字节数和缓存命中，结果写入验证结果的 timings 字段，并可汇总为批量统计。
+
+timings 格式: {阶段名: {'ms': 累计毫秒, 'count': 次数, 'bytes_in': ..., 'bytes_out': ..., 'cache_hits': ...}}
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+PROGRESS_WINDOW = 50  # 按最近多少条完成记录估算吞吐量
+
+
+class Timings:
+    """单次验证的阶段计时"""
+
+    def __init__(self):
+        self.stages = {}
+        self._open = {}
+
+    @contextmanager
+    def span(self, stage: str):
+        """计时一个阶段；可向 yield 出的字典写入 bytes_in / bytes_out / cache_hit"""
+        extra = {}
+        start = time.perf_counter()
+        try:
+            yield extra
+        finally:
+            self.add(stage, (time.perf_counter() - start) * 1000, **extra)
+
+    def begin(self, stage: str):
+        """开始一个较长的阶段（与 end 配对，避免大段代码缩进）"""
+        self._open[stage] = time.perf_counter()
+
+    def end(self, stage: str, **extra):
+        start = self._open.pop(stage, None)
+        if start is not None:
+            self.add(stage, (time.perf_counter() - start) * 1000, **extra)
+
+    def add(self, stage: str, ms: float, bytes_in: int = None, bytes_out: int = None,
+            cache_hit: bool = None):
+        record = self.stages.setdefault(stage, {'ms': 0.0, 'count': 0})
+        record['ms'] = round(record['ms'] + ms, 3)
+        record['count'] += 1
+        if bytes_in is not None:
+            record['bytes_in'] = record.get('bytes_in', 0) + bytes_in
+        if bytes_out is not None:
+            record['bytes_out'] = record.get('bytes_out', 0) + bytes_out
+        if cache_hit is not None:
+            record['cache_hits'] = record.get('cache_hits', 0) + int(bool(cache_hit))
+
+    def merge(self, stages: Dict):
+        """累加另一份 timings（如各文件合并到论文级别）"""
+        for stage, record in stages.items():
+            target = self.stages.setdefault(stage, {'ms': 0.0, 'count': 0})
+            target['ms'] = round(target['ms'] + record.get('ms', 0.0), 3)
+            target['count'] += record.get('count', 0)
+            for key in ('bytes_in', 'bytes_out', 'cache_hits'):
+                if key in record:
+                    target[key] = target.get(key, 0) + record[key]
+
+
+@contextmanager
+def span(timings: Optional[Timings], stage: str):
+    """timings 为 None 时不计时（供可选传入计时对象的函数使用）"""
+    if timings is None:
+        yield {}
+    else:
+        with timings.span(stage) as extra:
+            yield extra
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def rollup(timings_list: Iterable[Dict]) -> Dict:
+    """把多个结果的 timings 汇总为每阶段的 次数/总耗时/p50/p95/最大值/字节数/缓存命中"""
+    samples = {}
+    totals = {}
+    for stages in timings_list:
+        for stage, record in (stages or {}).items():
+            samples.setdefault(stage, []).append(record.get('ms', 0.0))
+            total = totals.setdefault(stage, {'count': 0, 'bytes_in': 0, 'bytes_out': 0, 'cache_hits': 0})
+            total['count'] += record.get('count', 0)
+            for key in ('bytes_in', 'bytes_out', 'cache_hits'):
+                total[key] += record.get(key, 0)
+
+    summary = {}
+    for stage, values in samples.items():
+        summary[stage] = {
+            **totals[stage],
+            'total_ms': round(sum(values), 3),
+            'p50_ms': round(_percentile(values, 0.5), 3),
+            'p95_ms': round(_percentile(values, 0.95), 3),
+            'max_ms': round(max(values), 3),
+        }
+    return summary
+
+
+def format_rollup(summary: Dict) -> str:
+    """汇总结果的文本表格（按总耗时降序）"""
+    lines = [f"{'阶段':<20}{'次数':>6}{'总耗时ms':>12}{'p50':>10}{'p95':>10}{'最大':>10}{'缓存命中':>8}"]
+    for stage, row in sorted(summary.items(), key=lambda item: -item[1]['total_ms']):
+        lines.append(f"{stage:<20}{row['count']:>6}{row['total_ms']:>12.1f}{row['p50_ms']:>10.1f}"
+                     f"{row['p95_ms']:>10.1f}{row['max_ms']:>10.1f}{row['cache_hits']:>8}")
+    return '\n'.join(lines)
+
+
+class ProgressMeter:
+    """批量进度：按最近 window 条完成记录的时间估算吞吐量和剩余时间（线程安全）
+
+    吞吐量取完成时间间隔而不是单条耗时，并发验证时也成立；复用结果库的记录几乎不耗时，
+    计入完成数但不计入吞吐量，避免开头一批缓存命中让剩余时间估得过短。
+    """
+
+    def __init__(self, total: int, window: int = PROGRESS_WINDOW):
+        self.total = total
+        self.done = 0
+        self.skipped = 0
+        self.started = time.monotonic()
+        self._finished = deque(maxlen=window + 1)  # (完成时间, 单条耗时ms)
+        self._finished.append((self.started, None))
+        self._lock = threading.Lock()
+
+    def record(self, ms: float = None, cached: bool = False):
+        """一条记录完成；ms 为该条的验证耗时"""
+        with self._lock:
+            self.done += 1
+            if cached:
+                self.skipped += 1
+            else:
+                self._finished.append((time.monotonic(), ms))
+
+    def snapshot(self) -> Dict:
+        """{'done', 'total', 'elapsed', 'rate'（条/秒）, 'eta'（秒，无法估算时为 None）, 'avg_ms'}"""
+        with self._lock:
+            now = time.monotonic()
+            done, finished = self.done, list(self._finished)
+        rate = None
+        if len(finished) > 1:
+            span_seconds = finished[-1][0] - finished[0][0]
+            if span_seconds > 0:
+                rate = (len(finished) - 1) / span_seconds
+        durations = [ms for _, ms in finished if ms is not None]
+        remaining = max(0, self.total - done)
+        return {
+            'done': done,
+            'total': self.total,
+            'elapsed': now - self.started,
+            'rate': rate,
+            'eta': remaining / rate if rate else (0.0 if not remaining else None),
+            'avg_ms': sum(durations) / len(durations) if durations else None,
+        }
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    """秒数 -> 'm:ss' 或 'h:mm:ss'（None 显示为 '--:--'）"""
+    if seconds is None:
+        return '--:--'
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+def format_progress(snapshot: Dict) -> str:
+    """进度的一行文本：完成数、吞吐量、平均耗时、剩余时间"""
+    text = f"{snapshot['done']}/{snapshot['total']}"
+    if snapshot['rate']:
+        text += f"  {snapshot['rate']:.2f} 篇/秒"
+    if snapshot['avg_ms'] is not None:
+        average = snapshot['avg_ms']
+        text += f"  平均 {average / 1000:.1f}s/篇" if average >= 1000 else f"  平均 {average:.0f}ms/篇"
+    text += f"  已用 {format_duration(snapshot['elapsed'])}  剩余约 {format_duration(snapshot['eta'])}"
+    return text